@@ -4,22 +4,37 @@ Bootcamp F2025
 Main process to setup and manage all the other working processes
 """
 
-import multiprocessing as mp
+import asyncio
+import pathlib
 import time
 
 from pymavlink import mavutil
 
+from modules.async_runtime import async_pipeline
 from modules.common.modules.logger import logger
 from modules.common.modules.logger import logger_main_setup
 from modules.common.modules.read_yaml import read_yaml
 from modules.command import command
+from modules.command import command_filter
 from modules.command import command_worker
+from modules.command import mission
+from modules.estimator import pose_estimator
+from modules.geofence import geofence
+from modules.heartbeat import heartbeat_receiver
 from modules.heartbeat import heartbeat_receiver_worker
+from modules.heartbeat import heartbeat_sender
 from modules.heartbeat import heartbeat_sender_worker
+from modules.mavlink_demux import mavlink_demux
+from modules.mavlink_demux import mavlink_demux_worker
+from modules.mavlink_sender import mavlink_sender
+from modules.mavlink_sender import mavlink_sender_worker
+from modules.telemetry import telemetry
 from modules.telemetry import telemetry_worker
-from utilities.workers import queue_proxy_wrapper
+from utilities.workers import conflating_queue
+from utilities.workers import shared_ring_queue
 from utilities.workers import worker_controller
 from utilities.workers import worker_manager
+from utilities.workers import worker_supervisor
 
 
 # MAVLink connection
@@ -30,8 +45,14 @@ CONNECTION_STRING = "tcp:localhost:12345"
 # =================================================================================================
 # Set queue max sizes (<= 0 for infinity)
 HEARTBEAT_RECEIVER_QUEUE_SIZE = 10
-TELEMETRY_QUEUE_SIZE = 10
 COMMAND_QUEUE_SIZE = 10
+# Messages buffered per subscriber of the MAVLink demultiplexer
+MAVLINK_CHANNEL_SIZE = 64
+# Messages waiting for the MAVLink sender
+MAVLINK_OUTBOUND_QUEUE_SIZE = 64
+
+# Light I/O bound workers run as threads of main, the others in their own processes
+HEARTBEAT_EXECUTION = worker_manager.WorkerProperties.THREAD
 
 # Set worker counts
 NUM_HEARTBEAT_SENDER = 1
@@ -40,13 +61,118 @@ NUM_TELEMETRY = 1
 NUM_COMMAND = 1
 
 # Any other constants
+HEARTBEAT_PERIOD = 1.0  # seconds
+# Heartbeat periods: the drone is disconnected after missing the lost threshold of the window,
+# and connected again after receiving the regained threshold of it
+HEARTBEAT_TIMEOUT = 1.1  # seconds
+HEARTBEAT_WINDOW = 5
+HEARTBEAT_LOST_THRESHOLD = 5
+HEARTBEAT_REGAINED_THRESHOLD = 1
+# Only the drone's heartbeats count for its connection, every other peer is tracked on its own
+DRONE_SYSTEM_ID = 1
+PEER_TIMEOUT = 3.0  # seconds
 TARGET = command.Position(10, 10, 10)
+# Waypoints flown in order instead of the target, None to only fly to the target
+MISSION_FILE_PATH = pathlib.Path("mission.yaml")
+# Zones to stay in and out of, breaching one returns to launch, None for no fences
+GEOFENCE_FILE_PATH = pathlib.Path("geofence.yaml")
+# Decide on the pose predicted by a Kalman filter instead of the latest telemetry
+POSE_ESTIMATION = True
+# Shortest time from a telemetry measurement to its arrival, added to predictions
+TELEMETRY_LATENCY = 0.05  # seconds
+# Identical commands are resent after the timeout, and never faster than the maximum rate
+COMMAND_MAX_RATE = 5.0  # Hz
+COMMAND_RESEND_TIMEOUT = 1.0  # seconds
+# Emit telemetry whenever either ATTITUDE or LOCAL_POSITION_NED arrives
+TELEMETRY_STREAMING = True
+# Run every stage as an asyncio task of this process instead of in worker processes
+ASYNCIO_RUNTIME = False
+RUN_TIME = 100  # seconds
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
 # =================================================================================================
 
 
+def run_asyncio(
+    connection: mavutil.mavfile,
+    mission_plan: mission.Mission | None,
+    fences: geofence.Geofence | None,
+    estimator: pose_estimator.PoseEstimator | None,
+    main_logger: logger.Logger,
+) -> int:
+    """
+    Runs the pipeline in this process, the stages share the connection and main's logger.
+    """
+    result, sender = heartbeat_sender.HeartbeatSender.create(connection, main_logger)
+    if not result:
+        main_logger.error("Sender failed")
+        return -1
+
+    result, receiver = heartbeat_receiver.HeartbeatReceiver.create(
+        connection,
+        main_logger,
+        HEARTBEAT_TIMEOUT,
+        HEARTBEAT_WINDOW,
+        HEARTBEAT_LOST_THRESHOLD,
+        HEARTBEAT_REGAINED_THRESHOLD,
+        DRONE_SYSTEM_ID,
+        PEER_TIMEOUT,
+    )
+    if not result:
+        main_logger.error("Receiver failed")
+        return -1
+
+    result, telemetry_object = telemetry.Telemetry.create(
+        connection, main_logger, streaming=TELEMETRY_STREAMING
+    )
+    if not result:
+        main_logger.error("Telemetry failed")
+        return -1
+
+    result, command_object = command.Command.create(
+        connection=connection,
+        target=TARGET,
+        local_logger=main_logger,
+        output_filter=command_filter.CommandFilter(COMMAND_MAX_RATE, COMMAND_RESEND_TIMEOUT),
+        mission_plan=mission_plan,
+        fences=fences,
+        estimator=estimator,
+    )
+    if not result:
+        main_logger.error("Command failed")
+        return -1
+
+    result, pipeline = async_pipeline.AsyncPipeline.create(
+        connection,
+        sender,
+        HEARTBEAT_PERIOD,
+        receiver,
+        telemetry_object,
+        command_object,
+        main_logger,
+    )
+    if not result:
+        main_logger.error("Asyncio pipeline failed")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert pipeline is not None
+
+    main_logger.info("Started asyncio pipeline")
+    if not asyncio.run(pipeline.run(RUN_TIME)):
+        main_logger.error("Asyncio pipeline stopped early")
+
+    main_logger.info(
+        f"Forwarded: {pipeline.transport.forwarded_counts}, "
+        f"dropped: {pipeline.transport.dropped_counts}"
+    )
+    for task in pipeline.scheduler.tasks:
+        main_logger.info(f"{task.name} jitter: {task.histogram}")
+
+    return 0
+
+
 def main() -> int:
     """
     Main function.
@@ -69,6 +195,30 @@ def main() -> int:
     # Get Pylance to stop complaining
     assert main_logger is not None
 
+    # Load the mission and fences, the command worker gets its own copy
+    mission_plan = None
+    if MISSION_FILE_PATH is not None:
+        result, mission_plan = mission.Mission.load(MISSION_FILE_PATH, main_logger)
+        if not result:
+            main_logger.error("Failed to load mission")
+            return -1
+
+    fences = None
+    if GEOFENCE_FILE_PATH is not None:
+        result, fences = geofence.Geofence.load(GEOFENCE_FILE_PATH, main_logger)
+        if not result:
+            main_logger.error("Failed to load geofence")
+            return -1
+
+    estimator = None
+    if POSE_ESTIMATION:
+        result, estimator = pose_estimator.PoseEstimator.create(
+            main_logger, latency=TELEMETRY_LATENCY
+        )
+        if not result:
+            main_logger.error("Failed to create pose estimator")
+            return -1
+
     # Create a connection to the drone. Assume that this is safe to pass around to all processes
     # In reality, this will not work, but to simplify the bootamp, preetend it is allowed
     # To test, you will run each of your workers individually to see if they work
@@ -80,27 +230,74 @@ def main() -> int:
     # =============================================================================================
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
+    if ASYNCIO_RUNTIME:
+        return run_asyncio(connection, mission_plan, fences, estimator, main_logger)
+
     # Create a worker controller
     main_controller = worker_controller.WorkerController()
 
-    # Create a multiprocess manager for synchronized queues
-    manager = mp.Manager()
+    # Create queues in shared memory, so items do not go through a manager process
+    receiver_queue = shared_ring_queue.SharedRingQueue(HEARTBEAT_RECEIVER_QUEUE_SIZE)
+    # Command only acts on the newest telemetry
+    telemetry_queue = conflating_queue.ConflatingQueue()
+    command_queue = shared_ring_queue.SharedRingQueue(COMMAND_QUEUE_SIZE)
+
+    # Only the demultiplexer reads the connection, receivers get their messages by type
+    heartbeat_channel = shared_ring_queue.SharedRingQueue(MAVLINK_CHANNEL_SIZE)
+    telemetry_channel = shared_ring_queue.SharedRingQueue(MAVLINK_CHANNEL_SIZE)
+    # Every acknowledgement goes to a single command worker
+    ack_channel = shared_ring_queue.SharedRingQueue(MAVLINK_CHANNEL_SIZE)
+    subscriptions = [
+        (["HEARTBEAT"], heartbeat_channel),
+        (["ATTITUDE", "LOCAL_POSITION_NED"], telemetry_channel),
+        (["COMMAND_ACK"], ack_channel),
+    ]
 
-    # Create queues
-    receiver_queue = queue_proxy_wrapper.QueueProxyWrapper(manager, HEARTBEAT_RECEIVER_QUEUE_SIZE)
-    telemetry_queue = queue_proxy_wrapper.QueueProxyWrapper(manager, TELEMETRY_QUEUE_SIZE)
-    command_queue = queue_proxy_wrapper.QueueProxyWrapper(manager, COMMAND_QUEUE_SIZE)
+    # Only the sender writes the connection, senders queue their messages to it
+    outbound_queue = shared_ring_queue.SharedRingQueue(MAVLINK_OUTBOUND_QUEUE_SIZE)
+    outbound_connection = mavlink_sender.QueuedConnection(
+        outbound_queue, connection.mav.srcSystem, connection.mav.srcComponent
+    )
 
     # Create worker properties for each worker type (what inputs it takes, how many workers)
+    # MAVLink demultiplexer, there must be exactly 1 reader
+    result, mavlink_demux_worker_prop = worker_manager.WorkerProperties.create(
+        target=mavlink_demux_worker.mavlink_demux_worker,
+        count=1,
+        work_arguments=(connection, subscriptions),
+        input_queues=[],
+        output_queues=[],
+        controller=main_controller,
+        local_logger=main_logger,
+    )
+    if not result:
+        main_logger.error("MAVLink demultiplexer worker failed")
+        return -1
+
+    # MAVLink sender, there must be exactly 1 writer
+    result, mavlink_sender_worker_prop = worker_manager.WorkerProperties.create(
+        target=mavlink_sender_worker.mavlink_sender_worker,
+        count=1,
+        work_arguments=(connection,),
+        input_queues=[outbound_queue],
+        output_queues=[],
+        controller=main_controller,
+        local_logger=main_logger,
+    )
+    if not result:
+        main_logger.error("MAVLink sender worker failed")
+        return -1
+
     # Heartbeat sender
     result, heartbeat_sender_worker_prop = worker_manager.WorkerProperties.create(
         target=heartbeat_sender_worker.heartbeat_sender_worker,
         count=NUM_HEARTBEAT_SENDER,
-        work_arguments=(connection,),
+        work_arguments=(outbound_connection, HEARTBEAT_PERIOD),
         input_queues=[],
         output_queues=[],
         controller=main_controller,
         local_logger=main_logger,
+        execution=HEARTBEAT_EXECUTION,
     )
     if not result:
         main_logger.error("Sender worker failed")
@@ -110,11 +307,21 @@ def main() -> int:
     result, heartbeat_receiver_worker_prop = worker_manager.WorkerProperties.create(
         target=heartbeat_receiver_worker.heartbeat_receiver_worker,
         count=NUM_HEARTBEAT_RECEIVER,
-        work_arguments=(connection,),
+        work_arguments=(
+            mavlink_demux.SubscribedConnection(heartbeat_channel),
+            HEARTBEAT_TIMEOUT,
+            HEARTBEAT_WINDOW,
+            HEARTBEAT_LOST_THRESHOLD,
+            HEARTBEAT_REGAINED_THRESHOLD,
+            DRONE_SYSTEM_ID,
+            PEER_TIMEOUT,
+        ),
         input_queues=[],
         output_queues=[receiver_queue],
         controller=main_controller,
         local_logger=main_logger,
+        execution=HEARTBEAT_EXECUTION,
+        input_channels=[heartbeat_channel],
     )
     if not result:
         main_logger.error("Receiver worker failed")
@@ -124,11 +331,15 @@ def main() -> int:
     result, telemetry_worker_prop = worker_manager.WorkerProperties.create(
         target=telemetry_worker.telemetry_worker,
         count=NUM_TELEMETRY,
-        work_arguments=(connection,),
+        work_arguments=(
+            mavlink_demux.SubscribedConnection(telemetry_channel),
+            TELEMETRY_STREAMING,
+        ),
         input_queues=[],
         output_queues=[telemetry_queue],
         controller=main_controller,
         local_logger=main_logger,
+        input_channels=[telemetry_channel],
     )
     if not result:
         main_logger.error("Telemetry worker failed")
@@ -138,16 +349,27 @@ def main() -> int:
     result, command_worker_prop = worker_manager.WorkerProperties.create(
         target=command_worker.command_worker,
         count=NUM_COMMAND,
-        work_arguments=(connection, TARGET),
+        work_arguments=(
+            outbound_connection,
+            TARGET,
+            mission_plan,
+            fences,
+            estimator,
+            command_filter.CommandFilter(COMMAND_MAX_RATE, COMMAND_RESEND_TIMEOUT),
+            mavlink_demux.SubscribedConnection(ack_channel),
+        ),
         input_queues=[telemetry_queue],
         output_queues=[command_queue],
         controller=main_controller,
         local_logger=main_logger,
+        input_channels=[ack_channel],
     )
     if not result:
         main_logger.error("Command worker failed")
         return -1
 
+    assert mavlink_demux_worker_prop is not None
+    assert mavlink_sender_worker_prop is not None
     assert heartbeat_sender_worker_prop is not None
     assert heartbeat_receiver_worker_prop is not None
     assert telemetry_worker_prop is not None
@@ -155,31 +377,61 @@ def main() -> int:
 
     # Create the workers (processes) and obtain their managers
     all_worker_properties_list = [
+        mavlink_demux_worker_prop,
+        mavlink_sender_worker_prop,
         heartbeat_sender_worker_prop,
         heartbeat_receiver_worker_prop,
         telemetry_worker_prop,
         command_worker_prop,
     ]
 
-    result, main_worker_manager = worker_manager.WorkerManager.create(
-        worker_properties=all_worker_properties_list,
-        local_logger=main_logger,
-    )
+    # One manager per worker type
+    worker_managers = []
+    for worker_properties in all_worker_properties_list:
+        result, manager = worker_manager.WorkerManager.create(
+            worker_properties=worker_properties,
+            local_logger=main_logger,
+        )
+        if not result:
+            return -1
+
+        # Get Pylance to stop complaining
+        assert manager is not None
+
+        worker_managers.append(manager)
+
+    # Start worker processes together, and wait until all of them are running
+    result, times_to_ready = worker_manager.WorkerManager.start_all_workers(worker_managers)
+    for name, time_to_ready in times_to_ready.items():
+        main_logger.info(f"{name} ready in {time_to_ready * 1000:.1f} ms")
 
     if not result:
+        main_logger.error("Workers failed to start")
+        worker_manager.WorkerManager.stop_workers(worker_managers)
         return -1
-    assert main_worker_manager is not None
 
-    # Start worker processes
-    main_worker_manager.start_workers()
     main_logger.info("Started workers")
 
+    # Restart workers that die, in the background
+    result, main_supervisor = worker_supervisor.WorkerSupervisor.create(
+        worker_managers, main_logger
+    )
+    if not result:
+        main_logger.error("Failed to create supervisor")
+        worker_manager.WorkerManager.stop_workers(worker_managers)
+        return -1
+
+    # Get Pylance to stop complaining
+    assert main_supervisor is not None
+
+    main_supervisor.start()
+
     # Main's work: read from all queues that output to main, and log any commands that we make
-    # Continue running for 100 seconds or until the drone disconnects
+    # Continue running for RUN_TIME seconds or until the drone disconnects
     start_time = time.time()
     queues = [receiver_queue, telemetry_queue, command_queue]
 
-    while time.time() - start_time < 100 and connection.target_system != 0:
+    while time.time() - start_time < RUN_TIME and connection.target_system != 0:
         for output in queues:
             while not output.queue.empty():
                 msg = output.queue.get_nowait()
@@ -189,19 +441,27 @@ def main() -> int:
                     break
         time.sleep(1)
 
-    # Stop the processes
-    main_controller.request_exit()
-    main_logger.info("Requested exit")
+    # Stop supervising first so that stopped workers are not restarted
+    main_supervisor.stop()
+    for name, health in main_supervisor.get_health().items():
+        main_logger.info(f"{name} {health}")
 
-    # Fill and drain queues from END TO START
-    receiver_queue.fill_and_drain_queue()
-    telemetry_queue.fill_and_drain_queue()
-    command_queue.fill_and_drain_queue()
-    main_logger.info("Queues cleared")
+    # Stop the processes: request exit, wake consumers, join, and terminate stragglers
+    shutdown_time = worker_manager.WorkerManager.stop_workers(worker_managers)
+    main_logger.info(f"Stopped in {shutdown_time * 1000:.1f} ms")
 
-    # Clean up worker processes
-    main_worker_manager.join_workers()
-    main_logger.info("Stopped")
+    # Free shared memory only once no worker can use it
+    running = [manager.get_name() for manager in worker_managers if manager.is_running()]
+    if len(running) > 0:
+        main_logger.warning(f"Workers still running, shared memory not freed: {running}")
+    else:
+        receiver_queue.close()
+        telemetry_queue.close()
+        command_queue.close()
+        heartbeat_channel.close()
+        telemetry_channel.close()
+        ack_channel.close()
+        outbound_queue.close()
 
     # We can reset controller in case we want to reuse it
     # Alternatively, create a new WorkerController instance
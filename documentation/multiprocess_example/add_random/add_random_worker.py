@@ -8,6 +8,7 @@ import pathlib
 from modules.common.modules.logger import logger
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_manager
 from . import add_random
 
 
@@ -44,6 +45,8 @@ def add_random_worker(
         seed, max_random_term, add_change_count, local_logger
     )
 
+    worker_manager.report_ready()
+
     # Loop forever until exit has been requested or sentinel value (consumer)
     while not controller.is_exit_requested():
         # Method blocks worker if pause has been requested
@@ -8,6 +8,7 @@ import pathlib
 from modules.common.modules.logger import logger
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_manager
 from . import concatenator
 
 
@@ -40,6 +41,8 @@ def concatenator_worker(
     # Instantiate class object
     concatenator_instance = concatenator.Concatenator(prefix, suffix, local_logger)
 
+    worker_manager.report_ready()
+
     # Loop forever until exit has been requested or sentinel value (consumer)
     while not controller.is_exit_requested():
         # Method blocks worker if pause has been requested
@@ -8,6 +8,7 @@ import pathlib
 from modules.common.modules.logger import logger
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_manager
 from . import countup
 
 
@@ -42,6 +43,8 @@ def countup_worker(
     # Instantiate class object
     countup_instance = countup.Countup(start_thousands, max_iterations, local_logger)
 
+    worker_manager.report_ready()
+
     # Loop forever until exit has been requested (producer)
     while not controller.is_exit_requested():
         # Method blocks worker if pause has been requested
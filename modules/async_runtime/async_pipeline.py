@@ -0,0 +1,221 @@
+"""
+Single process runtime: every stage of the pipeline is an asyncio task.
+"""
+
+import asyncio
+
+from pymavlink import mavutil
+
+from utilities.timing import deadline_scheduler
+from . import async_transport
+from ..command import command
+from ..common.modules.logger import logger
+from ..heartbeat import heartbeat_receiver
+from ..heartbeat import heartbeat_sender
+from ..telemetry import telemetry
+
+
+def put_latest(channel: asyncio.Queue, item: object) -> None:
+    """
+    Puts an item, replacing the oldest one if the queue is full, so consumers act on fresh data.
+    """
+    if channel.full():
+        channel.get_nowait()
+
+    channel.put_nowait(item)
+
+
+class AsyncPipeline:  # pylint: disable=too-many-instance-attributes
+    """
+    Runs the heartbeat sender, heartbeat receiver, telemetry and command stages as tasks of one
+    event loop, with asyncio queues between them and one non-blocking transport on the connection.
+
+    The stages are the same module objects the workers use, fed one message at a time,
+    so nothing blocks the loop. Command acknowledgements are not tracked, as the tracker
+    waits for them in a thread of its own: every command is sent once.
+    """
+
+    __private_key = object()
+
+    __CHANNEL_SIZE = 64  # messages per subscriber
+    __OUTPUT_QUEUE_SIZE = 10
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        sender: heartbeat_sender.HeartbeatSender,
+        heartbeat_period: float,
+        receiver: heartbeat_receiver.HeartbeatReceiver,
+        telemetry_object: telemetry.Telemetry,
+        command_object: command.Command,
+        local_logger: logger.Logger,
+    ) -> "tuple[True, AsyncPipeline] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create an AsyncPipeline object.
+
+        connection: Shared by every stage, sender and command write it directly.
+        heartbeat_period: Time between heartbeats in seconds.
+        """
+        if heartbeat_period <= 0.0:
+            local_logger.error("Heartbeat period must be greater than 0")
+            return False, None
+
+        heartbeat_channel = asyncio.Queue(cls.__CHANNEL_SIZE)
+        telemetry_channel = asyncio.Queue(cls.__CHANNEL_SIZE)
+        result, transport = async_transport.AsyncMavlinkTransport.create(
+            connection,
+            [
+                (["HEARTBEAT"], heartbeat_channel),
+                (["ATTITUDE", "LOCAL_POSITION_NED"], telemetry_channel),
+            ],
+            local_logger,
+        )
+        if not result:
+            return False, None
+
+        return True, cls(
+            cls.__private_key,
+            transport,
+            sender,
+            heartbeat_period,
+            receiver,
+            telemetry_object,
+            command_object,
+            heartbeat_channel,
+            telemetry_channel,
+            local_logger,
+        )
+
+    def __init__(
+        self,
+        key: object,
+        transport: async_transport.AsyncMavlinkTransport,
+        sender: heartbeat_sender.HeartbeatSender,
+        heartbeat_period: float,
+        receiver: heartbeat_receiver.HeartbeatReceiver,
+        telemetry_object: telemetry.Telemetry,
+        command_object: command.Command,
+        heartbeat_channel: asyncio.Queue,
+        telemetry_channel: asyncio.Queue,
+        local_logger: logger.Logger,
+    ) -> None:
+        assert key is AsyncPipeline.__private_key, "Use create() method"
+
+        self.transport = transport
+        self.sender = sender
+        self.receiver = receiver
+        self.telemetry_object = telemetry_object
+        self.command_object = command_object
+        self.local_logger = local_logger
+
+        self.heartbeat_channel = heartbeat_channel
+        self.telemetry_channel = telemetry_channel
+        # Command only acts on the newest telemetry
+        self.telemetry_queue = asyncio.Queue(1)
+        # Connection statuses and commands, for main
+        self.output_queue = asyncio.Queue(self.__OUTPUT_QUEUE_SIZE)
+
+        self.scheduler = deadline_scheduler.DeadlineScheduler()
+        self.scheduler.add("heartbeat", heartbeat_period, lambda: sender.run(local_logger))
+
+    async def __send_heartbeats(self) -> None:
+        """
+        Heartbeat sender stage.
+        """
+        while True:
+            self.scheduler.run_pending()
+            await asyncio.sleep(self.scheduler.time_until_next())
+
+    async def __receive_heartbeats(self) -> None:
+        """
+        Heartbeat receiver stage, a period ends with a heartbeat from the drone or the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            deadline = loop.time() + self.receiver.timeout
+            received = False
+            while not received:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        msg = await self.heartbeat_channel.get()
+                except TimeoutError:
+                    break
+
+                received = self.receiver.receive(msg)
+
+            status = self.receiver.end_period(received)
+            if status is not None:
+                put_latest(self.output_queue, status)
+
+    async def __receive_telemetry(self) -> None:
+        """
+        Telemetry stage, kept messages are forgotten when no output comes within the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.telemetry_object.timeout
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    msg = await self.telemetry_channel.get()
+            except TimeoutError:
+                self.telemetry_object.expire()
+                deadline = loop.time() + self.telemetry_object.timeout
+                continue
+
+            data = self.telemetry_object.update(msg)
+            if data is not None:
+                self.local_logger.info(f"Telemetry data queued: {data}")
+                put_latest(self.telemetry_queue, data)
+                deadline = loop.time() + self.telemetry_object.timeout
+
+    async def __command(self) -> None:
+        """
+        Command stage.
+        """
+        while True:
+            data = await self.telemetry_queue.get()
+            msg = self.command_object.run(data)
+            if msg is not None:
+                put_latest(self.output_queue, msg)
+
+    async def __report(self) -> None:
+        """
+        Logs the outputs, as main does for the workers.
+        """
+        while True:
+            msg = await self.output_queue.get()
+            self.local_logger.info(f"Received message: {msg}")
+
+    async def run(self, duration: float) -> bool:
+        """
+        Runs every stage for duration seconds, or until the connection fails or a stage raises.
+
+        Returns whether it ran for the whole duration.
+        """
+        self.transport.start()
+        tasks = [
+            asyncio.create_task(stage())
+            for stage in [
+                self.__send_heartbeats,
+                self.__receive_heartbeats,
+                self.__receive_telemetry,
+                self.__command,
+                self.__report,
+                self.transport.closed.wait,
+            ]
+        ]
+        done, _ = await asyncio.wait(tasks, timeout=duration, return_when=asyncio.FIRST_COMPLETED)
+
+        if not self.transport.closed.is_set():
+            self.transport.stop()
+
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, Exception):
+                self.local_logger.error(f"Stage failed: {result!r}")
+
+        return len(done) == 0
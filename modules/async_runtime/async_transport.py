@@ -0,0 +1,139 @@
+"""
+Non-blocking MAVLink receive side for the asyncio runtime.
+"""
+
+import asyncio
+import socket
+
+from pymavlink import mavutil
+
+from ..common.modules.logger import logger
+from ..mavlink_demux import frame_filter
+
+
+class AsyncMavlinkTransport:  # pylint: disable=too-many-instance-attributes
+    """
+    Reads the connection from the event loop when its socket is readable, and puts every
+    subscribed message into the asyncio queue of each subscriber of its type.
+    Frames of messages without subscribers are skipped before decoding, as in MavlinkDemux.
+
+    Stream sockets (TCP) are read directly, as mavfile.recv() reconnects on end of file
+    with blocking sleeps. The transport closes instead, on end of file or any receive error.
+
+    Sending needs no counterpart: the loop is the only writer, so modules send through
+    connection.mav directly and frames never interleave.
+    """
+
+    __private_key = object()
+
+    __READ_SIZE = 4096  # bytes
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        subscriptions: "list[tuple[list[str], asyncio.Queue]]",
+        local_logger: logger.Logger,
+    ) -> "tuple[True, AsyncMavlinkTransport] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create an AsyncMavlinkTransport object.
+
+        connection: Socket based connection (TCP or UDP), read without blocking.
+        subscriptions: Message types and the queue that receives them, per subscriber.
+        """
+        if len(subscriptions) == 0:
+            local_logger.error("MAVLink transport needs at least 1 subscriber")
+            return False, None
+
+        message_types = []
+        for subscribed_types, _ in subscriptions:
+            message_types += subscribed_types
+
+        try:
+            message_filter = frame_filter.FrameFilter(message_types)
+        except ValueError as e:
+            local_logger.error(f"MAVLink transport subscription failed: {e}")
+            return False, None
+
+        return True, cls(cls.__private_key, connection, subscriptions, message_filter, local_logger)
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        subscriptions: "list[tuple[list[str], asyncio.Queue]]",
+        message_filter: frame_filter.FrameFilter,
+        local_logger: logger.Logger,
+    ) -> None:
+        assert key is AsyncMavlinkTransport.__private_key, "Use create() method"
+
+        self.connection = connection
+        port = getattr(connection, "port", None)
+        self.__stream = isinstance(port, socket.socket) and port.type == socket.SOCK_STREAM
+        self.message_filter = message_filter
+        self.local_logger = local_logger
+
+        # Queues by message type
+        self.routes: "dict[str, list[asyncio.Queue]]" = {}
+        for message_types, channel in subscriptions:
+            for message_type in message_types:
+                self.routes.setdefault(message_type, []).append(channel)
+
+        # Set when the connection fails
+        self.closed = asyncio.Event()
+
+        # Message counts by type
+        self.forwarded_counts = {}
+        self.dropped_counts = {}
+
+    def start(self) -> None:
+        """
+        Starts reading in the running event loop.
+        """
+        asyncio.get_running_loop().add_reader(self.connection.fd, self.__on_readable)
+
+    def stop(self) -> None:
+        """
+        Stops reading.
+        """
+        asyncio.get_running_loop().remove_reader(self.connection.fd)
+
+    def __close(self, reason: str) -> None:
+        """
+        Stops reading and sets closed.
+        """
+        self.local_logger.error(f"MAVLink transport failed to receive: {reason}")
+        self.stop()
+        self.closed.set()
+
+    def __on_readable(self) -> None:
+        """
+        Receive the available bytes and route the subscribed messages in them.
+        A subscriber whose queue is full misses the message rather than stalling the others.
+        """
+        try:
+            if self.__stream:
+                data = self.connection.port.recv(self.__READ_SIZE)
+                if len(data) == 0:
+                    self.__close("connection closed by the drone")
+                    return
+            else:
+                data = self.connection.recv(self.__READ_SIZE)
+        except BlockingIOError:
+            return
+        # Catching all exceptions, so the reader never stays registered after a failure
+        # pylint: disable-next=broad-exception-caught
+        except Exception as e:
+            self.__close(repr(e))
+            return
+
+        for msg in self.message_filter.parse(data):
+            message_type = msg.get_type()
+            for channel in self.routes[message_type]:
+                try:
+                    channel.put_nowait(msg)
+                    self.forwarded_counts[message_type] = (
+                        self.forwarded_counts.get(message_type, 0) + 1
+                    )
+                except asyncio.QueueFull:
+                    self.dropped_counts[message_type] = self.dropped_counts.get(message_type, 0) + 1
@@ -4,8 +4,16 @@ Decision-making logic.
 
 import math
 
+import numpy as np
 from pymavlink import mavutil
+
+from . import command_filter
+from . import command_tracker
+from . import mission
+from . import velocity_statistics
 from ..common.modules.logger import logger
+from ..estimator import pose_estimator
+from ..geofence import geofence
 from ..telemetry import telemetry
 
 
@@ -20,10 +28,18 @@ class Position:
         self.z = z
 
 
+def poses_from_batch(batch: telemetry.TelemetryBatch) -> np.ndarray:
+    """
+    Returns the samples of a batch as rows of an array in the TelemetryData layout,
+    without copying.
+    """
+    return np.frombuffer(batch.values, dtype=np.float64).reshape(-1, batch.FIELD_COUNT)
+
+
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
-class Command:
+class Command:  # pylint: disable=too-many-instance-attributes
     """
     Command class to make a decision based on recieved telemetry,
     and send out commands based upon the data.
@@ -31,18 +47,56 @@ class Command:
 
     __private_key = object()
 
+    # Columns of a pose array, in the TelemetryData layout
+    __X = telemetry.TelemetryData.__slots__.index("x")
+    __Y = telemetry.TelemetryData.__slots__.index("y")
+    __Z = telemetry.TelemetryData.__slots__.index("z")
+    __YAW = telemetry.TelemetryData.__slots__.index("yaw")
+    __VELOCITIES = [
+        telemetry.TelemetryData.__slots__.index(name)
+        for name in ("x_velocity", "y_velocity", "z_velocity")
+    ]
+
     @classmethod
     def create(
         cls,
         connection: mavutil.mavfile,
         target: Position,
         local_logger: logger.Logger,
+        statistics: velocity_statistics.VelocityStatistics | None = None,
+        output_filter: command_filter.CommandFilter | None = None,
+        tracker: command_tracker.CommandTracker | None = None,
+        mission_plan: mission.Mission | None = None,
+        fences: geofence.Geofence | None = None,
+        estimator: pose_estimator.PoseEstimator | None = None,
     ) -> "tuple[True, Command] | tuple[False, None]":
         """
         Falliable create (instantiation) method to create a Command object.
+
+        statistics: How the average velocity is computed, the mean of all samples by default.
+        output_filter: Suppresses duplicate and too frequent commands, None sends every command.
+        tracker: Sends commands and retries them until acknowledged, None sends them once.
+        mission_plan: Waypoints that replace the target as they are reached, None keeps the target.
+        fences: Breaching them returns to launch instead of other commands, None for no fences.
+        estimator: Decides on the pose predicted for the time of the decision,
+            None uses the latest telemetry as is.
         """
+        if statistics is None:
+            statistics = velocity_statistics.CumulativeMean()
+
         try:
-            command = cls(cls.__private_key, connection, target, local_logger)
+            command = cls(
+                cls.__private_key,
+                connection,
+                target,
+                local_logger,
+                statistics,
+                output_filter,
+                tracker,
+                mission_plan,
+                fences,
+                estimator,
+            )
             return True, command
         except (OSError, mavutil.mavlink.MAVError) as exception:
             local_logger.error(f"Failed to create a Command object: {exception}")
@@ -54,84 +108,234 @@ class Command:
         connection: mavutil.mavfile,
         target: Position,
         local_logger: logger.Logger,
+        statistics: velocity_statistics.VelocityStatistics,
+        output_filter: command_filter.CommandFilter | None,
+        tracker: command_tracker.CommandTracker | None,
+        mission_plan: mission.Mission | None,
+        fences: geofence.Geofence | None,
+        estimator: pose_estimator.PoseEstimator | None,
     ) -> None:
         assert key is Command.__private_key, "Use create() method"
 
         self.connection = connection
         self.target = target
         self.local_logger = local_logger
-        self.time = 0
-        self.x_velo = 0
-        self.y_velo = 0
-        self.z_velo = 0
+        self.statistics = statistics
+        self.output_filter = output_filter
+        self.tracker = tracker
+        self.mission_plan = mission_plan
+        if mission_plan is not None:
+            self.target = mission_plan.target()
+
+        self.fences = fences
+        # Whether the latest position breached a fence
+        self.breached = False
+        self.estimator = estimator
 
     def run(
         self,
         data: telemetry.TelemetryData,
-    ) -> None:
+    ) -> str | None:
         """
         Make a decision based on received telemetry data.
 
         """
 
-        self.time += 1
-        self.x_velo += data.x_velocity
-        self.y_velo += data.y_velocity
-        self.z_velo += data.z_velocity
-        avg_velo = (self.x_velo / self.time, self.y_velo / self.time, self.z_velo / self.time)
+        self.statistics.update((data.x_velocity, data.y_velocity, data.z_velocity))
+        avg_velo = self.statistics.mean()
 
         self.local_logger.info(f"Average velocity: {avg_velo}")
 
-        # alt
-        da = self.target.z - data.z
-        if abs(da) > 0.5:
-            self.connection.mav.command_long_send(
-                target_system=1,
-                target_component=0,
-                command=mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT,
-                confirmation=0,
-                param1=1,
-                param2=0,
-                param3=0,
-                param4=0,
-                param5=0,
-                param6=0,
-                param7=self.target.z,
-            )
+        # Tracked from every sample, a breach only overrides the decision
+        self.__follow_mission(data.x, data.y, data.z)
+        if self.estimator is not None:
+            self.estimator.update(data)
 
-            return f"ALT_CHANGE: {da}"
+        if self.fences is not None:
+            breached = self.fences.check(data.x, data.y, data.z)
+            overridden, msg = self.__override(breached, len(breached) > 0)
+            if overridden:
+                return msg
+
+        pose = data
+        if self.estimator is not None:
+            pose = self.estimator.predict() or data
 
         # yaw
-        dx = self.target.x - data.x
-        dy = self.target.y - data.y
+        dx = self.target.x - pose.x
+        dy = self.target.y - pose.y
         desired_yaw = math.atan2(dy, dx)
-        yaw_diff = desired_yaw - data.yaw
+        yaw_diff = desired_yaw - pose.yaw
         yaw_diff = (yaw_diff + math.pi) % (2 * math.pi) - math.pi
-        yaw_diff_deg = math.degrees(yaw_diff)
 
+        return self.__decide(self.target.z - pose.z, math.degrees(yaw_diff))
+
+    def evaluate_batch(self, poses: np.ndarray) -> "tuple[np.ndarray, np.ndarray, np.ndarray]":
+        """
+        Computes what run() computes for every sample of a batch, all samples at once.
+        The average velocity continues from, and is carried on to, the other calls.
+
+        poses: Samples as rows in the TelemetryData layout, see poses_from_batch().
+
+        Returns per sample altitude error (m), wrapped yaw error (deg) and average velocity
+        (rows of x, y, z in m/s).
+        """
+        avg_velos = self.statistics.update_batch(poses[:, self.__VELOCITIES])
+
+        altitude_errors = self.target.z - poses[:, self.__Z]
+        desired_yaws = np.arctan2(
+            self.target.y - poses[:, self.__Y], self.target.x - poses[:, self.__X]
+        )
+        yaw_errors = (desired_yaws - poses[:, self.__YAW] + np.pi) % (2 * np.pi) - np.pi
+
+        return altitude_errors, np.degrees(yaw_errors), avg_velos
+
+    def run_batch(self, poses: np.ndarray) -> str | None:
+        """
+        Same as run() on every sample of a batch in order,
+        except only the decision for the last sample is logged and sent.
+
+        poses: Samples as rows in the TelemetryData layout, see poses_from_batch().
+        """
+        if len(poses) == 0:
+            return None
+
+        positions = poses[:, [self.__X, self.__Y, self.__Z]]
+
+        # Tracked from every sample, a breach only overrides the decision
+        # Waypoints can be passed anywhere in the batch, the decision is for the final target
+        for x, y, z in positions.tolist():
+            self.__follow_mission(x, y, z)
+
+        if self.estimator is not None:
+            for values in poses.tolist():
+                self.estimator.update(telemetry.TelemetryData.from_values(values))
+
+        # A breach anywhere in the batch overrides
+        if self.fences is not None:
+            breaches = self.fences.check_batch(positions)
+            breached = []
+            if breaches.any():
+                breached = self.fences.check(*positions[np.argmax(breaches)].tolist())
+
+            overridden, msg = self.__override(breached, bool(breaches[-1]))
+            if overridden:
+                # Statistics continue from every sample
+                self.statistics.update_batch(poses[:, self.__VELOCITIES])
+                return msg
+
+        if self.estimator is not None:
+            # The last sample is decided on, with its predicted pose
+            predicted = self.estimator.predict()
+            if predicted is not None:
+                poses = poses.copy()
+                poses[-1, [self.__X, self.__Y, self.__Z, self.__YAW]] = (
+                    predicted.x,
+                    predicted.y,
+                    predicted.z,
+                    predicted.yaw,
+                )
+
+        altitude_errors, yaw_errors, avg_velos = self.evaluate_batch(poses)
+
+        self.local_logger.info(f"Average velocity: {tuple(avg_velos[-1].tolist())}")
+
+        return self.__decide(float(altitude_errors[-1]), float(yaw_errors[-1]))
+
+    def __override(
+        self, breached: "list[geofence.Fence]", still_breached: bool
+    ) -> "tuple[bool, str | None]":
+        """
+        Returns to launch when a breach starts, and holds off other commands until it ends.
+
+        breached: Fences breached, at the latest position or earliest in a batch.
+        still_breached: Whether the latest position breaches any fence.
+
+        Returns whether commands are overridden, and the output if so.
+        """
+        was_breached = self.breached
+        self.breached = still_breached
+        if len(breached) == 0:
+            if was_breached:
+                self.local_logger.info("Geofence breach cleared")
+
+            return False, None
+
+        if was_breached:
+            return True, None
+
+        names = [fence.name for fence in breached]
+        self.local_logger.warning(f"Geofence breached: {names}")
+        # Never suppressed by the filter
+        self.__send(mavutil.mavlink.MAV_CMD_NAV_RETURN_TO_LAUNCH, (0, 0, 0, 0, 0, 0, 0), None)
+        return True, f"GEOFENCE_BREACH: {names}"
+
+    def __follow_mission(self, x: float, y: float, z: float) -> None:
+        """
+        Moves the target to the next waypoint once the current one is reached at the position.
+        """
+        if self.mission_plan is None or not self.mission_plan.update(x, y, z):
+            return
+
+        self.target = self.mission_plan.target()
+        if self.mission_plan.is_complete():
+            self.local_logger.info("Mission complete")
+        else:
+            self.local_logger.info(f"Next waypoint: {self.mission_plan.current}")
+
+    def __decide(self, da: float, yaw_diff_deg: float) -> str | None:
+        """
+        Sends the command for the altitude error (m) and yaw error (deg) of a sample.
+        """
+        # alt
+        if abs(da) > 0.5:
+            if not self.__send(
+                mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT, (1, 0, 0, 0, 0, 0, self.target.z), da
+            ):
+                return None
+
+            return f"ALT_CHANGE: {da}"
+
+        # yaw
         if abs(yaw_diff_deg) > 5:
             if yaw_diff_deg > 0:
                 direction = -1
             else:
                 direction = 1
 
-            self.connection.mav.command_long_send(
-                target_system=1,
-                target_component=0,
-                command=mavutil.mavlink.MAV_CMD_CONDITION_YAW,
-                confirmation=0,
-                param1=yaw_diff_deg,
-                param2=5,
-                param3=direction,
-                param4=1,
-                param5=0,
-                param6=0,
-                param7=0,
-            )
+            if not self.__send(
+                mavutil.mavlink.MAV_CMD_CONDITION_YAW,
+                (yaw_diff_deg, 5, direction, 1, 0, 0, 0),
+                yaw_diff_deg,
+            ):
+                return None
+
             return f"YAW_CHANGE: {yaw_diff_deg}"
 
         return None
 
+    def __send(self, command: int, parameters: "tuple[float, ...]", error: float | None) -> bool:
+        """
+        Sends a COMMAND_LONG to the drone unless the filter suppresses it.
+
+        error: Compared by the filter, None always sends.
+
+        Returns whether it was sent.
+        """
+        if (
+            error is not None
+            and self.output_filter is not None
+            and not self.output_filter.should_send(command, parameters, error)
+        ):
+            return False
+
+        if self.tracker is not None:
+            self.tracker.send(command, parameters)
+        else:
+            command_tracker.send_command_long(self.connection, command, parameters)
+
+        return True
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -0,0 +1,135 @@
+"""
+Suppression of repeated and too frequent commands.
+"""
+
+import threading
+import time
+
+
+class CommandFilter:  # pylint: disable=too-many-instance-attributes
+    """
+    Decides whether a command is worth sending.
+
+    A command identical to the last one sent with the same ID (parameters and error within
+    tolerance) is suppressed until it is acknowledged or the resend timeout passes.
+    Independently, commands are never sent faster than the maximum rate.
+
+    Thread safe: acknowledgements come from the CommandTracker thread.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        resend_timeout: float,
+        parameter_tolerance: float = 1e-3,
+        error_tolerance: float = 0.5,
+    ) -> None:
+        """
+        max_rate: Maximum commands per second, of all IDs together.
+        resend_timeout: Time in seconds after which an unacknowledged duplicate is sent again.
+        parameter_tolerance: Largest parameter difference that is still the same command.
+        error_tolerance: Largest error difference that is still the same command,
+            in the unit of the error of the command.
+        """
+        assert max_rate > 0.0, "Maximum rate must be greater than 0"
+        assert resend_timeout > 0.0, "Resend timeout must be greater than 0"
+
+        self.min_interval = 1.0 / max_rate
+        self.resend_timeout = resend_timeout
+        self.parameter_tolerance = parameter_tolerance
+        self.error_tolerance = error_tolerance
+
+        # Guards the state below
+        self.__lock = threading.Lock()
+        # Last sent command by ID: parameters, error and time.monotonic() when sent
+        self.__last_sent: "dict[int, tuple[tuple[float, ...], float, float]]" = {}
+        self.__last_send_time: float | None = None
+
+        self.sent_count = 0
+        self.duplicate_count = 0
+        self.rate_limited_count = 0
+
+    def __getstate__(self) -> "dict":
+        """
+        Pickled without the lock, for start methods other than fork.
+        """
+        state = self.__dict__.copy()
+        del state["_CommandFilter__lock"]
+        return state
+
+    def __setstate__(self, state: "dict") -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def suppressed_count(self) -> int:
+        """
+        Commands not sent, as duplicates or by the rate limit.
+        """
+        return self.duplicate_count + self.rate_limited_count
+
+    def __is_duplicate(
+        self, command: int, parameters: "tuple[float, ...]", error: float, now: float
+    ) -> bool:
+        last = self.__last_sent.get(command)
+        if last is None:
+            return False
+
+        last_parameters, last_error, sent_time = last
+        if now - sent_time >= self.resend_timeout:
+            return False
+
+        if abs(error - last_error) > self.error_tolerance:
+            return False
+
+        return all(
+            abs(parameter - last_parameter) <= self.parameter_tolerance
+            for parameter, last_parameter in zip(parameters, last_parameters)
+        )
+
+    def should_send(
+        self,
+        command: int,
+        parameters: "tuple[float, ...]",
+        error: float,
+        now: float | None = None,
+    ) -> bool:
+        """
+        Returns whether to send the command, and records it as sent if so.
+
+        command: MAV_CMD of the command.
+        parameters: param1 to param7.
+        error: What the command corrects, for example the altitude error.
+        now: time.monotonic(), or None for the current time.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        with self.__lock:
+            if self.__is_duplicate(command, parameters, error, now):
+                self.duplicate_count += 1
+                return False
+
+            if (
+                self.__last_send_time is not None
+                and now - self.__last_send_time < self.min_interval
+            ):
+                self.rate_limited_count += 1
+                return False
+
+            self.__last_sent[command] = (parameters, error, now)
+            self.__last_send_time = now
+            self.sent_count += 1
+            return True
+
+    def acknowledge(self, command: int) -> None:
+        """
+        Ends duplicate suppression of the command, the next one is sent even if identical.
+        """
+        with self.__lock:
+            self.__last_sent.pop(command, None)
+
+    def __str__(self) -> str:
+        return (
+            f"sent: {self.sent_count}, suppressed: {self.suppressed_count()} "
+            f"(duplicates: {self.duplicate_count}, rate limited: {self.rate_limited_count})"
+        )
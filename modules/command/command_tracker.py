@@ -0,0 +1,262 @@
+"""
+Acknowledgement tracking of sent commands, with retries.
+"""
+
+import math
+import threading
+import time
+
+from pymavlink import mavutil
+
+from ..common.modules.logger import logger
+
+
+def send_command_long(
+    connection: mavutil.mavfile,
+    command: int,
+    parameters: "tuple[float, ...]",
+    confirmation: int = 0,
+) -> None:
+    """
+    Sends a COMMAND_LONG to the drone.
+
+    parameters: param1 to param7.
+    confirmation: 0 for the first transmission, incremented for every retransmission.
+    """
+    param1, param2, param3, param4, param5, param6, param7 = parameters
+    connection.mav.command_long_send(
+        target_system=1,
+        target_component=0,
+        command=command,
+        confirmation=confirmation,
+        param1=param1,
+        param2=param2,
+        param3=param3,
+        param4=param4,
+        param5=param5,
+        param6=param6,
+        param7=param7,
+    )
+
+
+class InFlightCommand:
+    """
+    Sent command waiting for its acknowledgement.
+    """
+
+    def __init__(self, command: int, parameters: "tuple[float, ...]", now: float) -> None:
+        self.command = command
+        self.parameters = parameters
+        self.confirmation = 0
+        # time.monotonic() of the first transmission and of the latest one
+        self.first_send_time = now
+        self.send_time = now
+
+
+class CommandTracker:  # pylint: disable=too-many-instance-attributes
+    """
+    In flight table of commands by ID, in a background thread that matches COMMAND_ACK messages
+    and retransmits with incremented confirmation when the acknowledgement times out.
+    A new command with the same ID replaces the one in flight.
+    The thread ends when the acknowledgement channel is closed by its shutdown sentinel.
+    """
+
+    __private_key = object()
+
+    __ACK_TIMEOUT = 1.0  # seconds
+    __MAX_RETRIES = 3
+    __IDLE_TIMEOUT = 0.5  # seconds, how often stop is checked with nothing in flight
+    __LATENCY_HISTORY = 1024  # latest latencies kept for percentiles
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        ack_connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        ack_timeout: float = __ACK_TIMEOUT,
+        max_retries: int = __MAX_RETRIES,
+    ) -> "tuple[True, CommandTracker] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a CommandTracker object.
+
+        connection: Where commands are sent.
+        ack_connection: Where COMMAND_ACK messages are received, only read by the tracker.
+            A connection or a SubscribedConnection.
+        ack_timeout: Time in seconds to wait for an acknowledgement before retransmitting.
+        max_retries: Retransmissions before the command is given up.
+        """
+        if ack_timeout <= 0.0 or max_retries < 0:
+            local_logger.error("Acknowledgement timeout must be positive, retries not negative")
+            return False, None
+
+        return True, cls(
+            cls.__private_key, connection, ack_connection, local_logger, ack_timeout, max_retries
+        )
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        ack_connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        ack_timeout: float,
+        max_retries: int,
+    ) -> None:
+        assert key is CommandTracker.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.ack_connection = ack_connection
+        self.local_logger = local_logger
+        self.ack_timeout = ack_timeout
+        self.max_retries = max_retries
+
+        # Called with the command ID when a command is acknowledged
+        self.on_acknowledged = None
+
+        self.__in_flight: "dict[int, InFlightCommand]" = {}
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+        self.sent_count = 0
+        self.retry_count = 0
+        self.accepted_count = 0
+        self.rejected_count = 0
+        self.expired_count = 0
+        self.unmatched_count = 0
+        # seconds, from the first transmission to the acknowledgement
+        self.__latencies: "list[float]" = []
+
+    def start(self) -> None:
+        """
+        Starts matching acknowledgements in the background.
+        """
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background thread, commands still in flight are abandoned.
+        Returns at once if the acknowledgement channel is closed, otherwise within the idle timeout.
+        """
+        self.__stop_event.set()
+        self.__thread.join()
+
+    def send(self, command: int, parameters: "tuple[float, ...]") -> None:
+        """
+        Sends a command and tracks it until acknowledged or given up.
+        """
+        with self.__lock:
+            self.__in_flight[command] = InFlightCommand(command, parameters, time.monotonic())
+            send_command_long(self.connection, command, parameters)
+            self.sent_count += 1
+
+    def in_flight_count(self) -> int:
+        """
+        Commands waiting for their acknowledgement.
+        """
+        with self.__lock:
+            return len(self.__in_flight)
+
+    def latency_percentiles(
+        self, percentiles: "tuple[float, ...]" = (50, 90, 99)
+    ) -> "dict[float, float]":
+        """
+        Acknowledgement latency in seconds of the latest acknowledged commands,
+        by percentile (nearest rank). Empty if nothing was acknowledged yet.
+        """
+        with self.__lock:
+            latencies = sorted(self.__latencies)
+
+        if len(latencies) == 0:
+            return {}
+
+        return {
+            percentile: latencies[max(math.ceil(percentile / 100 * len(latencies)) - 1, 0)]
+            for percentile in percentiles
+        }
+
+    def __str__(self) -> str:
+        latencies = ", ".join(
+            f"p{percentile:g}: {latency * 1000:.1f} ms"
+            for percentile, latency in self.latency_percentiles().items()
+        )
+        return (
+            f"sent: {self.sent_count}, retries: {self.retry_count}, "
+            f"accepted: {self.accepted_count}, rejected: {self.rejected_count}, "
+            f"expired: {self.expired_count}, unmatched acks: {self.unmatched_count}, "
+            f"ack latency: {latencies or 'none'}"
+        )
+
+    def __handle_ack(self, ack: "mavutil.mavlink.MAVLink_command_ack_message", now: float) -> None:
+        with self.__lock:
+            in_flight = self.__in_flight.get(ack.command)
+            if in_flight is None:
+                self.unmatched_count += 1
+                return
+
+            # Still executing, wait longer before retransmitting
+            if ack.result == mavutil.mavlink.MAV_RESULT_IN_PROGRESS:
+                in_flight.send_time = now
+                return
+
+            del self.__in_flight[ack.command]
+            if ack.result == mavutil.mavlink.MAV_RESULT_ACCEPTED:
+                self.accepted_count += 1
+            else:
+                self.rejected_count += 1
+
+            self.__latencies.append(now - in_flight.first_send_time)
+            if len(self.__latencies) > self.__LATENCY_HISTORY:
+                del self.__latencies[0]
+
+        if self.on_acknowledged is not None:
+            self.on_acknowledged(ack.command)
+
+    def __retry_timed_out(self, now: float) -> "float | None":
+        """
+        Retransmits or gives up timed out commands.
+
+        Returns the time until the next timeout, None if nothing is in flight.
+        """
+        with self.__lock:
+            for command, in_flight in list(self.__in_flight.items()):
+                if now - in_flight.send_time < self.ack_timeout:
+                    continue
+
+                if in_flight.confirmation >= self.max_retries:
+                    del self.__in_flight[command]
+                    self.expired_count += 1
+                    self.local_logger.warning(f"Command {command} was not acknowledged")
+                    continue
+
+                in_flight.confirmation += 1
+                in_flight.send_time = now
+                send_command_long(
+                    self.connection, command, in_flight.parameters, in_flight.confirmation
+                )
+                self.retry_count += 1
+
+            if len(self.__in_flight) == 0:
+                return None
+
+            next_timeout = min(in_flight.send_time for in_flight in self.__in_flight.values())
+            return max(next_timeout + self.ack_timeout - now, 0.0)
+
+    def __run(self) -> None:
+        """
+        Tracker loop, waits for acknowledgements until the next retransmission is due.
+        """
+        while not self.__stop_event.is_set():
+            timeout = self.__retry_timed_out(time.monotonic())
+            if timeout is None:
+                timeout = self.__IDLE_TIMEOUT
+
+            ack = self.ack_connection.recv_match(
+                type="COMMAND_ACK", blocking=True, timeout=min(timeout, self.__IDLE_TIMEOUT)
+            )
+            if ack is not None:
+                self.__handle_ack(ack, time.monotonic())
+            # Only a SubscribedConnection is closed, by its shutdown sentinel
+            elif getattr(self.ack_connection, "closed", False):
+                break
@@ -9,7 +9,14 @@ from pymavlink import mavutil
 
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_manager
 from . import command
+from . import command_filter
+from . import command_tracker
+from . import mission
+from ..estimator import pose_estimator
+from ..geofence import geofence
+from ..telemetry import telemetry
 from ..common.modules.logger import logger
 
 
@@ -19,6 +26,11 @@ from ..common.modules.logger import logger
 def command_worker(
     connection: mavutil.mavfile,
     target: command.Position,
+    mission_plan: mission.Mission | None,
+    fences: geofence.Geofence | None,
+    estimator: pose_estimator.PoseEstimator | None,
+    output_filter: command_filter.CommandFilter | None,
+    ack_connection: mavutil.mavfile | None,
     data_queue: queue_proxy_wrapper.QueueProxyWrapper,
     output_queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
@@ -50,19 +62,65 @@ def command_worker(
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
     # Instantiate class object (command.Command)
+    # Acknowledgements are matched in the background, None sends every command once
+    tracker = None
+    if ack_connection is not None:
+        result, tracker = command_tracker.CommandTracker.create(
+            connection, ack_connection, local_logger
+        )
+        if not result:
+            local_logger.error("Failed to create command tracker")
+            return
+
+        # Get Pylance to stop complaining
+        assert tracker is not None
+
+        if output_filter is not None:
+            tracker.on_acknowledged = output_filter.acknowledge
+
+        tracker.start()
+
     result, command_object = command.Command.create(
-        connection=connection, target=target, local_logger=local_logger
+        connection=connection,
+        target=target,
+        local_logger=local_logger,
+        output_filter=output_filter,
+        tracker=tracker,
+        mission_plan=mission_plan,
+        fences=fences,
+        estimator=estimator,
     )
     if not result:
         local_logger.error("Failed to create command object")
+        if tracker is not None:
+            tracker.stop()
         return
 
+    worker_manager.report_ready()
+
     # Main loop: do work.
     while not controller.is_exit_requested():
         controller.check_pause()
-        tel_data = data_queue.queue.get()
-        msg = command_object.run(tel_data)
-        output_queue.queue.put(msg)
+        # Drain all pending telemetry in one call
+        for tel_data in data_queue.get_many():
+            # Sentinel from queue shutdown
+            if tel_data is None:
+                continue
+
+            # Batches are evaluated at once and only their last sample is acted on
+            if isinstance(tel_data, telemetry.TelemetryBatch):
+                msg = command_object.run_batch(command.poses_from_batch(tel_data))
+            else:
+                msg = command_object.run(tel_data)
+
+            output_queue.queue.put(msg)
+
+    if tracker is not None:
+        tracker.stop()
+        local_logger.info(f"Acknowledgements {tracker}", True)
+
+    if output_filter is not None:
+        local_logger.info(f"Commands {output_filter}", True)
 
     local_logger.info("Command worker has stopped", True)
 
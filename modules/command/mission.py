@@ -0,0 +1,116 @@
+"""
+Missions: ordered waypoints with acceptance radii.
+"""
+
+import math
+import pathlib
+
+from ..common.modules.logger import logger
+from ..common.modules.read_yaml import read_yaml
+
+
+class Waypoint:
+    """
+    Position to fly through, reached within the acceptance radius.
+    Usable wherever a command.Position is.
+    """
+
+    def __init__(self, x: float, y: float, z: float, acceptance_radius: float) -> None:
+        self.x = x  # m
+        self.y = y  # m
+        self.z = z  # m
+        self.acceptance_radius = acceptance_radius  # m
+
+
+class Mission:
+    """
+    Waypoints flown in order. The current waypoint is done once the drone is within its
+    acceptance radius, and the following ones too if the position is also within theirs.
+    Only the current waypoint is checked, so the cost per tick does not depend on the mission size.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls, waypoints: "list[Waypoint]", local_logger: logger.Logger
+    ) -> "tuple[True, Mission] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a Mission object.
+        """
+        if len(waypoints) == 0:
+            local_logger.error("Mission needs at least 1 waypoint")
+            return False, None
+
+        if any(waypoint.acceptance_radius <= 0.0 for waypoint in waypoints):
+            local_logger.error("Acceptance radii must be greater than 0")
+            return False, None
+
+        return True, cls(cls.__private_key, waypoints)
+
+    @classmethod
+    def load(
+        cls, file_path: pathlib.Path, local_logger: logger.Logger
+    ) -> "tuple[True, Mission] | tuple[False, None]":
+        """
+        Creates a mission from a YAML file with a list of waypoints, each with x, y, z (m)
+        and acceptance_radius (m).
+        """
+        result, config = read_yaml.open_config(file_path)
+        if not result:
+            local_logger.error(f"Failed to load mission file {file_path}")
+            return False, None
+
+        try:
+            waypoints = [
+                Waypoint(
+                    float(waypoint["x"]),
+                    float(waypoint["y"]),
+                    float(waypoint["z"]),
+                    float(waypoint["acceptance_radius"]),
+                )
+                for waypoint in config["waypoints"]
+            ]
+        except (KeyError, TypeError, ValueError) as e:
+            local_logger.error(f"Invalid mission file {file_path}: {e}")
+            return False, None
+
+        return cls.create(waypoints, local_logger)
+
+    def __init__(self, key: object, waypoints: "list[Waypoint]") -> None:
+        assert key is Mission.__private_key, "Use create() method"
+
+        self.waypoints = waypoints
+        # Index of the waypoint being flown to, len(waypoints) once complete
+        self.current = 0
+
+    def is_complete(self) -> bool:
+        """
+        Whether every waypoint has been reached.
+        """
+        return self.current >= len(self.waypoints)
+
+    def target(self) -> Waypoint:
+        """
+        Current waypoint, or the last one once complete.
+        """
+        return self.waypoints[min(self.current, len(self.waypoints) - 1)]
+
+    def update(self, x: float, y: float, z: float) -> bool:
+        """
+        Advances past the current waypoint while the position is within its acceptance radius.
+
+        Returns whether the current waypoint changed.
+        """
+        start = self.current
+        while not self.is_complete():
+            waypoint = self.waypoints[self.current]
+            if (
+                math.dist((x, y, z), (waypoint.x, waypoint.y, waypoint.z))
+                > waypoint.acceptance_radius
+            ):
+                break
+
+            self.current += 1
+
+        return self.current != start
@@ -0,0 +1,179 @@
+"""
+Running statistics of velocity samples, each update O(1) in time and constant in memory.
+"""
+
+import abc
+import math
+
+import numpy as np
+
+
+class VelocityStatistics(abc.ABC):
+    """
+    Base class, statistics over a stream of (x, y, z) velocity samples in m/s.
+    """
+
+    @abc.abstractmethod
+    def update(self, velocity: "tuple[float, float, float]") -> None:
+        """
+        Adds a sample.
+        """
+
+    @abc.abstractmethod
+    def mean(self) -> "tuple[float, float, float]":
+        """
+        Current mean, NaN before the first sample.
+        """
+
+    def variance(self) -> "tuple[float, float, float] | None":
+        """
+        Current variance, or None if not tracked by these statistics.
+        """
+        return None
+
+    def update_batch(self, velocities: np.ndarray) -> np.ndarray:
+        """
+        Adds samples given as rows, and returns the mean after each of them as rows.
+        Subclasses may replace this with a vectorized version.
+        """
+        means = np.empty((len(velocities), 3))
+        for i, velocity in enumerate(velocities.tolist()):
+            self.update(velocity)
+            means[i] = self.mean()
+
+        return means
+
+
+class CumulativeMean(VelocityStatistics):
+    """
+    Mean of all samples so far.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sums = [0.0, 0.0, 0.0]
+
+    def update(self, velocity: "tuple[float, float, float]") -> None:
+        self.count += 1
+        self.sums = [total + value for total, value in zip(self.sums, velocity)]
+
+    def mean(self) -> "tuple[float, float, float]":
+        if self.count == 0:
+            return (math.nan, math.nan, math.nan)
+
+        return tuple(total / self.count for total in self.sums)
+
+    def update_batch(self, velocities: np.ndarray) -> np.ndarray:
+        # Running sums continue from the previous samples
+        sums = np.array(self.sums) + np.cumsum(velocities, axis=0)
+        counts = self.count + np.arange(1, len(velocities) + 1)
+
+        if len(velocities) > 0:
+            self.count += len(velocities)
+            self.sums = sums[-1].tolist()
+
+        return sums / counts[:, np.newaxis]
+
+
+class WindowMean(VelocityStatistics):
+    """
+    Mean of the last window samples, kept in a ring buffer with a running sum.
+    """
+
+    def __init__(self, window: int) -> None:
+        """
+        window: Number of samples averaged, must be greater than 0.
+        """
+        assert window > 0, "Window must be greater than 0"
+
+        self.window = window
+        self.samples = [(0.0, 0.0, 0.0)] * window
+        self.count = 0
+        # Next slot to overwrite
+        self.index = 0
+        self.sums = [0.0, 0.0, 0.0]
+
+    def update(self, velocity: "tuple[float, float, float]") -> None:
+        oldest = self.samples[self.index]
+        self.samples[self.index] = tuple(velocity)
+        self.sums = [
+            total + value - old_value
+            for total, value, old_value in zip(self.sums, velocity, oldest)
+        ]
+
+        self.index += 1
+        if self.index == self.window:
+            self.index = 0
+            # Recompute once per lap so that rounding errors of the running sum do not accumulate,
+            # which keeps the cost amortized O(1)
+            self.sums = [math.fsum(component) for component in zip(*self.samples)]
+
+        self.count = min(self.count + 1, self.window)
+
+    def mean(self) -> "tuple[float, float, float]":
+        if self.count == 0:
+            return (math.nan, math.nan, math.nan)
+
+        return tuple(total / self.count for total in self.sums)
+
+
+class ExponentialMean(VelocityStatistics):
+    """
+    Exponential moving average, the first sample initializes it.
+    """
+
+    def __init__(self, alpha: float) -> None:
+        """
+        alpha: Weight of the newest sample, in (0, 1].
+        """
+        assert 0.0 < alpha <= 1.0, "Alpha must be in (0, 1]"
+
+        self.alpha = alpha
+        self.average: "list[float] | None" = None
+
+    def update(self, velocity: "tuple[float, float, float]") -> None:
+        if self.average is None:
+            self.average = list(velocity)
+            return
+
+        self.average = [
+            average + self.alpha * (value - average)
+            for average, value in zip(self.average, velocity)
+        ]
+
+    def mean(self) -> "tuple[float, float, float]":
+        if self.average is None:
+            return (math.nan, math.nan, math.nan)
+
+        return tuple(self.average)
+
+
+class WelfordStatistics(VelocityStatistics):
+    """
+    Mean and sample variance of all samples so far, with Welford's numerically stable update.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.means = [0.0, 0.0, 0.0]
+        # Sums of squared differences from the mean
+        self.squared_sums = [0.0, 0.0, 0.0]
+
+    def update(self, velocity: "tuple[float, float, float]") -> None:
+        self.count += 1
+        for i, value in enumerate(velocity):
+            delta = value - self.means[i]
+            self.means[i] += delta / self.count
+            self.squared_sums[i] += delta * (value - self.means[i])
+
+    def mean(self) -> "tuple[float, float, float]":
+        if self.count == 0:
+            return (math.nan, math.nan, math.nan)
+
+        return tuple(self.means)
+
+    def variance(self) -> "tuple[float, float, float]":
+        if self.count < 2:
+            return (math.nan, math.nan, math.nan)
+
+        return tuple(squared_sum / (self.count - 1) for squared_sum in self.squared_sums)
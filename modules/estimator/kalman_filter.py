@@ -0,0 +1,199 @@
+"""
+Constant rate Kalman filter over independent axes.
+"""
+
+import math
+
+import numpy as np
+
+
+class ConstantRateFilter:  # pylint: disable=too-many-instance-attributes
+    """
+    Kalman filter of independent axes, each a value and its rate, with the rate constant between
+    measurements up to white noise acceleration. Measurements observe both.
+
+    All arrays are allocated here and updated in place, predict() and update() allocate nothing.
+    """
+
+    def __init__(
+        self,
+        axes: int,
+        value_noise: float,
+        rate_noise: float,
+        acceleration_noise: float,
+        wrap: bool = False,
+    ) -> None:
+        """
+        value_noise: Standard deviation of measured values.
+        rate_noise: Standard deviation of measured rates.
+        acceleration_noise: Standard deviation of the rate change per second.
+        wrap: Values are angles in radians, kept in [-pi, pi).
+        """
+        self.wrap = wrap
+        self.initialized = False
+
+        self.value = np.zeros(axes)
+        self.rate = np.zeros(axes)
+        # Covariance of every axis, [[p00, p01], [p01, p11]]
+        self.p00 = np.zeros(axes)
+        self.p01 = np.zeros(axes)
+        self.p11 = np.zeros(axes)
+
+        self.__value_variance = value_noise**2
+        self.__rate_variance = rate_noise**2
+        self.__acceleration_variance = acceleration_noise**2
+
+        # Measurement, filled by the caller through measured_value and measured_rate
+        self.measured_value = np.zeros(axes)
+        self.measured_rate = np.zeros(axes)
+
+        # Scratch space
+        self.__a = np.zeros(axes)
+        self.__b = np.zeros(axes)
+        self.__c = np.zeros(axes)
+        self.__k00 = np.zeros(axes)
+        self.__k01 = np.zeros(axes)
+        self.__k10 = np.zeros(axes)
+        self.__k11 = np.zeros(axes)
+        self.__innovation_value = np.zeros(axes)
+        self.__innovation_rate = np.zeros(axes)
+
+    def __wrap(self, angles: np.ndarray) -> None:
+        """
+        Wraps angles to [-pi, pi) in place.
+        """
+        np.add(angles, math.pi, out=angles)
+        np.remainder(angles, 2 * math.pi, out=angles)
+        np.subtract(angles, math.pi, out=angles)
+
+    def reset(self) -> None:
+        """
+        Forgets the state, the next measurement initializes it again.
+        """
+        self.initialized = False
+
+    def predict(self, dt: float) -> None:
+        """
+        Advances the state by dt seconds.
+        """
+        if dt <= 0.0 or not self.initialized:
+            return
+
+        q = self.__acceleration_variance
+        a = self.__a
+
+        # value += rate * dt
+        np.multiply(self.rate, dt, out=a)
+        np.add(self.value, a, out=self.value)
+        if self.wrap:
+            self.__wrap(self.value)
+
+        # P = F P F^T + Q, F = [[1, dt], [0, 1]], Q from white noise acceleration
+        # p00 += dt * (2 p01 + dt p11) + q dt^3 / 3
+        np.multiply(self.p11, dt, out=a)
+        np.add(a, self.p01, out=a)
+        np.add(a, self.p01, out=a)
+        np.multiply(a, dt, out=a)
+        np.add(self.p00, a, out=self.p00)
+        np.add(self.p00, q * dt**3 / 3, out=self.p00)
+        # p01 += dt p11 + q dt^2 / 2
+        np.multiply(self.p11, dt, out=a)
+        np.add(self.p01, a, out=self.p01)
+        np.add(self.p01, q * dt**2 / 2, out=self.p01)
+        # p11 += q dt
+        np.add(self.p11, q * dt, out=self.p11)
+
+    def update(self) -> None:
+        """
+        Corrects the state with measured_value and measured_rate.
+        The first measurement initializes it.
+        """
+        if not self.initialized:
+            np.copyto(self.value, self.measured_value)
+            np.copyto(self.rate, self.measured_rate)
+            self.p00.fill(self.__value_variance)
+            self.p01.fill(0.0)
+            self.p11.fill(self.__rate_variance)
+            self.initialized = True
+            return
+
+        a = self.__a
+        b = self.__b
+        c = self.__c
+        k00 = self.__k00
+        k01 = self.__k01
+        k10 = self.__k10
+        k11 = self.__k11
+
+        # Innovation covariance S = P + R, kept as s00 = a, s11 = b, s01 = p01
+        np.add(self.p00, self.__value_variance, out=a)
+        np.add(self.p11, self.__rate_variance, out=b)
+        # 1 / det(S)
+        np.multiply(a, b, out=c)
+        np.multiply(self.p01, self.p01, out=k00)
+        np.subtract(c, k00, out=c)
+        np.reciprocal(c, out=c)
+
+        # Gain K = P S^-1
+        # k00 = (p00 s11 - p01 s01) / det
+        np.multiply(self.p00, b, out=k00)
+        np.multiply(self.p01, self.p01, out=k01)
+        np.subtract(k00, k01, out=k00)
+        np.multiply(k00, c, out=k00)
+        # k01 = (p01 s00 - p00 s01) / det
+        np.multiply(self.p01, a, out=k01)
+        np.multiply(self.p00, self.p01, out=k10)
+        np.subtract(k01, k10, out=k01)
+        np.multiply(k01, c, out=k01)
+        # k10 = (p01 s11 - p11 s01) / det
+        np.multiply(self.p01, b, out=k10)
+        np.multiply(self.p11, self.p01, out=k11)
+        np.subtract(k10, k11, out=k10)
+        np.multiply(k10, c, out=k10)
+        # k11 = (p11 s00 - p01 s01) / det
+        np.multiply(self.p11, a, out=k11)
+        np.multiply(self.p01, self.p01, out=a)
+        np.subtract(k11, a, out=k11)
+        np.multiply(k11, c, out=k11)
+
+        # Innovation
+        innovation_value = self.__innovation_value
+        innovation_rate = self.__innovation_rate
+        np.subtract(self.measured_value, self.value, out=innovation_value)
+        if self.wrap:
+            self.__wrap(innovation_value)
+        np.subtract(self.measured_rate, self.rate, out=innovation_rate)
+
+        # State += K innovation
+        np.multiply(k00, innovation_value, out=a)
+        np.add(self.value, a, out=self.value)
+        np.multiply(k01, innovation_rate, out=a)
+        np.add(self.value, a, out=self.value)
+        if self.wrap:
+            self.__wrap(self.value)
+        np.multiply(k10, innovation_value, out=a)
+        np.add(self.rate, a, out=self.rate)
+        np.multiply(k11, innovation_rate, out=a)
+        np.add(self.rate, a, out=self.rate)
+
+        # P = (I - K) P, from the prior covariance
+        scratch = innovation_value
+        # p00 = (1 - k00) p00 - k01 p01
+        np.multiply(k00, self.p00, out=a)
+        np.subtract(self.p00, a, out=a)
+        np.multiply(k01, self.p01, out=scratch)
+        np.subtract(a, scratch, out=a)
+        # p01 = (1 - k00) p01 - k01 p11
+        np.multiply(k00, self.p01, out=b)
+        np.subtract(self.p01, b, out=b)
+        np.multiply(k01, self.p11, out=scratch)
+        np.subtract(b, scratch, out=b)
+        # p11 = (1 - k11) p11 - k10 p01
+        np.multiply(k11, self.p11, out=c)
+        np.subtract(self.p11, c, out=c)
+        np.multiply(k10, self.p01, out=scratch)
+        np.subtract(c, scratch, out=c)
+
+        np.copyto(self.p00, a)
+        np.copyto(self.p01, b)
+        np.copyto(self.p11, c)
@@ -0,0 +1,232 @@
+"""
+Pose estimation from the telemetry stream.
+"""
+
+import math
+import time
+
+from . import kalman_filter
+from ..common.modules.logger import logger
+from ..telemetry import telemetry
+
+
+class PoseEstimator:  # pylint: disable=too-many-instance-attributes
+    """
+    Fuses the position (LOCAL_POSITION_NED) and attitude (ATTITUDE) parts of telemetry with a
+    constant velocity and constant angular rate Kalman filter, each part at its own timestamp,
+    and predicts the pose at a later time to make up for the pipeline latency.
+    """
+
+    __private_key = object()
+
+    # Drone time going back by more than this means the drone rebooted or reconnected
+    __CLOCK_RESET_TOLERANCE = 1.0  # seconds
+
+    @classmethod
+    def create(
+        cls,
+        local_logger: logger.Logger,
+        position_noise: float = 0.5,
+        velocity_noise: float = 0.2,
+        acceleration_noise: float = 2.0,
+        angle_noise: float = 0.02,
+        angular_rate_noise: float = 0.05,
+        angular_acceleration_noise: float = 1.0,
+        latency: float = 0.0,
+        max_horizon: float = 0.5,
+    ) -> "tuple[True, PoseEstimator] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a PoseEstimator object.
+
+        Noises are standard deviations: of measurements, and of rate changes per second.
+        position_noise (m), velocity_noise (m/s), acceleration_noise (m/s^2).
+        angle_noise (rad), angular_rate_noise (rad/s), angular_acceleration_noise (rad/s^2).
+        latency: Shortest time from a drone timestamp to its sample being received, in seconds.
+            Drone and local clocks are only related through received samples, so this is not
+            measurable and is added to every prediction.
+        max_horizon: Longest prediction past the latest measurement in seconds.
+        """
+        noises = [
+            position_noise,
+            velocity_noise,
+            acceleration_noise,
+            angle_noise,
+            angular_rate_noise,
+            angular_acceleration_noise,
+        ]
+        if any(noise <= 0.0 for noise in noises):
+            local_logger.error("Estimator noises must be greater than 0")
+            return False, None
+
+        if latency < 0.0 or max_horizon < 0.0:
+            local_logger.error("Estimator latency and horizon must not be negative")
+            return False, None
+
+        position_filter = kalman_filter.ConstantRateFilter(
+            3, position_noise, velocity_noise, acceleration_noise
+        )
+        attitude_filter = kalman_filter.ConstantRateFilter(
+            3, angle_noise, angular_rate_noise, angular_acceleration_noise, wrap=True
+        )
+        return True, cls(cls.__private_key, position_filter, attitude_filter, latency, max_horizon)
+
+    def __init__(
+        self,
+        key: object,
+        position_filter: kalman_filter.ConstantRateFilter,
+        attitude_filter: kalman_filter.ConstantRateFilter,
+        latency: float,
+        max_horizon: float,
+    ) -> None:
+        assert key is PoseEstimator.__private_key, "Use create() method"
+
+        self.position_filter = position_filter
+        self.attitude_filter = attitude_filter
+        self.latency = latency  # s
+        self.max_horizon = max_horizon  # s
+
+        # Drone time of the state of each filter, s
+        self.position_time = -math.inf
+        self.attitude_time = -math.inf
+        # Smallest local time minus drone time seen, the clock offset plus the shortest latency
+        self.clock_offset = math.inf  # s
+        # Number of samples received
+        self.update_count = 0
+        # Number of times the drone clock went back and the state was forgotten
+        self.reset_count = 0
+
+    def reset(self) -> None:
+        """
+        Forgets the state and the clock offset, as after a drone reboot.
+        """
+        self.position_filter.reset()
+        self.attitude_filter.reset()
+        self.position_time = -math.inf
+        self.attitude_time = -math.inf
+        self.clock_offset = math.inf
+        self.reset_count += 1
+
+    def update(self, data: telemetry.TelemetryData, now: float | None = None) -> None:
+        """
+        Applies the parts of the sample newer than the state, so parts repeated from an earlier
+        sample are not counted twice. A sample from well before the state resets it,
+        as the drone clock restarted.
+
+        now: Local time.monotonic() the sample is received at, the current time by default.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        if data.time_since_boot is None:
+            # No drone timestamps, so the sample is taken as current
+            if math.isinf(self.clock_offset):
+                self.clock_offset = 0.0
+            sample_time = now - self.clock_offset
+            position_time = sample_time
+            attitude_time = sample_time
+        else:
+            sample_time = data.time_since_boot / 1000
+            latest_time = max(self.position_time, self.attitude_time)
+            if sample_time < latest_time - self.__CLOCK_RESET_TOLERANCE:
+                self.reset()
+
+            position_time = sample_time - (data.position_age or 0) / 1000
+            attitude_time = sample_time - (data.attitude_age or 0) / 1000
+            self.clock_offset = min(self.clock_offset, now - sample_time)
+
+        position_filter = self.position_filter
+        if position_time > self.position_time and None not in (
+            data.x,
+            data.y,
+            data.z,
+            data.x_velocity,
+            data.y_velocity,
+            data.z_velocity,
+        ):
+            position_filter.predict(position_time - self.position_time)
+            measured_value = position_filter.measured_value
+            measured_value[0] = data.x
+            measured_value[1] = data.y
+            measured_value[2] = data.z
+            measured_rate = position_filter.measured_rate
+            measured_rate[0] = data.x_velocity
+            measured_rate[1] = data.y_velocity
+            measured_rate[2] = data.z_velocity
+            position_filter.update()
+            self.position_time = position_time
+
+        attitude_filter = self.attitude_filter
+        if attitude_time > self.attitude_time and None not in (
+            data.roll,
+            data.pitch,
+            data.yaw,
+        ):
+            attitude_filter.predict(attitude_time - self.attitude_time)
+            measured_value = attitude_filter.measured_value
+            measured_value[0] = data.roll
+            measured_value[1] = data.pitch
+            measured_value[2] = data.yaw
+            # Unknown rates are measured as unchanged
+            measured_rate = attitude_filter.measured_rate
+            for axis, rate in enumerate((data.roll_speed, data.pitch_speed, data.yaw_speed)):
+                measured_rate[axis] = attitude_filter.rate[axis] if rate is None else rate
+            attitude_filter.update()
+            self.attitude_time = attitude_time
+
+        self.update_count += 1
+
+    def is_ready(self) -> bool:
+        """
+        Whether both position and attitude have been measured.
+        """
+        return self.position_filter.initialized and self.attitude_filter.initialized
+
+    def predict(self, now: float | None = None) -> telemetry.TelemetryData | None:
+        """
+        Pose at a local time.monotonic(), the current time by default, plus the latency,
+        at most max_horizon past the latest measurement of each part.
+
+        Returns None until both parts have been measured.
+        """
+        if not self.is_ready():
+            return None
+
+        if now is None:
+            now = time.monotonic()
+
+        drone_now = now - self.clock_offset + self.latency
+        position_horizon = min(max(drone_now - self.position_time, 0.0), self.max_horizon)
+        attitude_horizon = min(max(drone_now - self.attitude_time, 0.0), self.max_horizon)
+
+        x, y, z = (
+            value + rate * position_horizon
+            for value, rate in zip(
+                self.position_filter.value.tolist(), self.position_filter.rate.tolist()
+            )
+        )
+        roll, pitch, yaw = (
+            (value + rate * attitude_horizon + math.pi) % (2 * math.pi) - math.pi
+            for value, rate in zip(
+                self.attitude_filter.value.tolist(), self.attitude_filter.rate.tolist()
+            )
+        )
+        x_velocity, y_velocity, z_velocity = self.position_filter.rate.tolist()
+        roll_speed, pitch_speed, yaw_speed = self.attitude_filter.rate.tolist()
+
+        return telemetry.TelemetryData(
+            time_since_boot=round(drone_now * 1000),
+            x=x,
+            y=y,
+            z=z,
+            x_velocity=x_velocity,
+            y_velocity=y_velocity,
+            z_velocity=z_velocity,
+            roll=roll,
+            pitch=pitch,
+            yaw=yaw,
+            roll_speed=roll_speed,
+            pitch_speed=pitch_speed,
+            yaw_speed=yaw_speed,
+            position_age=round((drone_now - self.position_time) * 1000),
+            attitude_age=round((drone_now - self.attitude_time) * 1000),
+        )
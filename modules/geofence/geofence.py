@@ -0,0 +1,470 @@
+"""
+Geofences: keep-in and keep-out zones checked against every position.
+"""
+
+import abc
+import math
+import pathlib
+
+import numpy as np
+
+from ..common.modules.logger import logger
+from ..common.modules.read_yaml import read_yaml
+
+
+class Fence(abc.ABC):
+    """
+    Zone between 2 altitudes. Keep-in zones must not be left, keep-out zones must not be entered.
+    Positions are in the TelemetryData frame.
+    """
+
+    def __init__(self, name: str, keep_out: bool, z_min: float, z_max: float) -> None:
+        """
+        Raises ValueError if z_min is not below z_max.
+        """
+        if not z_min < z_max:
+            raise ValueError(f"Fence {name}: z_min must be below z_max")
+
+        self.name = name
+        self.keep_out = keep_out
+        self.z_min = z_min  # m
+        self.z_max = z_max  # m
+        # Axis aligned bounding box: min x, y, z, max x, y, z, set by the shape
+        self.bounds = (-math.inf, -math.inf, z_min, math.inf, math.inf, z_max)
+
+    @abc.abstractmethod
+    def contains(self, x: float, y: float, z: float) -> bool:
+        """
+        Whether the position is in the zone, boundary included.
+        """
+
+    @abc.abstractmethod
+    def contains_batch(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Same as contains() for every row of x, y, z.
+        """
+
+
+class CylinderFence(Fence):
+    """
+    Vertical cylinder.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        keep_out: bool,
+        x: float,
+        y: float,
+        radius: float,
+        z_min: float,
+        z_max: float,
+    ) -> None:
+        """
+        Raises ValueError if the radius is not greater than 0.
+        """
+        super().__init__(name, keep_out, z_min, z_max)
+
+        if not radius > 0.0:
+            raise ValueError(f"Fence {name}: radius must be greater than 0")
+
+        self.x = x  # m
+        self.y = y  # m
+        self.radius = radius  # m
+        self.bounds = (x - radius, y - radius, z_min, x + radius, y + radius, z_max)
+
+    def contains(self, x: float, y: float, z: float) -> bool:
+        dx = x - self.x
+        dy = y - self.y
+        return self.z_min <= z <= self.z_max and dx * dx + dy * dy <= self.radius * self.radius
+
+    def contains_batch(self, positions: np.ndarray) -> np.ndarray:
+        dx = positions[:, 0] - self.x
+        dy = positions[:, 1] - self.y
+        return (
+            (positions[:, 2] >= self.z_min)
+            & (positions[:, 2] <= self.z_max)
+            & (dx * dx + dy * dy <= self.radius * self.radius)
+        )
+
+
+class PolygonFence(Fence):  # pylint: disable=too-many-instance-attributes
+    """
+    Vertical prism over a simple polygon.
+    Edges are indexed by horizontal slabs. Within a slab, the edges crossing it from bottom to top
+    never cross each other, so they are sorted left to right and a ray cast counts them with a
+    binary search, and only tests the few edges ending in the slab.
+    """
+
+    __MAX_SLABS = 4096
+    # Edges are in every slab they span, this limits the index to that many entries per edge
+    __MAX_SLAB_ENTRIES_PER_EDGE = 32
+
+    def __init__(
+        self,
+        name: str,
+        keep_out: bool,
+        vertices: "list[tuple[float, float]]",
+        z_min: float,
+        z_max: float,
+    ) -> None:
+        """
+        vertices: x, y (m) in order around the polygon, closing it is optional.
+
+        Raises ValueError if there are fewer than 3 vertices or they are on a line.
+        """
+        super().__init__(name, keep_out, z_min, z_max)
+
+        points = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        if len(points) > 1 and np.array_equal(points[0], points[-1]):
+            points = points[:-1]
+
+        if len(points) < 3:
+            raise ValueError(f"Fence {name}: polygon needs at least 3 vertices")
+
+        # Twice the signed area, by the shoelace formula
+        area = np.dot(points[:, 0], np.roll(points[:, 1], -1)) - np.dot(
+            np.roll(points[:, 0], -1), points[:, 1]
+        )
+        if area == 0.0:
+            raise ValueError(f"Fence {name}: polygon has no area")
+
+        x_min, y_min = points.min(axis=0).tolist()
+        x_max, y_max = points.max(axis=0).tolist()
+
+        self.vertices = points
+        self.bounds = (x_min, y_min, z_min, x_max, y_max, z_max)
+
+        # Horizontal edges never cross a horizontal ray
+        starts = points
+        ends = np.roll(points, -1, axis=0)
+        sloped = starts[:, 1] != ends[:, 1]
+        self.__x0 = starts[sloped, 0]
+        self.__y0 = starts[sloped, 1]
+        self.__y1 = ends[sloped, 1]
+        # Inverse slope, for the x of the crossing at a given y
+        self.__dxdy = (ends[sloped, 0] - self.__x0) / (self.__y1 - self.__y0)
+
+        self.__y_min = y_min
+        self.__build_slabs(y_max - y_min)
+
+    def __build_slabs(self, height: float) -> None:
+        """
+        Splits the height of the polygon into slabs, each with the edges overlapping it.
+        """
+        edge_count = len(self.__x0)
+        low = np.minimum(self.__y0, self.__y1) - self.__y_min
+        high = np.maximum(self.__y0, self.__y1) - self.__y_min
+
+        # Fewer slabs if long edges would be in too many of them
+        slab_count = max(min(edge_count, self.__MAX_SLABS), 1)
+        while True:
+            slab_height = height / slab_count
+            first = np.minimum((low / slab_height).astype(np.int64), slab_count - 1)
+            last = np.minimum((high / slab_height).astype(np.int64), slab_count - 1)
+            spans = last - first + 1
+            if slab_count == 1 or spans.sum() <= self.__MAX_SLAB_ENTRIES_PER_EDGE * edge_count:
+                break
+
+            slab_count //= 2
+
+        self.__slab_count = slab_count
+        self.__slab_height = slab_height
+
+        # Every (slab, edge) pair, grouped by slab
+        edges = np.repeat(np.arange(edge_count), spans)
+        offsets = np.arange(len(edges)) - np.repeat(np.cumsum(spans) - spans, spans)
+        slabs = np.repeat(first, spans) + offsets
+        order = np.argsort(slabs, kind="stable")
+        edges = edges[order]
+        boundaries = np.searchsorted(slabs[order], np.arange(slab_count + 1))
+
+        # Edge indices of every slab one after the other, for batches
+        self.__slab_edge_indices = edges
+        self.__slab_starts = boundaries[:-1]
+        self.__slab_sizes = np.diff(boundaries)
+
+        # For single positions, edge values per slab: those ending in it, and those crossing it
+        # sorted by their x in the middle of the slab
+        self.__ending_edges = []
+        self.__crossing_edges = []
+        for slab in range(slab_count):
+            indices = edges[boundaries[slab] : boundaries[slab + 1]]
+            crossing = (first[indices] < slab) & (last[indices] > slab)
+            ending = indices[~crossing]
+            self.__ending_edges.append(
+                list(
+                    zip(
+                        self.__x0[ending].tolist(),
+                        self.__y0[ending].tolist(),
+                        self.__y1[ending].tolist(),
+                        self.__dxdy[ending].tolist(),
+                    )
+                )
+            )
+
+            crossing = indices[crossing]
+            middle = self.__y_min + (slab + 0.5) * slab_height
+            crossing = crossing[
+                np.argsort(
+                    self.__x0[crossing] + (middle - self.__y0[crossing]) * self.__dxdy[crossing]
+                )
+            ]
+            self.__crossing_edges.append(
+                list(
+                    zip(
+                        self.__x0[crossing].tolist(),
+                        self.__y0[crossing].tolist(),
+                        self.__dxdy[crossing].tolist(),
+                    )
+                )
+            )
+
+    def __slab(self, y: float) -> int:
+        return min(int((y - self.__y_min) / self.__slab_height), self.__slab_count - 1)
+
+    def contains(self, x: float, y: float, z: float) -> bool:
+        x_min, y_min, _, x_max, y_max, _ = self.bounds
+        if not (self.z_min <= z <= self.z_max and x_min <= x <= x_max and y_min <= y <= y_max):
+            return False
+
+        # Parity of the crossings of the ray towards +x,
+        # the end of an edge at the ray counts on one side only
+        slab = self.__slab(y)
+        inside = False
+        for x0, y0, y1, dxdy in self.__ending_edges[slab]:
+            if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * dxdy:
+                inside = not inside
+
+        # First of the crossing edges right of the position
+        crossing = self.__crossing_edges[slab]
+        start = 0
+        end = len(crossing)
+        while start < end:
+            middle = (start + end) // 2
+            x0, y0, dxdy = crossing[middle]
+            if x < x0 + (y - y0) * dxdy:
+                end = middle
+            else:
+                start = middle + 1
+
+        return inside != ((len(crossing) - start) % 2 == 1)
+
+    def contains_batch(self, positions: np.ndarray) -> np.ndarray:
+        x_min, y_min, _, x_max, y_max, _ = self.bounds
+        x = positions[:, 0]
+        y = positions[:, 1]
+        z = positions[:, 2]
+        inside = (
+            (z >= self.z_min)
+            & (z <= self.z_max)
+            & (x >= x_min)
+            & (x <= x_max)
+            & (y >= y_min)
+            & (y <= y_max)
+        )
+        candidates = np.flatnonzero(inside)
+        if len(candidates) == 0:
+            return inside
+
+        # Edges of the slab of each candidate as rows, padded to the largest slab
+        px = x[candidates, np.newaxis]
+        py = y[candidates, np.newaxis]
+        slabs = np.minimum(
+            ((py[:, 0] - self.__y_min) / self.__slab_height).astype(np.int64),
+            self.__slab_count - 1,
+        )
+        sizes = self.__slab_sizes[slabs, np.newaxis]
+        columns = np.arange(sizes.max())
+        valid = columns < sizes
+        edges = self.__slab_edge_indices[
+            np.where(valid, self.__slab_starts[slabs, np.newaxis] + columns, 0)
+        ]
+
+        y0 = self.__y0[edges]
+        crossings = (
+            valid
+            & ((y0 > py) != (self.__y1[edges] > py))
+            & (px < self.__x0[edges] + (py - y0) * self.__dxdy[edges])
+        )
+        inside[candidates] = crossings.sum(axis=1) % 2 == 1
+
+        return inside
+
+
+class Geofence:
+    """
+    Set of fences. A position breaches the keep-out zones it is in, and every keep-in zone if
+    there are some and it is in none of them.
+    Fences are found through a bounding volume hierarchy, so only the fences whose bounding boxes
+    contain the position are tested.
+    """
+
+    __private_key = object()
+
+    __LEAF_SIZE = 2
+
+    @classmethod
+    def create(
+        cls, fences: "list[Fence]", local_logger: logger.Logger
+    ) -> "tuple[True, Geofence] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a Geofence object.
+        """
+        if len(fences) == 0:
+            local_logger.error("Geofence needs at least 1 fence")
+            return False, None
+
+        names = [fence.name for fence in fences]
+        if len(set(names)) < len(names):
+            local_logger.error(f"Fence names must be unique: {names}")
+            return False, None
+
+        return True, cls(cls.__private_key, fences)
+
+    @classmethod
+    def load(
+        cls, file_path: pathlib.Path, local_logger: logger.Logger
+    ) -> "tuple[True, Geofence] | tuple[False, None]":
+        """
+        Creates a geofence from a YAML file with a list of fences. Each has a name, keep_out,
+        z_min and z_max (m), and either x, y and radius (m) for a cylinder or a list of x, y
+        vertices (m) for a polygon.
+        """
+        result, config = read_yaml.open_config(file_path)
+        if not result:
+            local_logger.error(f"Failed to load geofence file {file_path}")
+            return False, None
+
+        try:
+            fences = []
+            for fence in config["fences"]:
+                if "vertices" in fence:
+                    fences.append(
+                        PolygonFence(
+                            str(fence["name"]),
+                            bool(fence["keep_out"]),
+                            [(float(x), float(y)) for x, y in fence["vertices"]],
+                            float(fence["z_min"]),
+                            float(fence["z_max"]),
+                        )
+                    )
+                else:
+                    fences.append(
+                        CylinderFence(
+                            str(fence["name"]),
+                            bool(fence["keep_out"]),
+                            float(fence["x"]),
+                            float(fence["y"]),
+                            float(fence["radius"]),
+                            float(fence["z_min"]),
+                            float(fence["z_max"]),
+                        )
+                    )
+        except (KeyError, TypeError, ValueError) as e:
+            local_logger.error(f"Invalid geofence file {file_path}: {e}")
+            return False, None
+
+        return cls.create(fences, local_logger)
+
+    def __init__(self, key: object, fences: "list[Fence]") -> None:
+        assert key is Geofence.__private_key, "Use create() method"
+
+        self.fences = fences
+        self.keep_in = [fence for fence in fences if not fence.keep_out]
+
+        # Nodes of bounds, children and fences, the root is the first
+        self.__nodes: "list[tuple[tuple[float, ...], list[int], list[Fence]]]" = []
+        self.__build(fences)
+
+    def __build(self, fences: "list[Fence]") -> int:
+        """
+        Adds the node for the fences and its descendants.
+
+        Returns the index of the node.
+        """
+        bounds = tuple(min(fence.bounds[axis] for fence in fences) for axis in range(3)) + tuple(
+            max(fence.bounds[axis] for fence in fences) for axis in range(3, 6)
+        )
+        index = len(self.__nodes)
+        if len(fences) <= self.__LEAF_SIZE:
+            self.__nodes.append((bounds, [], fences))
+            return index
+
+        # Split at the median centre along the longest axis, unbounded axes are never split
+        centres = np.array(
+            [
+                [(fence.bounds[axis] + fence.bounds[axis + 3]) / 2 for axis in range(3)]
+                for fence in fences
+            ]
+        )
+        centres[~np.isfinite(centres)] = 0.0
+        axis = int(np.argmax(centres.max(axis=0) - centres.min(axis=0)))
+        order = np.argsort(centres[:, axis], kind="stable")
+        half = len(fences) // 2
+
+        self.__nodes.append((bounds, [], []))
+        children = self.__nodes[index][1]
+        children.append(self.__build([fences[i] for i in order[:half]]))
+        children.append(self.__build([fences[i] for i in order[half:]]))
+        return index
+
+    def containing(self, x: float, y: float, z: float) -> "list[Fence]":
+        """
+        Fences whose zone contains the position.
+        """
+        found = []
+        stack = [0]
+        while len(stack) > 0:
+            bounds, children, fences = self.__nodes[stack.pop()]
+            x_min, y_min, z_min, x_max, y_max, z_max = bounds
+            if not (x_min <= x <= x_max and y_min <= y <= y_max and z_min <= z <= z_max):
+                continue
+
+            stack += children
+            found += [fence for fence in fences if fence.contains(x, y, z)]
+
+        return found
+
+    def check(self, x: float, y: float, z: float) -> "list[Fence]":
+        """
+        Fences breached at the position, none if it is allowed.
+        """
+        found = self.containing(x, y, z)
+        breached = [fence for fence in found if fence.keep_out]
+        if len(self.keep_in) > 0 and all(fence.keep_out for fence in found):
+            breached += self.keep_in
+
+        return breached
+
+    def check_batch(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Whether each row of x, y, z breaches any fence.
+        """
+        in_keep_out = np.zeros(len(positions), dtype=bool)
+        in_keep_in = np.zeros(len(positions), dtype=bool)
+
+        # Every node is visited with the rows inside its parent bounds
+        stack = [(0, np.arange(len(positions)))]
+        while len(stack) > 0:
+            node, rows = stack.pop()
+            bounds, children, fences = self.__nodes[node]
+            inside = np.all(
+                (positions[rows] >= bounds[:3]) & (positions[rows] <= bounds[3:]), axis=1
+            )
+            rows = rows[inside]
+            if len(rows) == 0:
+                continue
+
+            stack += [(child, rows) for child in children]
+            for fence in fences:
+                contained = rows[fence.contains_batch(positions[rows])]
+                if fence.keep_out:
+                    in_keep_out[contained] = True
+                else:
+                    in_keep_in[contained] = True
+
+        if len(self.keep_in) == 0:
+            return in_keep_out
+
+        return in_keep_out | ~in_keep_in
@@ -2,7 +2,12 @@
 Heartbeat receiving logic.
 """
 
+import time
+
 from pymavlink import mavutil
+
+from . import liveness_tracker
+from . import peer_table
 from ..common.modules.logger import logger
 
 
@@ -11,7 +16,7 @@ from ..common.modules.logger import logger
 # =================================================================================================
 class HeartbeatReceiver:
     """
-    HeartbeatReceiver class to send a heartbeat
+    HeartbeatReceiver class to track whether the drone is connected from its heartbeats.
     """
 
     __private_key = object()
@@ -21,12 +26,38 @@ class HeartbeatReceiver:
         cls,
         connection: mavutil.mavfile,
         local_logger: logger.Logger,
+        timeout: float = 1.1,
+        window: int = 5,
+        lost_threshold: int = 5,
+        regained_threshold: int = 1,
+        drone_system: int | None = None,
+        peer_timeout: float | None = None,
     ) -> "tuple[True, HeartbeatReceiver] | tuple[False, None]":
         """
         Falliable create (instantiation) method to create a HeartbeatReceiver object.
+
+        timeout: Length of a period in seconds, the longest wait for a heartbeat.
+        window, lost_threshold, regained_threshold: See LivenessTracker, in periods.
+        drone_system: System ID of the drone, None counts heartbeats from any sender.
+        peer_timeout: Seconds without a heartbeat before any peer is disconnected,
+            None does not track peers.
         """
+        if timeout <= 0.0 or (peer_timeout is not None and peer_timeout <= 0.0):
+            local_logger.error("Heartbeat timeouts must be greater than 0")
+            return False, None
+
+        peers = None if peer_timeout is None else peer_table.PeerTable(peer_timeout)
+
         try:
-            receiver = cls(cls.__private_key, connection, local_logger)
+            tracker = liveness_tracker.LivenessTracker(window, lost_threshold, regained_threshold)
+        except ValueError as e:
+            local_logger.error(f"Invalid heartbeat liveness thresholds: {e}")
+            return False, None
+
+        try:
+            receiver = cls(
+                cls.__private_key, connection, local_logger, timeout, tracker, drone_system, peers
+            )
             return True, receiver
         except (OSError, mavutil.mavlink.MAVError) as e:
             local_logger.error(f"Failed to create Heartbeat receiver object: {e}")
@@ -37,43 +68,91 @@ class HeartbeatReceiver:
         key: object,
         connection: mavutil.mavfile,
         local_logger: logger.Logger,
+        timeout: float,
+        tracker: liveness_tracker.LivenessTracker,
+        drone_system: int | None,
+        peers: peer_table.PeerTable | None,
     ) -> None:
         assert key is HeartbeatReceiver.__private_key, "Use create() method"
 
         self.connection = connection
         self.local_logger = local_logger
-        self.last_5_heartbeats = [False, False, False, False, False]
+        self.timeout = timeout
+        self.tracker = tracker
+        self.drone_system = drone_system
+        self.peers = peers
+        # Local time of the latest heartbeat, for the detection latency
+        self.last_heartbeat_time = None
+
+    def receive(self, msg: mavutil.mavlink.MAVLink_heartbeat_message) -> bool:
+        """
+        Records a heartbeat received during the current period.
 
-    def run(self) -> None:
+        Returns whether it is from the drone, which ends the period.
+        """
+        if self.peers is not None and self.peers.update(msg):
+            self.local_logger.info(f"Peer {msg.get_srcSystem()}:{msg.get_srcComponent()} connected")
+
+        return self.drone_system is None or msg.get_srcSystem() == self.drone_system
+
+    def end_period(self, received: bool) -> str | None:
+        """
+        Ends the current period, received is whether the drone's heartbeat arrived in it.
+
+        Returns the connection status when it changes, None otherwise.
+        """
+        now = time.monotonic()
+        if self.peers is not None:
+            for system, component in self.peers.expire(now):
+                self.local_logger.warning(f"Peer {system}:{component} disconnected")
+
+        if received:
+            self.last_heartbeat_time = now
+        else:
+            self.local_logger.warning("Did not receive heartbeat from drone")
+
+        status = self.tracker.update(received)
+        if status == liveness_tracker.LivenessTracker.DISCONNECTED:
+            if self.last_heartbeat_time is None:
+                self.local_logger.warning("Drone disconnected")
+            else:
+                self.local_logger.warning(
+                    f"Drone disconnected, {now - self.last_heartbeat_time:.2f} s "
+                    "after the last heartbeat"
+                )
+        elif status is not None:
+            self.local_logger.info("Drone connected")
+
+        return status
+
+    def run(self) -> "tuple[True, str | None] | tuple[False, None]":
         """
         Attempt to recieve a heartbeat message.
         If disconnected for over a threshold number of periods,
         the connection is considered disconnected.
+
+        Returns the connection status when it changes, None otherwise.
         """
-        try:
-            msg = self.connection.recv_match(type="HEARTBEAT", blocking=True, timeout=1.1)
+        # The period ends with a heartbeat from the drone, other peers' heartbeats are recorded
+        deadline = time.monotonic() + self.timeout
+        received = False
+        while not received:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
+                break
 
-            # Remove oldest heartbeat record
-            self.last_5_heartbeats.pop(0)
+            try:
+                msg = self.connection.recv_match(type="HEARTBEAT", blocking=True, timeout=remaining)
+            except (OSError, mavutil.mavlink.MAVError) as e:
+                self.local_logger.error(f"heartbeat_receiver.py failed to receive heartbeat: {e}")
+                return False, None
 
-            # If no heartbeat received in 1.1 seconds
             if not msg:
-                self.last_5_heartbeats.append(False)
-                self.local_logger.warning("Did not receive heartbeat from drone")
-
-                # Check if there is no record of the drone being connected in last 5 checks
-                if True not in self.last_5_heartbeats:
-                    return (True, "Disconnected")
-                return (True, "Connected")
+                break
 
-            # If heartbeat received
-            self.last_5_heartbeats.append(True)
-            self.local_logger.info("Received heartbeat from drone")
-            return (True, "Connected")
+            received = self.receive(msg)
 
-        except (OSError, mavutil.mavlink.MAVError) as e:
-            self.local_logger.error(f"heartbeat_receiver.py failed to receive heartbeat: {e}")
-            return (False, None)
+        return True, self.end_period(received)
 
 
 # =================================================================================================
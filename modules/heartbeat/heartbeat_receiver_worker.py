@@ -9,6 +9,7 @@ from pymavlink import mavutil
 
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_manager
 from . import heartbeat_receiver
 from ..common.modules.logger import logger
 
@@ -18,6 +19,12 @@ from ..common.modules.logger import logger
 # =================================================================================================
 def heartbeat_receiver_worker(
     connection: mavutil.mavfile,
+    timeout: float,
+    window: int,
+    lost_threshold: int,
+    regained_threshold: int,
+    drone_system: int | None,
+    peer_timeout: float | None,
     output_queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
 ) -> None:
@@ -25,8 +32,11 @@ def heartbeat_receiver_worker(
     Worker process.
 
     args... describe what the arguments are
-    queue is what will communicate the status
+    queue is what will communicate the status, only when it changes
     connection is what connects to the drone
+    timeout is the length of a period, window and thresholds are in periods (LivenessTracker)
+    drone_system is the system ID of the drone, None for any sender
+    peer_timeout is how long every peer stays connected after a heartbeat, None to not track them
     controller allows for communication
     """
     # =============================================================================================
@@ -51,23 +61,48 @@ def heartbeat_receiver_worker(
     # =============================================================================================
     # Instantiate class object (heartbeat_receiver.HeartbeatReceiver)
 
-    result, receiver = heartbeat_receiver.HeartbeatReceiver.create(connection, local_logger)
+    result, receiver = heartbeat_receiver.HeartbeatReceiver.create(
+        connection,
+        local_logger,
+        timeout,
+        window,
+        lost_threshold,
+        regained_threshold,
+        drone_system,
+        peer_timeout,
+    )
 
     if not result:
         local_logger.error("Failed to create Heartbeat receiver object")
         return
 
+    worker_manager.report_ready()
+
     # Main loop: do work.
     while not controller.is_exit_requested():
         controller.check_pause()
 
         result, connection_status = receiver.run()
 
-        if not result:
+        # The period was cut short by the shutdown sentinel, and may run in a thread of main
+        if controller.is_exit_requested():
+            break
+
+        # Only changes are sent
+        if not result or connection_status is None:
             continue
 
         output_queue.queue.put(connection_status)
 
+    local_logger.info(
+        f"Periods: {receiver.tracker.period_count}, "
+        f"status changes: {receiver.tracker.transition_count}",
+        True,
+    )
+    if receiver.peers is not None:
+        for peer in receiver.peers.snapshot().values():
+            local_logger.info(f"Peer {peer}", True)
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
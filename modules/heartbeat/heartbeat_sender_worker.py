@@ -4,11 +4,12 @@ Heartbeat worker that sends heartbeats periodically.
 
 import os
 import pathlib
-import time
 
 from pymavlink import mavutil
 
+from utilities.timing import deadline_scheduler
 from utilities.workers import worker_controller
+from utilities.workers import worker_manager
 from . import heartbeat_sender
 from ..common.modules.logger import logger
 
@@ -18,11 +19,14 @@ from ..common.modules.logger import logger
 # =================================================================================================
 def heartbeat_sender_worker(
     connection: mavutil.mavfile,
+    period: float,
     controller: worker_controller.WorkerController,
     # Add other necessary worker arguments here
 ) -> None:
     """
-    controller: object used to send heartbeats
+    connection is what sends the heartbeats
+    period is the time between heartbeats in seconds
+    controller allows for communication
     """
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -54,10 +58,22 @@ def heartbeat_sender_worker(
         local_logger.error("Failed to create HeartbeatSender", True)
         return
 
+    # Heartbeats are due on a fixed cadence, however long sending and logging take
+    scheduler = deadline_scheduler.DeadlineScheduler()
+    scheduler.add("heartbeat", period, lambda: sender.run(local_logger))
+
+    worker_manager.report_ready()
+
     while not controller.is_exit_requested():
         controller.check_pause()
-        sender.run(local_logger)
-        time.sleep(1)
+        scheduler.run_pending()
+        # Wakes immediately on exit request instead of finishing the period
+        controller.wait_for_exit(scheduler.time_until_next())
+
+    for task in scheduler.tasks:
+        local_logger.info(
+            f"{task.name} jitter: {task.histogram}, missed periods: {task.missed_count}", True
+        )
 
 
 # =================================================================================================
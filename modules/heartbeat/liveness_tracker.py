@@ -0,0 +1,68 @@
+"""
+Connection liveness from heartbeats over a sliding window of periods.
+"""
+
+
+class LivenessTracker:  # pylint: disable=too-many-instance-attributes
+    """
+    Records whether a heartbeat arrived in each period as one bit of an integer, newest lowest,
+    over a window of periods. Changes state with hysteresis: lost after enough missed periods
+    in the window, regained after enough received ones.
+    """
+
+    CONNECTED = "Connected"
+    DISCONNECTED = "Disconnected"
+
+    def __init__(self, window: int, lost_threshold: int, regained_threshold: int) -> None:
+        """
+        window: Number of periods remembered.
+        lost_threshold: Missed periods in the window for a connection to be lost.
+        regained_threshold: Received periods in the window for a connection to be regained.
+
+        Raises ValueError if the thresholds are outside 1 to window, or could both be met at
+        once (lost_threshold + regained_threshold <= window), which would oscillate.
+        """
+        if window < 1:
+            raise ValueError("Window must be at least 1 period")
+
+        if not (1 <= lost_threshold <= window and 1 <= regained_threshold <= window):
+            raise ValueError("Thresholds must be from 1 to the window")
+
+        if lost_threshold + regained_threshold <= window:
+            raise ValueError("Thresholds must add up to more than the window")
+
+        self.window = window
+        self.lost_threshold = lost_threshold
+        self.regained_threshold = regained_threshold
+
+        self.__mask = (1 << window) - 1
+        # Bit i is set if a heartbeat arrived i periods ago, with no heartbeats before the start
+        self.history = 0
+        self.state = self.DISCONNECTED
+
+        self.period_count = 0
+        self.transition_count = 0
+
+    def update(self, received: bool) -> str | None:
+        """
+        Records a period.
+
+        Returns the new state if it changed, None otherwise.
+        """
+        self.history = ((self.history << 1) | received) & self.__mask
+        self.period_count += 1
+
+        received_count = self.history.bit_count()
+        if self.state == self.CONNECTED:
+            if self.window - received_count < self.lost_threshold:
+                return None
+
+            self.state = self.DISCONNECTED
+        else:
+            if received_count < self.regained_threshold:
+                return None
+
+            self.state = self.CONNECTED
+
+        self.transition_count += 1
+        return self.state
@@ -0,0 +1,171 @@
+"""
+Liveness of every MAVLink peer on the link, by system and component ID.
+"""
+
+import collections
+import time
+
+from pymavlink import mavutil
+
+
+class PeerStatus:  # pylint: disable=too-many-instance-attributes
+    """
+    Latest known state of a peer.
+    """
+
+    __slots__ = (
+        "system",
+        "component",
+        "mav_type",
+        "autopilot",
+        "system_status",
+        "first_seen",
+        "last_seen",
+        "heartbeat_count",
+        "connected",
+    )
+
+    def __init__(
+        self,
+        system: int,
+        component: int,
+        mav_type: int,
+        autopilot: int,
+        system_status: int,
+        first_seen: float,  # s, time.monotonic()
+        last_seen: float,  # s, time.monotonic()
+        heartbeat_count: int,
+        connected: bool,
+    ) -> None:
+        self.system = system
+        self.component = component
+        self.mav_type = mav_type
+        self.autopilot = autopilot
+        self.system_status = system_status
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.heartbeat_count = heartbeat_count
+        self.connected = connected
+
+    def copy(self) -> "PeerStatus":
+        """
+        Independent copy.
+        """
+        return PeerStatus(*(getattr(self, name) for name in self.__slots__))
+
+    def __str__(self) -> str:
+        state = "connected" if self.connected else "disconnected"
+        return (
+            f"{self.system}:{self.component} {state}, type {self.mav_type}, "
+            f"{self.heartbeat_count} heartbeats"
+        )
+
+
+class PeerTable:
+    """
+    Peers keyed by (system ID, component ID). A peer is connected from a heartbeat until
+    the timeout passes without another one.
+
+    Every peer has the same timeout, so deadlines expire in the order of the latest heartbeats:
+    connected peers are kept in that order, a heartbeat moves its peer to the back, and expiry
+    only looks at the front. Updates are O(1) and expiry is O(expired peers), without polling
+    every peer.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        """
+        timeout: Seconds without a heartbeat before a peer is disconnected.
+        """
+        assert timeout > 0.0, "Timeout must be greater than 0"
+
+        self.timeout = timeout
+        self.__peers: "dict[tuple[int, int], PeerStatus]" = {}
+        # Connected peers, from the oldest heartbeat to the newest
+        self.__alive: "collections.OrderedDict[tuple[int, int], None]" = collections.OrderedDict()
+
+    def update(
+        self, msg: mavutil.mavlink.MAVLink_heartbeat_message, now: float | None = None
+    ) -> bool:
+        """
+        Records a heartbeat.
+
+        now: Local time.monotonic() it is received at, the current time by default.
+
+        Returns whether its peer became connected.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        key = (msg.get_srcSystem(), msg.get_srcComponent())
+        peer = self.__peers.get(key)
+        if peer is None:
+            peer = PeerStatus(key[0], key[1], 0, 0, 0, now, now, 0, False)
+            self.__peers[key] = peer
+
+        peer.mav_type = msg.type
+        peer.autopilot = msg.autopilot
+        peer.system_status = msg.system_status
+        peer.last_seen = now
+        peer.heartbeat_count += 1
+
+        self.__alive[key] = None
+        self.__alive.move_to_end(key)
+
+        if peer.connected:
+            return False
+
+        peer.connected = True
+        return True
+
+    def expire(self, now: float | None = None) -> "list[tuple[int, int]]":
+        """
+        Disconnects the peers whose timeout has passed.
+
+        now: Local time.monotonic(), the current time by default.
+
+        Returns the keys of the newly disconnected peers, oldest heartbeat first.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        expired = []
+        alive = self.__alive
+        while len(alive) > 0:
+            key = next(iter(alive))
+            peer = self.__peers[key]
+            if now - peer.last_seen < self.timeout:
+                break
+
+            alive.popitem(last=False)
+            peer.connected = False
+            expired.append(key)
+
+        return expired
+
+    def next_deadline(self) -> float | None:
+        """
+        Local time.monotonic() of the next expiry, None if no peer is connected.
+        """
+        if len(self.__alive) == 0:
+            return None
+
+        return self.__peers[next(iter(self.__alive))].last_seen + self.timeout
+
+    def connected_count(self) -> int:
+        """
+        Number of connected peers.
+        """
+        return len(self.__alive)
+
+    def get(self, system: int, component: int) -> PeerStatus | None:
+        """
+        Copy of the status of a peer, None if it has never been heard from.
+        """
+        peer = self.__peers.get((system, component))
+        return None if peer is None else peer.copy()
+
+    def snapshot(self) -> "dict[tuple[int, int], PeerStatus]":
+        """
+        Copy of the status of every peer ever heard from, by (system ID, component ID).
+        """
+        return {key: peer.copy() for key, peer in self.__peers.items()}
@@ -0,0 +1,137 @@
+"""
+Splits the raw MAVLink byte stream into frames and only decodes subscribed message IDs.
+"""
+
+import struct
+
+from pymavlink import mavutil
+
+
+class FrameFilter:
+    """
+    Stream parser that reads the message ID from the frame header and skips frames of other
+    messages without checking their CRC or unpacking their payload.
+    """
+
+    __MAGIC_V1 = 0xFE
+    __MAGIC_V2 = 0xFD
+    __MAGICS = bytes([__MAGIC_V1, __MAGIC_V2])
+    __HEADER_V1 = struct.Struct("<BBBBBB")  # Magic, length, sequence, system, component, ID
+    # Magic, length, incompatible flags, compatible flags, sequence, system, component,
+    # ID low 16 bits, ID high 8 bits
+    __HEADER_V2 = struct.Struct("<BBBBBBBHB")
+    __CHECKSUM_SIZE = 2
+    __SIGNATURE_SIZE = 13
+    __SIGNED_FLAG = 0x01
+
+    def __init__(self, message_types: "list[str]") -> None:
+        """
+        message_types: Names of the messages to decode, the others are skipped.
+
+        Raises ValueError for names not in the dialect.
+        """
+        ids_by_name = {
+            message_class.msgname: message_id
+            for message_id, message_class in mavutil.mavlink.mavlink_map.items()
+        }
+        unknown = [
+            message_type for message_type in message_types if message_type not in ids_by_name
+        ]
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown message types: {unknown}")
+
+        self.message_ids = {ids_by_name[message_type] for message_type in message_types}
+
+        # Only decodes, the header sequence and source are not tracked
+        self.__mav = mavutil.mavlink.MAVLink(None)
+        self.__buffer = bytearray()
+
+        self.decoded_count = 0
+        self.skipped_count = 0
+        self.bad_count = 0
+
+    def __frame_size(self, offset: int) -> "tuple[int, int] | None":
+        """
+        Returns the message ID and size of the frame starting at offset,
+        or None if the header is incomplete.
+        """
+        buffer = self.__buffer
+        if buffer[offset] == self.__MAGIC_V2:
+            if len(buffer) - offset < self.__HEADER_V2.size:
+                return None
+
+            _, length, incompatible_flags, _, _, _, _, id_low, id_high = (
+                self.__HEADER_V2.unpack_from(buffer, offset)
+            )
+            size = self.__HEADER_V2.size + length + self.__CHECKSUM_SIZE
+            if incompatible_flags & self.__SIGNED_FLAG:
+                size += self.__SIGNATURE_SIZE
+
+            return id_low | id_high << 16, size
+
+        if len(buffer) - offset < self.__HEADER_V1.size:
+            return None
+
+        _, length, _, _, _, message_id = self.__HEADER_V1.unpack_from(buffer, offset)
+        return message_id, self.__HEADER_V1.size + length + self.__CHECKSUM_SIZE
+
+    def parse(self, data: bytes) -> "list[mavutil.mavlink.MAVLink_message]":
+        """
+        Appends received bytes and returns the subscribed messages completed by them, in order.
+        Incomplete frames are kept for the next call, as is a skipped frame until the first byte
+        after it arrives.
+        """
+        buffer = self.__buffer
+        buffer += data
+
+        messages = []
+        offset = 0
+        while offset < len(buffer):
+            # Resynchronize on the next start of frame, frames normally follow each other
+            if buffer[offset] not in self.__MAGICS:
+                offset = min(
+                    (
+                        index
+                        for index in (buffer.find(magic, offset) for magic in self.__MAGICS)
+                        if index >= 0
+                    ),
+                    default=len(buffer),
+                )
+                continue
+
+            frame = self.__frame_size(offset)
+            if frame is None:
+                break
+
+            message_id, size = frame
+            if len(buffer) - offset < size:
+                break
+
+            if message_id not in self.message_ids:
+                # Without the CRC check, a frame is only trusted if the next one follows it,
+                # otherwise garbage that looks like a header could swallow real frames
+                if len(buffer) - offset == size:
+                    break
+
+                if buffer[offset + size] not in self.__MAGICS:
+                    self.bad_count += 1
+                    offset += 1
+                    continue
+
+                self.skipped_count += 1
+                offset += size
+                continue
+
+            try:
+                messages.append(self.__mav.decode(buffer[offset : offset + size]))
+            except mavutil.mavlink.MAVError:
+                # Not a frame after all, or corrupted: look for the next start of frame inside it
+                self.bad_count += 1
+                offset += 1
+                continue
+
+            self.decoded_count += 1
+            offset += size
+
+        del buffer[:offset]
+        return messages
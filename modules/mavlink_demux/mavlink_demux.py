@@ -0,0 +1,191 @@
+"""
+MAVLink receive demultiplexing: a single reader parses every frame once and routes it by type.
+"""
+
+import queue
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from . import frame_filter
+from ..common.modules.logger import logger
+
+
+class MavlinkDemux:
+    """
+    Owns the receive side of the connection and puts every message into the channel
+    of each subscriber of its type.
+    Frames of messages without subscribers are skipped before decoding.
+    """
+
+    __private_key = object()
+
+    # Longest wait on a quiet link, so exit requests are seen within the shutdown join
+    __TIMEOUT = 0.05  # seconds
+    __READ_SIZE = 4096  # bytes
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        subscriptions: "list[tuple[list[str], queue_proxy_wrapper.QueueProxyWrapper]]",
+        local_logger: logger.Logger,
+    ) -> "tuple[True, MavlinkDemux] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a MavlinkDemux object.
+
+        subscriptions: Message types and the channel that receives them, per subscriber.
+        """
+        if len(subscriptions) == 0:
+            local_logger.error("MAVLink demultiplexer needs at least 1 subscriber")
+            return False, None
+
+        message_types = []
+        for subscribed_types, _ in subscriptions:
+            message_types += subscribed_types
+
+        try:
+            message_filter = frame_filter.FrameFilter(message_types)
+        except ValueError as e:
+            local_logger.error(f"MAVLink demultiplexer subscription failed: {e}")
+            return False, None
+
+        return True, cls(cls.__private_key, connection, subscriptions, message_filter, local_logger)
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        subscriptions: "list[tuple[list[str], queue_proxy_wrapper.QueueProxyWrapper]]",
+        message_filter: frame_filter.FrameFilter,
+        local_logger: logger.Logger,
+    ) -> None:
+        assert key is MavlinkDemux.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.message_filter = message_filter
+        self.local_logger = local_logger
+
+        # Channels by message type
+        self.routes = {}
+        for message_types, channel in subscriptions:
+            for message_type in message_types:
+                self.routes.setdefault(message_type, []).append(channel)
+
+        # Message counts by type
+        self.forwarded_counts = {}
+        self.dropped_counts = {}
+
+    def run(self) -> bool:
+        """
+        Receive the available bytes and route the subscribed messages in them.
+        A subscriber whose channel is full misses the message rather than stalling the others.
+
+        Returns whether the connection is still usable.
+        """
+        try:
+            if not self.connection.select(self.__TIMEOUT):
+                return True
+
+            data = self.connection.recv(self.__READ_SIZE)
+        except OSError as e:
+            self.local_logger.error(f"MAVLink demultiplexer failed to receive: {e}")
+            return False
+
+        for msg in self.message_filter.parse(data):
+            message_type = msg.get_type()
+            for channel in self.routes[message_type]:
+                try:
+                    channel.queue.put_nowait(msg)
+                    self.forwarded_counts[message_type] = (
+                        self.forwarded_counts.get(message_type, 0) + 1
+                    )
+                except queue.Full:
+                    self.dropped_counts[message_type] = self.dropped_counts.get(message_type, 0) + 1
+
+        return True
+
+
+class SubscribedConnection:
+    """
+    Receive side of a connection backed by a demultiplexer channel.
+    Used in place of the connection by modules that only receive (recv_match() and select()).
+
+    The shutdown sentinel closes it: from then on, receives return at once without a message.
+    """
+
+    def __init__(self, channel: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        channel: Output channel of a MavlinkDemux subscription.
+        """
+        self.channel = channel
+        # Set once the shutdown sentinel is read
+        self.closed = False
+        # Message taken from the channel by select() and not yet returned
+        self.__pending = None
+
+    def __take(
+        self, blocking: bool, deadline: float | None
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Returns the next message, or None if there is none in time or it is closed.
+        """
+        if self.__pending is not None:
+            msg = self.__pending
+            self.__pending = None
+            return msg
+
+        if self.closed:
+            return None
+
+        try:
+            if not blocking:
+                msg = self.channel.queue.get_nowait()
+            elif deadline is None:
+                msg = self.channel.queue.get()
+            else:
+                msg = self.channel.queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+        except queue.Empty:
+            return None
+
+        if msg is None:
+            self.closed = True
+
+        return msg
+
+    def select(self, timeout: float) -> bool:
+        """
+        Waits for up to timeout seconds for a message.
+
+        Returns whether a message is available.
+        """
+        if self.__pending is None:
+            self.__pending = self.__take(True, time.monotonic() + timeout)
+
+        return self.__pending is not None
+
+    def recv_match(
+        self,
+        condition: str | None = None,
+        type: "str | list[str] | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: float | None = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Same as mavfile.recv_match(), except condition is not supported.
+        """
+        assert condition is None, "Conditions are not supported"
+
+        if isinstance(type, str):
+            type = [type]
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            msg = self.__take(blocking, deadline)
+            # Nothing in time, or closed
+            if msg is None:
+                return None
+
+            if type is None or msg.get_type() in type:
+                return msg
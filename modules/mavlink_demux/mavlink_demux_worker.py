@@ -0,0 +1,65 @@
+"""
+MAVLink demultiplexer worker, the only reader of the connection.
+"""
+
+import os
+import pathlib
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+from utilities.workers import worker_manager
+from . import mavlink_demux
+from ..common.modules.logger import logger
+
+
+def mavlink_demux_worker(
+    connection: mavutil.mavfile,
+    subscriptions: "list[tuple[list[str], queue_proxy_wrapper.QueueProxyWrapper]]",
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Worker process.
+
+    connection is the connection to the drone, only this worker reads from it
+    subscriptions are the message types and the channel that receives them, per subscriber
+    controller is how the main process communicates to this worker process
+    """
+    # Instantiate logger
+    worker_name = pathlib.Path(__file__).stem
+    process_id = os.getpid()
+    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    if not result:
+        print("ERROR: Worker failed to create logger")
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    local_logger.info("Logger initialized", True)
+
+    # Instantiate class object (mavlink_demux.MavlinkDemux)
+    result, demux = mavlink_demux.MavlinkDemux.create(connection, subscriptions, local_logger)
+    if not result:
+        local_logger.error("Failed to create MAVLink demultiplexer", True)
+        return
+
+    # Get Pylance to stop complaining
+    assert demux is not None
+
+    worker_manager.report_ready()
+
+    # Main loop: do work.
+    while not controller.is_exit_requested():
+        controller.check_pause()
+
+        if not demux.run():
+            break
+
+    local_logger.info(
+        f"Forwarded: {demux.forwarded_counts}, dropped: {demux.dropped_counts}, "
+        f"frames decoded: {demux.message_filter.decoded_count}, "
+        f"skipped: {demux.message_filter.skipped_count}, bad: {demux.message_filter.bad_count}",
+        True,
+    )
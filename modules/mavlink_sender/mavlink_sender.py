@@ -0,0 +1,196 @@
+"""
+Serialized MAVLink transmission: workers queue messages, a single writer sends them.
+"""
+
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from ..common.modules.logger import logger
+
+
+class SenderStatistics:
+    """
+    Transmission counters of a MavlinkSender.
+    """
+
+    def __init__(self) -> None:
+        self.start_time = time.monotonic()
+        self.frame_count = 0
+        self.byte_count = 0
+        self.write_count = 0
+        self.error_count = 0
+        # seconds, from queueing by a worker to the write
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+
+    def bytes_per_second(self) -> float:
+        """
+        Average bytes written per second since creation.
+        """
+        elapsed = time.monotonic() - self.start_time
+        if elapsed <= 0.0:
+            return 0.0
+
+        return self.byte_count / elapsed
+
+    def latency_mean(self) -> float:
+        """
+        Average send latency in seconds.
+        """
+        if self.frame_count == 0:
+            return 0.0
+
+        return self.latency_sum / self.frame_count
+
+    def __str__(self) -> str:
+        frames_per_write = self.frame_count / self.write_count if self.write_count > 0 else 0.0
+        return (
+            f"frames: {self.frame_count}, writes: {self.write_count} "
+            f"({frames_per_write:.1f} frames/write), errors: {self.error_count}, "
+            f"{self.bytes_per_second():.0f} B/s, latency mean: {self.latency_mean() * 1000:.2f} ms "
+            f"max: {self.latency_max * 1000:.2f} ms"
+        )
+
+
+class MavlinkSender:
+    """
+    Owns the send side of the connection.
+    Encodes queued messages with its own sequence numbers and writes all that are pending
+    in a single write, so frames from different workers never interleave.
+    """
+
+    __private_key = object()
+
+    __TIMEOUT = 1.0  # seconds
+    __MAX_FRAMES_PER_WRITE = 64
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        local_logger: logger.Logger,
+    ) -> "tuple[True, MavlinkSender] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a MavlinkSender object.
+
+        input_queue: Messages queued by QueuedConnection.
+        """
+        return True, cls(cls.__private_key, connection, input_queue, local_logger)
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        local_logger: logger.Logger,
+    ) -> None:
+        assert key is MavlinkSender.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.input_queue = input_queue
+        self.local_logger = local_logger
+        self.statistics = SenderStatistics()
+
+    def run(self) -> bool:
+        """
+        Wait for queued messages and write all pending ones at once.
+
+        Returns whether the connection is still usable.
+        """
+        items = self.input_queue.get_many(self.__MAX_FRAMES_PER_WRITE, self.__TIMEOUT)
+
+        mav = self.connection.mav
+        frames = []
+        queue_times = []
+        for item in items:
+            # Sentinel from queue shutdown
+            if item is None:
+                continue
+
+            queue_time, msg, force_mavlink1 = item
+            frames.append(msg.pack(mav, force_mavlink1=force_mavlink1))
+            queue_times.append(queue_time)
+            mav.seq = (mav.seq + 1) % 256
+
+        if len(frames) == 0:
+            return True
+
+        buffer = b"".join(frames)
+        try:
+            self.connection.write(buffer)
+        except OSError as e:
+            self.statistics.error_count += 1
+            self.local_logger.error(f"MAVLink sender failed to write: {e}")
+            return False
+
+        now = time.monotonic()
+        mav.total_packets_sent += len(frames)
+        mav.total_bytes_sent += len(buffer)
+
+        self.statistics.frame_count += len(frames)
+        self.statistics.byte_count += len(buffer)
+        self.statistics.write_count += 1
+        for queue_time in queue_times:
+            latency = now - queue_time
+            self.statistics.latency_sum += latency
+            self.statistics.latency_max = max(self.statistics.latency_max, latency)
+
+        return True
+
+
+class QueuedMAVLink(mavutil.mavlink.MAVLink):
+    """
+    MAVLink whose send() queues the message for the MavlinkSender instead of writing it.
+    All the generated *_send() methods go through send().
+    """
+
+    def __init__(
+        self,
+        output_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        source_system: int,
+        source_component: int,
+    ) -> None:
+        super().__init__(None, source_system, source_component)
+        self.output_queue = output_queue
+
+    def send(self, mavmsg: mavutil.mavlink.MAVLink_message, force_mavlink1: bool = False) -> None:
+        """
+        Queues a message, encoding happens in the sender.
+        """
+        self.output_queue.queue.put((time.monotonic(), mavmsg, force_mavlink1))
+
+
+class QueuedConnection:
+    """
+    Send side of a connection backed by the MavlinkSender queue.
+    Used in place of the connection by modules that only send (connection.mav.*_send()).
+    """
+
+    def __init__(
+        self,
+        output_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        source_system: int,
+        source_component: int,
+    ) -> None:
+        """
+        output_queue: Input queue of the MavlinkSender.
+        source_system and source_component: Same as the connection.
+        """
+        self.output_queue = output_queue
+        self.source_system = source_system
+        self.source_component = source_component
+        # Created on first use, in the worker process, as it cannot be pickled
+        self.__mav = None
+
+    @property
+    def mav(self) -> QueuedMAVLink:
+        """
+        Same as mavfile.mav.
+        """
+        if self.__mav is None:
+            self.__mav = QueuedMAVLink(self.output_queue, self.source_system, self.source_component)
+
+        return self.__mav
@@ -0,0 +1,69 @@
+"""
+MAVLink sender worker, the only writer of the connection.
+"""
+
+import os
+import pathlib
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+from utilities.workers import worker_manager
+from . import mavlink_sender
+from ..common.modules.logger import logger
+
+
+STATISTICS_PERIOD = 10.0  # seconds
+
+
+def mavlink_sender_worker(
+    connection: mavutil.mavfile,
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Worker process.
+
+    connection is the connection to the drone, only this worker writes to it
+    input_queue is where workers queue messages to send, through QueuedConnection
+    controller is how the main process communicates to this worker process
+    """
+    # Instantiate logger
+    worker_name = pathlib.Path(__file__).stem
+    process_id = os.getpid()
+    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    if not result:
+        print("ERROR: Worker failed to create logger")
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    local_logger.info("Logger initialized", True)
+
+    # Instantiate class object (mavlink_sender.MavlinkSender)
+    result, sender = mavlink_sender.MavlinkSender.create(connection, input_queue, local_logger)
+    if not result:
+        local_logger.error("Failed to create MAVLink sender", True)
+        return
+
+    # Get Pylance to stop complaining
+    assert sender is not None
+
+    worker_manager.report_ready()
+
+    # Main loop: do work.
+    next_report = time.monotonic() + STATISTICS_PERIOD
+    while not controller.is_exit_requested():
+        controller.check_pause()
+
+        if not sender.run():
+            break
+
+        if time.monotonic() >= next_report:
+            local_logger.info(f"{sender.statistics}")
+            next_report += STATISTICS_PERIOD
+
+    local_logger.info(f"{sender.statistics}", True)
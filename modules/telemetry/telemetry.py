@@ -2,6 +2,11 @@
 Telemetry gathering logic.
 """
 
+import array
+import collections.abc
+import math
+import operator
+import struct
 import time
 
 from pymavlink import mavutil
@@ -12,8 +17,34 @@ from ..common.modules.logger import logger
 class TelemetryData:  # pylint: disable=too-many-instance-attributes
     """
     Python struct to represent Telemtry Data. Contains the most recent attitude and position reading.
+
+    Fixed layout: every field packs as a little endian double, with None stored as NaN.
     """
 
+    __slots__ = (
+        "time_since_boot",
+        "x",
+        "y",
+        "z",
+        "x_velocity",
+        "y_velocity",
+        "z_velocity",
+        "roll",
+        "pitch",
+        "yaw",
+        "roll_speed",
+        "pitch_speed",
+        "yaw_speed",
+        "position_age",
+        "attitude_age",
+    )
+
+    # Fields restored as int on unpack
+    __INTEGER_FIELDS = frozenset(["time_since_boot", "position_age", "attitude_age"])
+    __get_fields = operator.attrgetter(*__slots__)
+
+    STRUCT = struct.Struct(f"<{len(__slots__)}d")
+
     def __init__(
         self,
         time_since_boot: int | None = None,  # ms
@@ -29,6 +60,8 @@ class TelemetryData:  # pylint: disable=too-many-instance-attributes
         roll_speed: float | None = None,  # rad/s
         pitch_speed: float | None = None,  # rad/s
         yaw_speed: float | None = None,  # rad/s
+        position_age: int | None = None,  # ms
+        attitude_age: int | None = None,  # ms
     ) -> None:
         self.time_since_boot = time_since_boot
         self.x = x
@@ -43,6 +76,9 @@ class TelemetryData:  # pylint: disable=too-many-instance-attributes
         self.roll_speed = roll_speed
         self.pitch_speed = pitch_speed
         self.yaw_speed = yaw_speed
+        # Time between each component's own timestamp and time_since_boot
+        self.position_age = position_age
+        self.attitude_age = attitude_age
 
     def __str__(self) -> str:
         return f"""{{
@@ -58,9 +94,120 @@ class TelemetryData:  # pylint: disable=too-many-instance-attributes
             yaw: {self.yaw},
             roll_speed: {self.roll_speed},
             pitch_speed: {self.pitch_speed},
-            yaw_speed: {self.yaw_speed}
+            yaw_speed: {self.yaw_speed},
+            position_age: {self.position_age},
+            attitude_age: {self.attitude_age}
         }}"""
 
+    def __reduce__(self) -> "tuple":
+        # Pickle as constructor arguments instead of per-attribute slot state
+        return TelemetryData, self.__get_fields(self)
+
+    def to_values(self) -> "tuple[float, ...]":
+        """
+        Returns the fields in layout order as floats, with None as NaN.
+        """
+        return tuple(math.nan if value is None else value for value in self.__get_fields(self))
+
+    def pack(self) -> bytes:
+        """
+        Returns the fixed layout binary form.
+        """
+        return self.STRUCT.pack(*self.to_values())
+
+    @classmethod
+    def from_values(cls, values: "tuple[float, ...]") -> "TelemetryData":
+        """
+        Creates from fields in layout order, with NaN as None.
+        """
+        fields = []
+        for name, value in zip(cls.__slots__, values):
+            if math.isnan(value):
+                fields.append(None)
+            elif name in cls.__INTEGER_FIELDS:
+                fields.append(int(value))
+            else:
+                fields.append(value)
+
+        return cls(*fields)
+
+    @classmethod
+    def unpack(cls, buffer: bytes, offset: int = 0) -> "TelemetryData":
+        """
+        Creates from the fixed layout binary form.
+
+        buffer: Any bytes-like object.
+        offset: Position of the record in the buffer in bytes.
+        """
+        return cls.from_values(cls.STRUCT.unpack_from(buffer, offset))
+
+
+class TelemetryBatch:
+    """
+    Many TelemetryData in one contiguous buffer of doubles, in the TelemetryData layout.
+    Pickles as a single bytes object, so N samples cross a process boundary as one buffer.
+    """
+
+    FIELD_COUNT = len(TelemetryData.__slots__)
+
+    def __init__(self, values: "array.array | None" = None) -> None:
+        """
+        values: Flat array of doubles, FIELD_COUNT per sample.
+        """
+        if values is None:
+            values = array.array("d")
+
+        assert values.typecode == "d", "Values must be doubles"
+        assert len(values) % self.FIELD_COUNT == 0, "Values must contain whole samples"
+
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values) // self.FIELD_COUNT
+
+    def __getitem__(self, index: int) -> TelemetryData:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TelemetryBatch index out of range")
+
+        start = index * self.FIELD_COUNT
+        return TelemetryData.from_values(self.values[start : start + self.FIELD_COUNT])
+
+    def __iter__(self) -> collections.abc.Iterator[TelemetryData]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reduce__(self) -> "tuple":
+        return TelemetryBatch.from_bytes, (self.to_bytes(),)
+
+    def append(self, data: TelemetryData) -> None:
+        """
+        Appends a sample.
+        """
+        self.values.extend(data.to_values())
+
+    def clear(self) -> None:
+        """
+        Removes all samples, keeping the buffer type.
+        """
+        del self.values[:]
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the whole batch as bytes.
+        """
+        return self.values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes) -> "TelemetryBatch":
+        """
+        Creates a batch from the output of to_bytes().
+        """
+        values = array.array("d")
+        values.frombytes(buffer)
+        return cls(values)
+
 
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
@@ -72,17 +219,28 @@ class Telemetry:
 
     __private_key = object()
 
+    __MESSAGE_TYPES = ["ATTITUDE", "LOCAL_POSITION_NED"]
+    __TIMEOUT = 1.0  # seconds
+    __POLL_PERIOD = 0.01  # seconds
+
     @classmethod
     def create(
         cls,
         connection: mavutil.mavfile,
         local_logger: logger.Logger,
+        event_driven: bool = True,
+        streaming: bool = False,
     ) -> "tuple[True, Telemetry] | tuple[False, None]":
         """
         Falliable create (instantiation) method to create a Telemetry object.
+
+        event_driven: Block in select() on the connection until data arrives,
+            instead of polling every 10 ms.
+        streaming: Emit on every new message using the latest of the other message,
+            instead of waiting for a fresh pair.
         """
         try:
-            telemetry = cls(cls.__private_key, connection, local_logger)
+            telemetry = cls(cls.__private_key, connection, local_logger, event_driven, streaming)
             return True, telemetry
         except (OSError, mavutil.mavlink.MAVError) as e:
             local_logger.error(f"Failed to create telemetry object: {e}")
@@ -93,14 +251,88 @@ class Telemetry:
         key: object,
         connection: mavutil.mavfile,
         local_logger: logger.Logger,
+        event_driven: bool,
+        streaming: bool,
     ) -> None:
         assert key is Telemetry.__private_key, "Use create() method"
 
         self.connection = connection
         self.local_logger = local_logger
+        self.event_driven = event_driven
+        self.streaming = streaming
+        # Longest wait for an output in seconds
+        self.timeout = self.__TIMEOUT
         self.last_pos = None
         self.last_attitude = None
 
+    def __receive(self, deadline: float) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Receive the next ATTITUDE or LOCAL_POSITION_NED message before the deadline.
+
+        Returns None if the deadline passes first.
+        """
+        while True:
+            # Parse whatever is already buffered before waiting on the socket
+            msg = self.connection.recv_match(type=self.__MESSAGE_TYPES, blocking=False)
+            if msg is not None:
+                return msg
+
+            remaining = deadline - time.time()
+            if remaining <= 0.0:
+                return None
+
+            if self.event_driven:
+                # Wakes as soon as the socket is readable, nothing before the deadline ends the wait
+                if not self.connection.select(remaining):
+                    return None
+            else:
+                time.sleep(self.__POLL_PERIOD)
+
+    def update(self, msg: mavutil.mavlink.MAVLink_message) -> TelemetryData | None:
+        """
+        Records an ATTITUDE or LOCAL_POSITION_NED message.
+
+        Returns the combined data once both are known, None otherwise.
+        """
+        if msg.get_type() == "LOCAL_POSITION_NED":
+            self.last_pos = msg
+        elif msg.get_type() == "ATTITUDE":
+            self.last_attitude = msg
+
+        if not (self.last_pos and self.last_attitude):
+            return None
+
+        time_since_boot = max(self.last_attitude.time_boot_ms, self.last_pos.time_boot_ms)
+
+        telemetry_data = TelemetryData(
+            time_since_boot=time_since_boot,
+            x=self.last_pos.x,
+            y=self.last_pos.y,
+            z=self.last_pos.z,
+            x_velocity=self.last_pos.vx,
+            y_velocity=self.last_pos.vy,
+            z_velocity=self.last_pos.vz,
+            roll=self.last_attitude.roll,
+            pitch=self.last_attitude.pitch,
+            yaw=self.last_attitude.yaw,
+            roll_speed=self.last_attitude.rollspeed,
+            pitch_speed=self.last_attitude.pitchspeed,
+            yaw_speed=self.last_attitude.yawspeed,
+            position_age=time_since_boot - self.last_pos.time_boot_ms,
+            attitude_age=time_since_boot - self.last_attitude.time_boot_ms,
+        )
+        if not self.streaming:
+            self.last_attitude = None
+            self.last_pos = None
+        return telemetry_data
+
+    def expire(self) -> None:
+        """
+        Forgets the kept messages, when no output came within the timeout.
+        """
+        self.last_attitude = None
+        self.last_pos = None
+
     def run(
         self,
     ) -> TelemetryData | None:
@@ -111,50 +343,22 @@ class Telemetry:
         # Read MAVLink message LOCAL_POSITION_NED (32)
         # Read MAVLink message ATTITUDE (30)
         # Return the most recent of both, and use the most recent message's timestamp
+        # In streaming mode, the latest of both is kept and every new message produces an output
 
-        timeout = 1.0
-        start = time.time()
+        deadline = time.time() + self.timeout
 
         try:
-            while (time.time() - start) < timeout:
-                msg = self.connection.recv_match(
-                    type=["ATTITUDE", "LOCAL_POSITION_NED"], blocking=False, timeout=0.0
-                )
-
+            while True:
+                msg = self.__receive(deadline)
                 if msg is None:
-                    time.sleep(0.01)
-                    continue
-
-                if msg.get_type() == "LOCAL_POSITION_NED":
-                    self.last_pos = msg
-                elif msg.get_type() == "ATTITUDE":
-                    self.last_attitude = msg
-
-                if self.last_pos and self.last_attitude:
-
-                    telemetry_data = TelemetryData(
-                        time_since_boot=max(
-                            self.last_attitude.time_boot_ms, self.last_pos.time_boot_ms
-                        ),
-                        x=self.last_pos.x,
-                        y=self.last_pos.y,
-                        z=self.last_pos.z,
-                        x_velocity=self.last_pos.vx,
-                        y_velocity=self.last_pos.vy,
-                        z_velocity=self.last_pos.vz,
-                        roll=self.last_attitude.roll,
-                        pitch=self.last_attitude.pitch,
-                        yaw=self.last_attitude.yaw,
-                        roll_speed=self.last_attitude.rollspeed,
-                        pitch_speed=self.last_attitude.pitchspeed,
-                        yaw_speed=self.last_attitude.yawspeed,
-                    )
-                    self.last_attitude = None
-                    self.last_pos = None
+                    break
+
+                telemetry_data = self.update(msg)
+                if telemetry_data is not None:
                     return telemetry_data
 
-            self.last_attitude = None
-            self.last_pos = None
+            # No output within the window, so anything kept is stale
+            self.expire()
             return None
 
         except (OSError, mavutil.mavlink.MAVError) as e:
@@ -4,11 +4,11 @@ Telemtry worker that gathers GPS data.
 
 import os
 import pathlib
-import time
 
 from pymavlink import mavutil
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_manager
 from . import telemetry
 from ..common.modules.logger import logger
 
@@ -18,6 +18,7 @@ from ..common.modules.logger import logger
 # =================================================================================================
 def telemetry_worker(
     connection: mavutil.mavfile,
+    streaming: bool,
     queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
 ) -> None:
@@ -26,6 +27,7 @@ def telemetry_worker(
 
     queue is where the worker will communicate the status
     connection is the connection to the drone
+    streaming is whether to emit on every new message instead of on every new pair
     controller is how the communication happens
     """
     # =============================================================================================
@@ -50,12 +52,14 @@ def telemetry_worker(
     # =============================================================================================
     # Instantiate class object (telemetry.Telemetry)
     result, telemetry_obj = telemetry.Telemetry.create(
-        connection=connection, local_logger=local_logger
+        connection=connection, local_logger=local_logger, streaming=streaming
     )
     if not result:
         local_logger.error("Failed to create telemetry object")
         return
 
+    worker_manager.report_ready()
+
     # Main loop: do work.
     while not controller.is_exit_requested():
         controller.check_pause()
@@ -63,8 +67,6 @@ def telemetry_worker(
         local_logger.info(f"Telemetry data queued: {data}", True)
         queue.queue.put(data)
 
-        time.sleep(0.01)
-
     local_logger.info("Worker has stopped")
 
 
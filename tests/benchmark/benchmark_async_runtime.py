@@ -0,0 +1,366 @@
+"""
+Benchmark the asyncio runtime against the worker process runtime: memory, CPU, and the
+end-to-end latency from a telemetry sample leaving the drone to the command it causes arriving.
+
+The mocked drone sends a sample, waits for the command, and sends the next one on its period.
+Each runtime runs in a fresh process. Memory is the proportional set size (shared pages split
+between the processes sharing them) of the runtime and its workers, from /proc, so Linux only.
+To run:
+```
+python -m tests.benchmark.benchmark_async_runtime
+```
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import time
+
+from pymavlink import mavutil
+
+from modules.async_runtime import async_pipeline
+from modules.command import command
+from modules.command import command_worker
+from modules.common.modules.logger import logger
+from modules.common.modules.logger import logger_main_setup
+from modules.common.modules.read_yaml import read_yaml
+from modules.heartbeat import heartbeat_receiver
+from modules.heartbeat import heartbeat_receiver_worker
+from modules.heartbeat import heartbeat_sender
+from modules.heartbeat import heartbeat_sender_worker
+from modules.mavlink_demux import mavlink_demux
+from modules.mavlink_demux import mavlink_demux_worker
+from modules.mavlink_sender import mavlink_sender
+from modules.mavlink_sender import mavlink_sender_worker
+from modules.telemetry import telemetry
+from modules.telemetry import telemetry_worker
+from utilities.workers import conflating_queue
+from utilities.workers import shared_ring_queue
+from utilities.workers import worker_controller
+from utilities.workers import worker_manager
+
+
+DRONE_CONNECTION_STRING = "tcpin:localhost:12346"
+CONNECTION_STRING = "tcp:localhost:12346"
+
+RUN_TIME = 8.0  # seconds
+# Samples start after the runtime is up, and end before it stops
+WARMUP_TIME = 1.0  # seconds
+NUM_SAMPLES = 250
+SAMPLE_PERIOD = 0.02  # seconds
+COMMAND_TIMEOUT = 0.2  # seconds
+HEARTBEAT_PERIOD = 1.0  # seconds
+# Below the drone, so every sample causes an altitude change
+TARGET = command.Position(0, 0, 10)
+
+
+def run_drone(stop_event: mp.Event, results: mp.Queue) -> None:  # type: ignore
+    """
+    Mocked drone, reports the latency of every sample's command.
+    """
+    connection = mavutil.mavlink_connection(
+        DRONE_CONNECTION_STRING, source_system=1, source_component=1
+    )
+    connection.wait_heartbeat(timeout=30)
+    connection.mav.heartbeat_send(
+        mavutil.mavlink.MAV_TYPE_QUADROTOR, mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA, 0, 0, 0
+    )
+    time.sleep(WARMUP_TIME)
+
+    latencies = []
+    missed = 0
+    next_heartbeat = time.monotonic() + HEARTBEAT_PERIOD
+    next_sample = time.monotonic()
+    for _ in range(NUM_SAMPLES):
+        if time.monotonic() >= next_heartbeat:
+            connection.mav.heartbeat_send(
+                mavutil.mavlink.MAV_TYPE_QUADROTOR,
+                mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                0,
+                0,
+                0,
+            )
+            next_heartbeat += HEARTBEAT_PERIOD
+
+        time_boot_ms = int(time.monotonic() * 1000) % 2**32
+        start = time.perf_counter()
+        connection.mav.attitude_send(time_boot_ms, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        connection.mav.local_position_ned_send(time_boot_ms, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        msg = connection.recv_match(type="COMMAND_LONG", blocking=True, timeout=COMMAND_TIMEOUT)
+        if msg is None:
+            missed += 1
+        else:
+            latencies.append(time.perf_counter() - start)
+
+        next_sample += SAMPLE_PERIOD
+        time.sleep(max(next_sample - time.monotonic(), 0.0))
+
+    results.put(("drone", latencies, missed))
+    # Keep the link up until the runtime has stopped
+    stop_event.wait()
+    connection.close()
+
+
+def process_usage(process_id: int) -> "tuple[float, float]":
+    """
+    Returns the CPU time in seconds and the proportional set size in MiB of a process.
+    """
+    with open(f"/proc/{process_id}/stat", encoding="utf-8") as stat_file:
+        # Fields after the command name, which may contain spaces
+        fields = stat_file.read().rsplit(")", 1)[1].split()
+    cpu_time = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    memory = 0.0
+    with open(f"/proc/{process_id}/smaps_rollup", encoding="utf-8") as smaps_file:
+        for line in smaps_file:
+            if line.startswith("Pss:"):
+                memory = int(line.split()[1]) / 1024
+
+    return cpu_time, memory
+
+
+def total_usage() -> "tuple[float, float, int]":
+    """
+    Returns the CPU time, the proportional set size and the number of processes
+    of this process and its children.
+    """
+    process_ids = [os.getpid()] + [child.pid for child in mp.active_children()]
+    usages = [process_usage(process_id) for process_id in process_ids]
+    return (
+        sum(cpu_time for cpu_time, _ in usages),
+        sum(memory for _, memory in usages),
+        len(process_ids),
+    )
+
+
+def setup_logger() -> logger.Logger:
+    """
+    Main logger of a runtime.
+    """
+    result, config = read_yaml.open_config(logger.CONFIG_FILE_PATH)
+    assert result
+    assert config is not None
+
+    result, main_logger, _ = logger_main_setup.setup_main_logger(config)
+    assert result
+    assert main_logger is not None
+
+    return main_logger
+
+
+def measure_asyncio(results: mp.Queue) -> None:  # type: ignore
+    """
+    Runs the asyncio runtime.
+    """
+    main_logger = setup_logger()
+    connection = mavutil.mavlink_connection(CONNECTION_STRING)
+
+    result, sender = heartbeat_sender.HeartbeatSender.create(connection, main_logger)
+    assert result
+    result, receiver = heartbeat_receiver.HeartbeatReceiver.create(
+        connection, main_logger, drone_system=1
+    )
+    assert result
+    result, telemetry_object = telemetry.Telemetry.create(connection, main_logger)
+    assert result
+    result, command_object = command.Command.create(connection, TARGET, main_logger)
+    assert result
+
+    result, pipeline = async_pipeline.AsyncPipeline.create(
+        connection,
+        sender,
+        HEARTBEAT_PERIOD,
+        receiver,
+        telemetry_object,
+        command_object,
+        main_logger,
+    )
+    assert result
+    assert pipeline is not None
+
+    async def run() -> "tuple[float, float, int]":
+        stop_task = asyncio.create_task(pipeline.run(RUN_TIME))
+        await asyncio.sleep(RUN_TIME - 0.5)
+        usage = total_usage()
+        await stop_task
+        return usage
+
+    cpu_start, _, _ = total_usage()
+    cpu_end, memory, process_count = asyncio.run(run())
+    connection.close()
+
+    results.put(("runtime", cpu_end - cpu_start, memory, process_count))
+
+
+def measure_processes(results: mp.Queue) -> None:  # type: ignore
+    """
+    Runs the worker process runtime, wired as bootcamp_main does without acknowledgements.
+    """
+    # Workers get the connection as is, which only works when forked, as in bootcamp_main
+    mp.set_start_method("fork", force=True)
+
+    main_logger = setup_logger()
+    connection = mavutil.mavlink_connection(CONNECTION_STRING)
+    controller = worker_controller.WorkerController()
+
+    receiver_queue = shared_ring_queue.SharedRingQueue(10)
+    telemetry_queue = conflating_queue.ConflatingQueue()
+    command_queue = shared_ring_queue.SharedRingQueue(10)
+    heartbeat_channel = shared_ring_queue.SharedRingQueue(64)
+    telemetry_channel = shared_ring_queue.SharedRingQueue(64)
+    outbound_queue = shared_ring_queue.SharedRingQueue(64)
+    outbound_connection = mavlink_sender.QueuedConnection(
+        outbound_queue, connection.mav.srcSystem, connection.mav.srcComponent
+    )
+    queues = [
+        receiver_queue,
+        telemetry_queue,
+        command_queue,
+        heartbeat_channel,
+        telemetry_channel,
+        outbound_queue,
+    ]
+
+    workers = [
+        (
+            mavlink_demux_worker.mavlink_demux_worker,
+            (
+                connection,
+                [
+                    (["HEARTBEAT"], heartbeat_channel),
+                    (["ATTITUDE", "LOCAL_POSITION_NED"], telemetry_channel),
+                ],
+            ),
+            [],
+            [],
+            [],
+        ),
+        (mavlink_sender_worker.mavlink_sender_worker, (connection,), [], [outbound_queue], []),
+        (
+            heartbeat_sender_worker.heartbeat_sender_worker,
+            (outbound_connection, HEARTBEAT_PERIOD),
+            [],
+            [],
+            [],
+        ),
+        (
+            heartbeat_receiver_worker.heartbeat_receiver_worker,
+            (mavlink_demux.SubscribedConnection(heartbeat_channel), 1.1, 5, 5, 1, 1, None),
+            [heartbeat_channel],
+            [],
+            [receiver_queue],
+        ),
+        (
+            telemetry_worker.telemetry_worker,
+            (mavlink_demux.SubscribedConnection(telemetry_channel), False),
+            [telemetry_channel],
+            [],
+            [telemetry_queue],
+        ),
+        (
+            command_worker.command_worker,
+            (outbound_connection, TARGET, None, None, None, None, None),
+            [],
+            [telemetry_queue],
+            [command_queue],
+        ),
+    ]
+
+    worker_managers = []
+    for target, work_arguments, input_channels, input_queues, output_queues in workers:
+        result, properties = worker_manager.WorkerProperties.create(
+            target=target,
+            count=1,
+            work_arguments=work_arguments,
+            input_queues=input_queues,
+            output_queues=output_queues,
+            controller=controller,
+            local_logger=main_logger,
+            input_channels=input_channels,
+        )
+        assert result
+        assert properties is not None
+
+        result, manager = worker_manager.WorkerManager.create(properties, main_logger)
+        assert result
+        assert manager is not None
+
+        worker_managers.append(manager)
+
+    start_time = time.monotonic()
+    result, _ = worker_manager.WorkerManager.start_all_workers(worker_managers)
+    assert result
+    cpu_start, _, _ = total_usage()
+
+    # Main reads the outputs, as bootcamp_main does
+    while time.monotonic() - start_time < RUN_TIME - 0.5:
+        for output in [receiver_queue, command_queue]:
+            while not output.queue.empty():
+                output.queue.get_nowait()
+        time.sleep(0.01)
+
+    cpu_end, memory, process_count = total_usage()
+    worker_manager.WorkerManager.stop_workers(worker_managers)
+    for output in queues:
+        output.close()
+    connection.close()
+
+    results.put(("runtime", cpu_end - cpu_start, memory, process_count))
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    context = mp.get_context("spawn")
+    for name, measure in [("asyncio", measure_asyncio), ("processes", measure_processes)]:
+        results = context.Queue()
+        stop_event = context.Event()
+        drone_process = context.Process(target=run_drone, args=(stop_event, results))
+        drone_process.start()
+        # Let the drone listen first
+        time.sleep(0.5)
+        runtime_process = context.Process(target=measure, args=(results,))
+        runtime_process.start()
+
+        measurements = {}
+        try:
+            for _ in range(2):
+                item = results.get(timeout=RUN_TIME * 2)
+                measurements[item[0]] = item[1:]
+        except queue.Empty:
+            pass
+
+        runtime_process.join()
+        stop_event.set()
+        drone_process.join()
+
+        if len(measurements) < 2:
+            print(f"{name}: no results")
+            return -1
+
+        latencies, missed = measurements["drone"]
+        cpu_time, memory, process_count = measurements["runtime"]
+        if len(latencies) == 0:
+            print(f"{name}: no commands received")
+            return -1
+
+        latencies.sort()
+        print(
+            f"{name}: {process_count} processes, {memory:.1f} MiB, "
+            f"CPU {cpu_time / (RUN_TIME - 0.5) * 100:.1f}%, "
+            f"latency p50 {latencies[len(latencies) // 2] * 1000:.2f} ms "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms, "
+            f"{missed} of {NUM_SAMPLES} commands missed"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,115 @@
+"""
+Benchmark replaying a logged flight through Command one sample at a time against in batches.
+To run:
+```
+python -m tests.benchmark.benchmark_command_batch
+```
+"""
+
+import math
+import time
+
+from modules.command import command
+from modules.common.modules.logger import logger
+from modules.telemetry import telemetry
+
+
+NUM_SAMPLES = 100000
+BATCH_SIZES = [10, 100, 1000]
+TARGET = command.Position(10, 20, 30)
+
+
+class NullMav:
+    """
+    Discards commands, only the decision cost is measured.
+    """
+
+    def command_long_send(self, **kwargs: float) -> None:
+        """
+        Does nothing.
+        """
+        _ = kwargs
+
+
+class NullConnection:
+    """
+    Send side of a connection that discards everything.
+    """
+
+    def __init__(self) -> None:
+        self.mav = NullMav()
+
+
+def flight() -> telemetry.TelemetryBatch:
+    """
+    Circle at the target altitude.
+    """
+    batch = telemetry.TelemetryBatch()
+    for i in range(NUM_SAMPLES):
+        angle = i * 0.001
+        batch.append(
+            telemetry.TelemetryData(
+                time_since_boot=i,
+                x=10 * math.cos(angle),
+                y=10 * math.sin(angle),
+                z=30.0,
+                x_velocity=-math.sin(angle),
+                y_velocity=math.cos(angle),
+                z_velocity=0.0,
+                yaw=angle,
+            )
+        )
+
+    return batch
+
+
+def create_command(local_logger: logger.Logger) -> command.Command:
+    """
+    Command that discards its output.
+    """
+    result, command_object = command.Command.create(NullConnection(), TARGET, local_logger)
+    assert result
+    assert command_object is not None
+    return command_object
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    result, local_logger = logger.Logger.create("benchmark_command_batch", False)
+    if not result:
+        print("ERROR: Failed to create logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    batch = flight()
+    samples = list(batch)
+    poses = command.poses_from_batch(batch)
+
+    command_object = create_command(local_logger)
+    start = time.perf_counter()
+    for data in samples:
+        command_object.run(data)
+    elapsed = time.perf_counter() - start
+    print(f"per sample: {elapsed / NUM_SAMPLES * 1e6:.2f} µs per sample")
+
+    for batch_size in BATCH_SIZES:
+        command_object = create_command(local_logger)
+        start = time.perf_counter()
+        for offset in range(0, NUM_SAMPLES, batch_size):
+            command_object.run_batch(poses[offset : offset + batch_size])
+        elapsed = time.perf_counter() - start
+        print(f"batches of {batch_size}: {elapsed / NUM_SAMPLES * 1e6:.2f} µs per sample")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,95 @@
+"""
+Benchmark end to end staleness of a conflating queue against a bounded queue.
+
+A producer process puts timestamps at a fixed rate, and a consumer slower than the producer
+measures how old each item is when it starts working on it.
+To run:
+```
+python -m tests.benchmark.benchmark_conflating_queue
+```
+"""
+
+import multiprocessing as mp
+import time
+
+from utilities.workers import conflating_queue
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import shared_ring_queue
+
+
+PRODUCER_PERIOD = 0.001  # seconds
+CONSUMER_WORK = 0.005  # seconds
+DURATION = 3.0  # seconds
+QUEUE_SIZE = 10
+
+
+def produce(output_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+    """
+    Puts the current time periodically, followed by a sentinel.
+    """
+    end = time.monotonic() + DURATION
+    next_put = time.monotonic()
+    while next_put < end:
+        output_queue.queue.put(time.monotonic())
+        next_put += PRODUCER_PERIOD
+        time.sleep(max(next_put - time.monotonic(), 0.0))
+
+    output_queue.queue.put(None)
+
+
+def measure(data_queue: queue_proxy_wrapper.QueueProxyWrapper) -> "tuple[int, float, float]":
+    """
+    Returns number of items consumed, median and 99th percentile staleness in ms.
+    """
+    producer = mp.Process(target=produce, args=(data_queue,))
+    producer.start()
+
+    staleness = []
+    while True:
+        timestamp = data_queue.queue.get()
+        if timestamp is None:
+            break
+
+        staleness.append((time.monotonic() - timestamp) * 1000)
+        time.sleep(CONSUMER_WORK)
+
+    producer.join()
+
+    staleness.sort()
+    return (
+        len(staleness),
+        staleness[len(staleness) // 2],
+        staleness[len(staleness) * 99 // 100],
+    )
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    queues = [
+        (f"bounded ({QUEUE_SIZE})", shared_ring_queue.SharedRingQueue(QUEUE_SIZE)),
+        ("conflating", conflating_queue.ConflatingQueue()),
+    ]
+
+    print(
+        f"producer every {PRODUCER_PERIOD * 1000:.1f} ms, "
+        f"consumer takes {CONSUMER_WORK * 1000:.1f} ms per item"
+    )
+    for name, data_queue in queues:
+        count, median, percentile_99 = measure(data_queue)
+        print(
+            f"{name}: {count} items consumed, "
+            f"staleness median {median:.2f} ms p99 {percentile_99:.2f} ms"
+        )
+        data_queue.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
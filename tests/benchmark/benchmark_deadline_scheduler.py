@@ -0,0 +1,110 @@
+"""
+Benchmark the cadence of a periodic sender: sleeping a period after each send, against the
+deadline scheduler, idle and with every CPU busy.
+To run:
+```
+python -m tests.benchmark.benchmark_deadline_scheduler
+```
+"""
+
+import multiprocessing as mp
+import os
+import threading
+import time
+
+from utilities.timing import deadline_scheduler
+
+
+# Shorter than the 1 Hz heartbeat so the benchmark finishes quickly, drift scales with the count
+PERIOD = 0.02  # seconds
+NUM_PERIODS = 250
+# Time to send and log a heartbeat
+WORK_TIME = 0.001  # seconds
+
+
+def work() -> None:
+    """
+    Stands in for sending and logging.
+    """
+    end = time.perf_counter() + WORK_TIME
+    while time.perf_counter() < end:
+        pass
+
+
+def load(stop_event: mp.Event) -> None:  # type: ignore
+    """
+    Keeps a CPU busy.
+    """
+    count = 0
+    while not stop_event.is_set():
+        count += 1
+
+
+def run_sleep() -> deadline_scheduler.JitterHistogram:
+    """
+    Sends, then sleeps a period. Lateness is against the ideal cadence from the start.
+    """
+    histogram = deadline_scheduler.JitterHistogram(0.0005, 200)
+    start = time.monotonic()
+    for period in range(NUM_PERIODS):
+        histogram.record(time.monotonic() - (start + period * PERIOD))
+        work()
+        time.sleep(PERIOD)
+
+    return histogram
+
+
+def run_scheduler() -> "tuple[deadline_scheduler.JitterHistogram, int]":
+    """
+    Sends from the scheduler, waiting on an event like the worker controller.
+    """
+    scheduler = deadline_scheduler.DeadlineScheduler()
+    task = scheduler.add(
+        "heartbeat", PERIOD, work, histogram=deadline_scheduler.JitterHistogram(0.0005, 200)
+    )
+    exit_event = threading.Event()
+    while task.run_count + task.missed_count < NUM_PERIODS:
+        scheduler.run_pending()
+        exit_event.wait(scheduler.time_until_next())
+
+    return task.histogram, task.missed_count
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    for load_count in [0, os.cpu_count() or 1]:
+        stop_event = mp.Event()
+        loads = [mp.Process(target=load, args=(stop_event,)) for _ in range(load_count)]
+        for process in loads:
+            process.start()
+
+        sleep_histogram = run_sleep()
+        scheduler_histogram, missed = run_scheduler()
+
+        stop_event.set()
+        for process in loads:
+            process.join()
+
+        print(f"{load_count} busy processes, {NUM_PERIODS} periods of {PERIOD * 1000:g} ms:")
+        print(
+            f"  sleep:     mean {sleep_histogram.mean() * 1000:.3f} ms, "
+            f"p99 {sleep_histogram.percentile(99) * 1000:.3f} ms, "
+            f"drift at the end {sleep_histogram.max * 1000:.1f} ms"
+        )
+        print(
+            f"  scheduler: mean {scheduler_histogram.mean() * 1000:.3f} ms, "
+            f"p99 {scheduler_histogram.percentile(99) * 1000:.3f} ms, "
+            f"max {scheduler_histogram.max * 1000:.3f} ms, missed {missed}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,124 @@
+"""
+Benchmark geofence checks with polygons of 10k vertices.
+
+Compares the per position cost of the slab indexed ray cast and of testing every edge,
+for single positions and for batches.
+To run:
+```
+python -m tests.benchmark.benchmark_geofence
+```
+"""
+
+import time
+
+import numpy as np
+
+from modules.common.modules.logger import logger
+from modules.geofence import geofence
+
+
+NUM_VERTICES = 10000
+NUM_POSITIONS = 10000
+BATCH_SIZE = 100
+# Radial noise of the polygon, larger makes longer edges that span more slabs
+NOISE_LEVELS = [0.1, 2.0, 20.0]  # m
+
+
+def star(noise: float, generator: np.random.Generator) -> np.ndarray:
+    """
+    Polygon around a 100 m circle.
+    """
+    angles = np.linspace(0, 2 * np.pi, NUM_VERTICES, endpoint=False)
+    radii = 100 + generator.uniform(0, noise, NUM_VERTICES)
+    return np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])
+
+
+def brute_force(vertices: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """
+    NumPy ray cast of every position against every edge.
+    """
+    x0, y0 = vertices[:, 0], vertices[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    x = positions[:, 0, np.newaxis]
+    y = positions[:, 1, np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossings = ((y0 > y) != (y1 > y)) & (x < x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+
+    return crossings.sum(axis=1) % 2 == 1
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    result, local_logger = logger.Logger.create("benchmark_geofence", False)
+    if not result:
+        print("Failed to create logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    generator = np.random.default_rng(0)
+    positions = np.column_stack(
+        [
+            generator.uniform(-130, 130, NUM_POSITIONS),
+            generator.uniform(-130, 130, NUM_POSITIONS),
+            np.full(NUM_POSITIONS, 10.0),
+        ]
+    )
+
+    for noise in NOISE_LEVELS:
+        vertices = star(noise, generator)
+        start = time.perf_counter()
+        result, fences = geofence.Geofence.create(
+            [
+                geofence.PolygonFence("field", False, vertices.tolist(), 0.0, 50.0),
+                geofence.CylinderFence("tower", True, 20.0, 20.0, 5.0, 0.0, 50.0),
+            ],
+            local_logger,
+        )
+        build_time = time.perf_counter() - start
+        if not result:
+            print("Failed to create geofence")
+            return -1
+
+        # Get Pylance to stop complaining
+        assert fences is not None
+
+        start = time.perf_counter()
+        for x, y, z in positions.tolist():
+            fences.check(x, y, z)
+        single_cost = (time.perf_counter() - start) / NUM_POSITIONS * 1e6
+
+        start = time.perf_counter()
+        for i in range(0, NUM_POSITIONS, BATCH_SIZE):
+            fences.check_batch(positions[i : i + BATCH_SIZE])
+        batch_cost = (time.perf_counter() - start) / NUM_POSITIONS * 1e6
+
+        start = time.perf_counter()
+        for i in range(0, NUM_POSITIONS, BATCH_SIZE):
+            brute_force(vertices, positions[i : i + BATCH_SIZE])
+        brute_force_cost = (time.perf_counter() - start) / NUM_POSITIONS * 1e6
+
+        breaches = fences.check_batch(positions)
+        expected = ~brute_force(vertices, positions) | fences.fences[1].contains_batch(positions)
+        if not np.array_equal(breaches, expected):
+            print("Breaches differ from brute force")
+            return -1
+
+        print(
+            f"noise {noise} m: build {build_time * 1e3:.0f} ms, per position: "
+            f"single {single_cost:.2f} us, batch of {BATCH_SIZE} {batch_cost:.2f} us, "
+            f"all edges {brute_force_cost:.2f} us"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,95 @@
+"""
+Benchmark heartbeat liveness configurations on a simulated link: detection latency of outages,
+false disconnects from lost heartbeats, queue messages, and update cost.
+To run:
+```
+python -m tests.benchmark.benchmark_heartbeat_liveness
+```
+"""
+
+import random
+import time
+
+from modules.heartbeat import liveness_tracker
+
+
+# Window, lost threshold, regained threshold, in periods
+CONFIGURATIONS = [(5, 5, 1), (5, 3, 3), (8, 4, 5), (3, 3, 1)]
+LOSS_RATES = [0.0, 0.1, 0.3]
+NUM_OUTAGES = 200
+CONNECTED_PERIODS = 40
+OUTAGE_PERIODS = 15
+NUM_COST_UPDATES = 10**6
+
+
+def last_5_update(last_5_heartbeats: "list[bool]", received: bool) -> str:
+    """
+    The list based receiver before the tracker, for its cost.
+    """
+    last_5_heartbeats.pop(0)
+    last_5_heartbeats.append(received)
+    if True not in last_5_heartbeats:
+        return "Disconnected"
+    return "Connected"
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    for window, lost_threshold, regained_threshold in CONFIGURATIONS:
+        for loss_rate in LOSS_RATES:
+            generator = random.Random(0)
+            tracker = liveness_tracker.LivenessTracker(window, lost_threshold, regained_threshold)
+            lost_latencies = []
+            regained_latencies = []
+            false_disconnects = 0
+
+            for _ in range(NUM_OUTAGES):
+                # Link up with random losses, then down
+                for period in range(CONNECTED_PERIODS):
+                    transition = tracker.update(generator.random() >= loss_rate)
+                    if transition == tracker.CONNECTED:
+                        regained_latencies.append(period + 1)
+                    elif transition == tracker.DISCONNECTED:
+                        false_disconnects += 1
+
+                for period in range(OUTAGE_PERIODS):
+                    if tracker.update(False) == tracker.DISCONNECTED:
+                        lost_latencies.append(period + 1)
+
+            # Outages that start after a false disconnect have no latency
+            already_disconnected = NUM_OUTAGES - len(lost_latencies)
+            lost_mean = sum(lost_latencies) / max(len(lost_latencies), 1)
+            regained_mean = sum(regained_latencies) / max(len(regained_latencies), 1)
+            print(
+                f"window {window}, lost {lost_threshold}, regained {regained_threshold}, "
+                f"loss {loss_rate:.0%}: lost after {lost_mean:.2f} periods "
+                f"({already_disconnected} outages already disconnected), regained after {regained_mean:.2f}, "
+                f"false disconnects {false_disconnects}, "
+                f"messages {tracker.transition_count} instead of {tracker.period_count}"
+            )
+
+    tracker = liveness_tracker.LivenessTracker(5, 5, 1)
+    start = time.perf_counter()
+    for i in range(NUM_COST_UPDATES):
+        tracker.update(i % 3 != 0)
+    tracker_cost = (time.perf_counter() - start) / NUM_COST_UPDATES * 1e9
+
+    last_5_heartbeats = [False] * 5
+    start = time.perf_counter()
+    for i in range(NUM_COST_UPDATES):
+        last_5_update(last_5_heartbeats, i % 3 != 0)
+    list_cost = (time.perf_counter() - start) / NUM_COST_UPDATES * 1e9
+
+    print(f"update: bitmask {tracker_cost:.0f} ns, list {list_cost:.0f} ns")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,158 @@
+"""
+Benchmark a command burst sent directly against through the MAVLink sender.
+
+Producer processes send commands as fast as possible, as the command worker does
+when it drains a backlog of telemetry. The connection is a socket pair and every
+write is one send() syscall.
+To run:
+```
+python -m tests.benchmark.benchmark_mavlink_sender
+```
+"""
+
+import multiprocessing as mp
+import socket
+import threading
+import time
+
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.mavlink_sender import mavlink_sender
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import shared_ring_queue
+
+
+NUM_PRODUCERS = 2
+NUM_COMMANDS = 2000  # per producer
+QUEUE_SIZE = 64
+
+
+class SocketConnection:
+    """
+    Send side of a connection writing to a socket.
+    """
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.mav = mavutil.mavlink.MAVLink(self, 255, 0)
+        self.write_count = 0
+
+    def write(self, buffer: bytes) -> None:
+        """
+        One syscall per write.
+        """
+        self.sock.sendall(buffer)
+        self.write_count += 1
+
+
+def send_commands(connection: "SocketConnection | mavlink_sender.QueuedConnection") -> None:
+    """
+    Burst of yaw commands.
+    """
+    for i in range(NUM_COMMANDS):
+        connection.mav.command_long_send(
+            1, 0, mavutil.mavlink.MAV_CMD_CONDITION_YAW, 0, float(i), 5, 1, 1, 0, 0, 0
+        )
+
+
+def drain(sock: socket.socket, stop: threading.Event) -> None:
+    """
+    Reads the receive side so that the writer never blocks.
+    """
+    sock.settimeout(0.1)
+    while not stop.is_set():
+        try:
+            sock.recv(65536)
+        except socket.timeout:
+            pass
+
+
+def measure_direct(sock: socket.socket) -> "tuple[float, int]":
+    """
+    Returns elapsed seconds and syscalls with every producer writing itself.
+    The producers share the socket, which only works here because each frame is one send().
+    """
+    start = time.perf_counter()
+    producers = [
+        mp.Process(target=send_commands, args=(SocketConnection(sock),))
+        for _ in range(NUM_PRODUCERS)
+    ]
+    for producer in producers:
+        producer.start()
+
+    for producer in producers:
+        producer.join()
+
+    return time.perf_counter() - start, NUM_PRODUCERS * NUM_COMMANDS
+
+
+def measure_sender(
+    sock: socket.socket, outbound_queue: queue_proxy_wrapper.QueueProxyWrapper
+) -> "tuple[float, int, mavlink_sender.SenderStatistics]":
+    """
+    Returns elapsed seconds, syscalls and statistics with a single writer.
+    """
+    result, local_logger = logger.Logger.create("benchmark_mavlink_sender", False)
+    assert result
+    assert local_logger is not None
+
+    connection = SocketConnection(sock)
+    result, sender = mavlink_sender.MavlinkSender.create(connection, outbound_queue, local_logger)
+    assert result
+    assert sender is not None
+
+    start = time.perf_counter()
+    producers = [
+        mp.Process(
+            target=send_commands,
+            args=(mavlink_sender.QueuedConnection(outbound_queue, 255, 0),),
+        )
+        for _ in range(NUM_PRODUCERS)
+    ]
+    for producer in producers:
+        producer.start()
+
+    while sender.statistics.frame_count < NUM_PRODUCERS * NUM_COMMANDS:
+        sender.run()
+
+    elapsed = time.perf_counter() - start
+    for producer in producers:
+        producer.join()
+
+    return elapsed, connection.write_count, sender.statistics
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    write_socket, read_socket = socket.socketpair()
+    stop = threading.Event()
+    reader = threading.Thread(target=drain, args=(read_socket, stop))
+    reader.start()
+
+    outbound_queue = shared_ring_queue.SharedRingQueue(QUEUE_SIZE)
+
+    frame_count = NUM_PRODUCERS * NUM_COMMANDS
+    elapsed, syscalls = measure_direct(write_socket)
+    print(f"direct: {frame_count / elapsed:.0f} frames/s, {syscalls} syscalls")
+
+    elapsed, syscalls, statistics = measure_sender(write_socket, outbound_queue)
+    print(f"sender: {frame_count / elapsed:.0f} frames/s, {syscalls} syscalls, {statistics}")
+
+    stop.set()
+    reader.join()
+    outbound_queue.close()
+    write_socket.close()
+    read_socket.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
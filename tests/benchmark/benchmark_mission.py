@@ -0,0 +1,79 @@
+"""
+Benchmark the per tick cost of following a mission as the number of waypoints grows.
+
+Waypoints are spaced the same at every size, so a flat cost means it does not depend on the
+number of waypoints.
+To run:
+```
+python -m tests.benchmark.benchmark_mission
+```
+"""
+
+import math
+import time
+
+from modules.command import mission
+from modules.common.modules.logger import logger
+
+
+SIZES = [10, 1000, 100000]
+NUM_TICKS = 100000
+SPACING = 10.0  # m
+ACCEPTANCE_RADIUS = 1.0  # m
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    result, local_logger = logger.Logger.create("benchmark_mission", False)
+    if not result:
+        print("Failed to create logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    for size in SIZES:
+        # Lawnmower pattern on a square
+        side = math.ceil(math.sqrt(size))
+        waypoints = [
+            mission.Waypoint(
+                (i % side if (i // side) % 2 == 0 else side - 1 - i % side) * SPACING,
+                (i // side) * SPACING,
+                10.0,
+                ACCEPTANCE_RADIUS,
+            )
+            for i in range(size)
+        ]
+        result, mission_plan = mission.Mission.create(waypoints, local_logger)
+        if not result:
+            print("Failed to create mission")
+            return -1
+
+        # Get Pylance to stop complaining
+        assert mission_plan is not None
+
+        # Fly towards each waypoint in a few ticks, reaching it on the last one
+        start = time.perf_counter()
+        for tick in range(NUM_TICKS):
+            target = mission_plan.target()
+            fraction = (tick % 5 + 1) / 5
+            mission_plan.update(target.x - SPACING * (1 - fraction), target.y, target.z)
+
+        update_cost = (time.perf_counter() - start) / NUM_TICKS * 1e6
+
+        print(
+            f"{size} waypoints: update {update_cost:.2f} us per tick "
+            f"(reached {mission_plan.current})"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,134 @@
+"""
+Benchmark the peer table against scanning every peer each period, for swarms of peers sending
+heartbeats at 1 Hz with some of them dropping out.
+To run:
+```
+python -m tests.benchmark.benchmark_peer_table
+```
+"""
+
+import random
+import time
+
+from modules.heartbeat import peer_table
+
+
+PEER_COUNTS = [10, 100, 1000]
+COMPONENTS_PER_SYSTEM = 2
+HEARTBEAT_PERIOD = 1.0  # seconds
+PEER_TIMEOUT = 3.0  # seconds
+# Expiry checks per heartbeat period, as a receiver with a short period would make
+CHECKS_PER_PERIOD = 10
+NUM_PERIODS = 60
+DROPOUT_RATE = 0.05
+
+
+class FakeHeartbeat:
+    """
+    The parts of a HEARTBEAT message the table reads.
+    """
+
+    def __init__(self, system: int, component: int) -> None:
+        self.__system = system
+        self.__component = component
+        self.type = 2
+        self.autopilot = 3
+        self.system_status = 4
+
+    def get_srcSystem(self) -> int:  # pylint: disable=invalid-name
+        """
+        Sender system ID.
+        """
+        return self.__system
+
+    def get_srcComponent(self) -> int:  # pylint: disable=invalid-name
+        """
+        Sender component ID.
+        """
+        return self.__component
+
+
+def scan_expire(last_seen: "dict[tuple[int, int], float]", now: float) -> "list[tuple[int, int]]":
+    """
+    Checks the deadline of every connected peer.
+    """
+    expired = [key for key, seen in last_seen.items() if now - seen >= PEER_TIMEOUT]
+    for key in expired:
+        del last_seen[key]
+    return expired
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    for peer_count in PEER_COUNTS:
+        generator = random.Random(0)
+        messages = [
+            FakeHeartbeat(system, component)
+            for system in range(1, peer_count // COMPONENTS_PER_SYSTEM + 1)
+            for component in range(COMPONENTS_PER_SYSTEM)
+        ]
+        offsets = [generator.random() * HEARTBEAT_PERIOD for _ in messages]
+
+        # Heartbeats and expiry checks in time order, silent peers stay out for a few periods
+        events = []
+        silent_until = [0] * len(messages)
+        for period in range(NUM_PERIODS):
+            for index, message in enumerate(messages):
+                if period < silent_until[index]:
+                    continue
+                if generator.random() < DROPOUT_RATE:
+                    silent_until[index] = period + generator.randrange(2, 8)
+                    continue
+                events.append((period + offsets[index], message))
+            for check in range(CHECKS_PER_PERIOD):
+                events.append((period + check / CHECKS_PER_PERIOD, None))
+        events.sort(key=lambda event: event[0])
+
+        table = peer_table.PeerTable(PEER_TIMEOUT)
+        table_expired = 0
+        table_update_time = 0.0
+        table_expire_time = 0.0
+        for now, message in events:
+            start = time.perf_counter()
+            if message is None:
+                table_expired += len(table.expire(now))
+                table_expire_time += time.perf_counter() - start
+            else:
+                table.update(message, now)
+                table_update_time += time.perf_counter() - start
+
+        last_seen = {}
+        scan_expired = 0
+        scan_expire_time = 0.0
+        for now, message in events:
+            start = time.perf_counter()
+            if message is None:
+                scan_expired += len(scan_expire(last_seen, now))
+                scan_expire_time += time.perf_counter() - start
+            else:
+                last_seen[(message.get_srcSystem(), message.get_srcComponent())] = now
+
+        if table_expired != scan_expired:
+            print(f"Disconnections differ: {table_expired} and {scan_expired}")
+            return -1
+
+        update_count = len(events) - NUM_PERIODS * CHECKS_PER_PERIOD
+        check_count = NUM_PERIODS * CHECKS_PER_PERIOD
+        print(
+            f"{len(messages)} peers, {table_expired} disconnections: "
+            f"update {table_update_time / update_count * 1e6:.2f} us, "
+            f"expiry check {table_expire_time / check_count * 1e6:.2f} us "
+            f"instead of {scan_expire_time / check_count * 1e6:.2f} us scanning"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,128 @@
+"""
+Benchmark the pose estimator: cost and allocations per update, and the pose error at command
+time with and without prediction.
+To run:
+```
+python -m tests.benchmark.benchmark_pose_estimator
+```
+"""
+
+import math
+import time
+import tracemalloc
+
+import numpy as np
+
+from modules.common.modules.logger import logger
+from modules.estimator import kalman_filter
+from modules.estimator import pose_estimator
+from modules.telemetry import telemetry
+
+
+NUM_UPDATES = 100000
+PERIOD = 0.05  # s
+LATENCY = 0.1  # s, drone timestamp to the command decision
+SPEED = 5.0  # m/s
+TURN_RATE = 0.3  # rad/s
+POSITION_NOISE = 0.05  # m
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    # Filter alone
+    kalman = kalman_filter.ConstantRateFilter(3, 0.5, 0.2, 1.0)
+    kalman.update()
+    start = time.perf_counter()
+    for _ in range(NUM_UPDATES):
+        kalman.predict(PERIOD)
+        kalman.update()
+    filter_cost = (time.perf_counter() - start) / NUM_UPDATES * 1e6
+
+    # Warm up before tracing, the first calls fill caches
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(NUM_UPDATES // 10):
+        kalman.predict(PERIOD)
+        kalman.update()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"filter predict and update: {filter_cost:.2f} us, "
+        f"retained {after - before} bytes and peak {peak - before} bytes "
+        f"over {NUM_UPDATES // 10} updates"
+    )
+
+    result, local_logger = logger.Logger.create("benchmark_pose_estimator", False)
+    if not result:
+        print("Failed to create logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    result, estimator = pose_estimator.PoseEstimator.create(local_logger, latency=LATENCY)
+    if not result:
+        print("Failed to create pose estimator")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert estimator is not None
+
+    # Circle at constant speed, received LATENCY after it is measured
+    generator = np.random.default_rng(0)
+    raw_errors = []
+    predicted_errors = []
+    update_time = 0.0
+    for step in range(NUM_UPDATES // 10):
+        sample_time = step * PERIOD
+        heading = TURN_RATE * sample_time
+        radius = SPEED / TURN_RATE
+        data = telemetry.TelemetryData(
+            time_since_boot=round(sample_time * 1000),
+            x=radius * math.sin(heading) + generator.normal(0, POSITION_NOISE),
+            y=radius * (1 - math.cos(heading)) + generator.normal(0, POSITION_NOISE),
+            z=-10.0,
+            x_velocity=SPEED * math.cos(heading),
+            y_velocity=SPEED * math.sin(heading),
+            z_velocity=0.0,
+            roll=0.0,
+            pitch=0.0,
+            yaw=(heading + math.pi) % (2 * math.pi) - math.pi,
+            roll_speed=0.0,
+            pitch_speed=0.0,
+            yaw_speed=TURN_RATE,
+            position_age=0,
+            attitude_age=0,
+        )
+        now = 1000.0 + sample_time + LATENCY
+
+        start = time.perf_counter()
+        estimator.update(data, now)
+        update_time += time.perf_counter() - start
+
+        predicted = estimator.predict(now)
+        assert predicted is not None
+        true_heading = TURN_RATE * (sample_time + LATENCY)
+        true_x = radius * math.sin(true_heading)
+        true_y = radius * (1 - math.cos(true_heading))
+        raw_errors.append(math.hypot(data.x - true_x, data.y - true_y))
+        predicted_errors.append(math.hypot(predicted.x - true_x, predicted.y - true_y))
+
+    print(f"estimator update: {update_time / (NUM_UPDATES // 10) * 1e6:.2f} us")
+    print(
+        f"position error at decision time, {LATENCY * 1000:.0f} ms latency: "
+        f"latest sample {np.mean(raw_errors):.3f} m, predicted {np.mean(predicted_errors):.3f} m"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
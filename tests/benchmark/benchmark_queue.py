@@ -0,0 +1,123 @@
+"""
+Benchmark the shared memory ring queue against the manager proxied queue.
+
+Throughput is measured with a producer process streaming telemetry to main,
+latency with a ping pong between main and an echo process.
+To run:
+```
+python -m tests.benchmark.benchmark_queue
+```
+"""
+
+import multiprocessing as mp
+import time
+
+from modules.telemetry import telemetry
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import shared_ring_queue
+
+
+NUM_ITEMS = 10000
+NUM_ROUND_TRIPS = 2000
+QUEUE_SIZE = 10
+
+
+def produce(output_queue: queue_proxy_wrapper.QueueProxyWrapper, count: int) -> None:
+    """
+    Puts telemetry samples followed by a sentinel.
+    """
+    data = telemetry.TelemetryData(0, 1.0, 2.0, 3.0, 0.1, 0.2, 0.3, 0.0, 0.0, 1.5, 0.0, 0.0, 0.1)
+    for _ in range(count):
+        output_queue.queue.put(data)
+
+    output_queue.queue.put(None)
+
+
+def echo(
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    output_queue: queue_proxy_wrapper.QueueProxyWrapper,
+) -> None:
+    """
+    Sends every item back until the sentinel.
+    """
+    while True:
+        item = input_queue.queue.get()
+        output_queue.queue.put(item)
+        if item is None:
+            return
+
+
+def measure_throughput(data_queue: queue_proxy_wrapper.QueueProxyWrapper) -> float:
+    """
+    Returns items per second from a producer process to main.
+    """
+    producer = mp.Process(target=produce, args=(data_queue, NUM_ITEMS))
+    start = time.perf_counter()
+    producer.start()
+
+    while data_queue.queue.get() is not None:
+        pass
+
+    elapsed = time.perf_counter() - start
+    producer.join()
+
+    return NUM_ITEMS / elapsed
+
+
+def measure_latency(
+    ping_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    pong_queue: queue_proxy_wrapper.QueueProxyWrapper,
+) -> "tuple[float, float]":
+    """
+    Returns median and 99th percentile one way hop latency in µs.
+    """
+    echoer = mp.Process(target=echo, args=(ping_queue, pong_queue))
+    echoer.start()
+
+    data = telemetry.TelemetryData(0, 1.0, 2.0, 3.0)
+    hops = []
+    for _ in range(NUM_ROUND_TRIPS):
+        start = time.perf_counter()
+        ping_queue.queue.put(data)
+        pong_queue.queue.get()
+        hops.append((time.perf_counter() - start) / 2 * 1e6)
+
+    ping_queue.queue.put(None)
+    pong_queue.queue.get()
+    echoer.join()
+
+    hops.sort()
+    return hops[len(hops) // 2], hops[len(hops) * 99 // 100]
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    manager = mp.Manager()
+
+    manager_queues = [queue_proxy_wrapper.QueueProxyWrapper(manager, QUEUE_SIZE) for _ in range(3)]
+    ring_queues = [shared_ring_queue.SharedRingQueue(QUEUE_SIZE) for _ in range(3)]
+
+    for name, queues in [("manager", manager_queues), ("shared ring", ring_queues)]:
+        throughput = measure_throughput(queues[0])
+        median, percentile_99 = measure_latency(queues[1], queues[2])
+        print(
+            f"{name}: {throughput:.0f} items/s, "
+            f"hop latency median {median:.1f} µs p99 {percentile_99:.1f} µs"
+        )
+
+    for ring_queue in ring_queues:
+        ring_queue.close()
+
+    manager.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,141 @@
+"""
+Benchmark TelemetryData memory and serialization cost.
+
+Compares a plain attribute object (the previous TelemetryData layout) with the
+__slots__ TelemetryData and the TelemetryBatch buffer.
+To run:
+```
+python -m tests.benchmark.benchmark_telemetry_data
+```
+"""
+
+import pickle
+import time
+import tracemalloc
+
+from modules.telemetry import telemetry
+
+
+NUM_SAMPLES = 10000
+
+
+class PlainTelemetryData:  # pylint: disable=too-many-instance-attributes
+    """
+    TelemetryData as a plain attribute object, for comparison.
+    """
+
+    def __init__(self, **fields: "int | float") -> None:
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+def make_fields(i: int) -> "dict[str, int | float]":
+    """
+    Creates the fields of a fully populated sample.
+    """
+    return {
+        "time_since_boot": i,
+        "x": i * 0.1,
+        "y": i * 0.2,
+        "z": i * 0.3,
+        "x_velocity": 1.0,
+        "y_velocity": 2.0,
+        "z_velocity": 3.0,
+        "roll": 0.1,
+        "pitch": 0.2,
+        "yaw": 0.3,
+        "roll_speed": 0.01,
+        "pitch_speed": 0.02,
+        "yaw_speed": 0.03,
+        "position_age": 0,
+        "attitude_age": 10,
+    }
+
+
+def measure_memory(build: "(...) -> object") -> float:  # type: ignore
+    """
+    Returns the bytes allocated per sample by build().
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del kept
+    return (after - before) / NUM_SAMPLES
+
+
+def measure_pickle(items: "list[object]") -> "tuple[float, float]":
+    """
+    Returns the round trip time per sample (µs) and pickled bytes per sample
+    when every item crosses the process boundary separately.
+    """
+    size = 0
+    start = time.perf_counter()
+    for item in items:
+        buffer = pickle.dumps(item)
+        size += len(buffer)
+        pickle.loads(buffer)
+    elapsed = time.perf_counter() - start
+
+    return elapsed * 1e6 / NUM_SAMPLES, size / NUM_SAMPLES
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    # Field values are created once so only the containers are measured
+    fields_list = [make_fields(i) for i in range(NUM_SAMPLES)]
+    samples = [telemetry.TelemetryData(**fields) for fields in fields_list]
+    plain_samples = [PlainTelemetryData(**fields) for fields in fields_list]
+    batch = telemetry.TelemetryBatch()
+    for sample in samples:
+        batch.append(sample)
+
+    memory_plain = measure_memory(lambda: [PlainTelemetryData(**fields) for fields in fields_list])
+    memory_slots = measure_memory(
+        lambda: [telemetry.TelemetryData(**fields) for fields in fields_list]
+    )
+
+    def build_batch() -> telemetry.TelemetryBatch:
+        new_batch = telemetry.TelemetryBatch()
+        for sample in samples:
+            new_batch.append(sample)
+        return new_batch
+
+    memory_batch = measure_memory(build_batch)
+
+    time_plain, size_plain = measure_pickle(plain_samples)
+    time_slots, size_slots = measure_pickle(samples)
+
+    start = time.perf_counter()
+    buffer = pickle.dumps(batch)
+    pickle.loads(buffer)
+    time_batch = (time.perf_counter() - start) * 1e6 / NUM_SAMPLES
+    size_batch = len(buffer) / NUM_SAMPLES
+
+    print(f"{NUM_SAMPLES} samples")
+    print(
+        f"plain:  {memory_plain:.0f} B/sample in memory, "
+        f"pickle {time_plain:.2f} µs/sample, {size_plain:.0f} B/sample"
+    )
+    print(
+        f"slots:  {memory_slots:.0f} B/sample in memory, "
+        f"pickle {time_slots:.2f} µs/sample, {size_slots:.0f} B/sample"
+    )
+    print(
+        f"batch:  {memory_batch:.0f} B/sample in memory, "
+        f"pickle {time_batch:.2f} µs/sample, {size_batch:.0f} B/sample"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,138 @@
+"""
+Benchmark the telemetry receive loop against the mocked telemetry drone.
+
+Compares the sleep-polling receive mode with the event-driven (select) receive mode,
+and pairwise fusion with streaming fusion.
+To run:
+```
+python -m tests.benchmark.benchmark_telemetry_receive
+```
+"""
+
+import subprocess
+import sys
+import time
+
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.common.modules.logger import logger_main_setup
+from modules.common.modules.read_yaml import read_yaml
+from modules.telemetry import telemetry
+
+
+MOCK_DRONE_MODULE = "tests.integration.mock_drones.telemetry_drone"
+CONNECTION_STRING = "tcp:localhost:12345"
+
+
+def start_drone() -> subprocess.Popen:
+    """
+    Start the mocked drone.
+    """
+    return subprocess.Popen([sys.executable, "-m", MOCK_DRONE_MODULE])
+
+
+def measure(
+    event_driven: bool, streaming: bool, main_logger: logger.Logger
+) -> "tuple[int, float, float, float]":
+    """
+    Run telemetry against a fresh mocked drone until its first silent period.
+
+    Latency is the arrival time relative to the drone timestamp, offset by the fastest sample,
+    so it is the delay added by the receive loop (plus network jitter).
+
+    Returns number of samples, mean added latency (ms), max added latency (ms)
+    and CPU time per sample (ms).
+    """
+    drone_process = start_drone()
+
+    connection = mavutil.mavlink_connection(CONNECTION_STRING)
+    connection.mav.heartbeat_send(
+        mavutil.mavlink.MAV_TYPE_GCS,
+        mavutil.mavlink.MAV_AUTOPILOT_INVALID,
+        0,
+        0,
+        0,
+    )
+
+    result, telemetry_obj = telemetry.Telemetry.create(
+        connection, main_logger, event_driven, streaming
+    )
+    assert result
+    assert telemetry_obj is not None
+
+    offsets = []
+    cpu_start = time.process_time()
+    while True:
+        data = telemetry_obj.run()
+        arrival = time.time()
+        # The drone goes silent after its first phase
+        if data is None:
+            break
+
+        offsets.append(arrival - data.time_since_boot / 1000)
+    cpu_time = time.process_time() - cpu_start
+
+    connection.close()
+    drone_process.wait()
+
+    if len(offsets) == 0:
+        return 0, 0.0, 0.0, 0.0
+
+    fastest = min(offsets)
+    added_latencies = [(offset - fastest) * 1000 for offset in offsets]
+
+    return (
+        len(offsets),
+        sum(added_latencies) / len(added_latencies),
+        max(added_latencies),
+        cpu_time * 1000 / len(offsets),
+    )
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    # Configuration settings
+    result, config = read_yaml.open_config(logger.CONFIG_FILE_PATH)
+    if not result:
+        print("ERROR: Failed to load configuration file")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert config is not None
+
+    # Setup main logger
+    result, main_logger, _ = logger_main_setup.setup_main_logger(config)
+    if not result:
+        print("ERROR: Failed to create main logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert main_logger is not None
+
+    modes = [
+        ("polling", False, False),
+        ("event-driven", True, False),
+        ("event-driven streaming", True, True),
+    ]
+    for name, event_driven, streaming in modes:
+        samples, mean_latency, max_latency, cpu_per_sample = measure(
+            event_driven, streaming, main_logger
+        )
+        print(
+            f"{name}: {samples} samples, "
+            f"added latency mean {mean_latency:.2f} ms max {max_latency:.2f} ms, "
+            f"CPU {cpu_per_sample:.3f} ms/sample"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,57 @@
+"""
+Benchmark the per sample cost of the velocity statistics over 10^7 samples.
+
+The cost is reported for every tenth of the stream, constant cost means it does not grow.
+To run:
+```
+python -m tests.benchmark.benchmark_velocity_statistics
+```
+"""
+
+import random
+import time
+
+from modules.command import velocity_statistics
+
+
+NUM_SAMPLES = 10**7
+NUM_SEGMENTS = 10
+WINDOW = 100
+ALPHA = 0.1
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    generator = random.Random(0)
+    # Samples are reused cyclically, so that memory stays small
+    samples = [
+        (generator.gauss(0, 1), generator.gauss(0, 1), generator.gauss(0, 1)) for _ in range(1000)
+    ]
+    segment_size = NUM_SAMPLES // NUM_SEGMENTS
+
+    for name, statistics in [
+        ("cumulative mean", velocity_statistics.CumulativeMean()),
+        (f"window mean ({WINDOW})", velocity_statistics.WindowMean(WINDOW)),
+        (f"exponential mean ({ALPHA})", velocity_statistics.ExponentialMean(ALPHA)),
+        ("welford", velocity_statistics.WelfordStatistics()),
+    ]:
+        costs = []
+        for _ in range(NUM_SEGMENTS):
+            start = time.perf_counter()
+            for i in range(segment_size):
+                statistics.update(samples[i % 1000])
+            costs.append((time.perf_counter() - start) / segment_size * 1e9)
+
+        print(f"{name}: ns per sample by tenth: {' '.join(f'{cost:.0f}' for cost in costs)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
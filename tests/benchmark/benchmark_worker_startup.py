@@ -0,0 +1,116 @@
+"""
+Benchmark worker startup time per start method.
+
+Starts one worker per pipeline stage and reports the time until every worker has completed
+the readiness handshake. With spawn, every worker imports pymavlink again;
+with forkserver, it is imported once by the server. Thread workers start in main.
+To run:
+```
+python -m tests.benchmark.benchmark_worker_startup
+```
+"""
+
+import multiprocessing as mp
+
+# Imported by every spawned worker when it loads this module
+from pymavlink import mavutil  # pylint: disable=unused-import
+
+from modules.common.modules.logger import logger
+from modules.common.modules.logger import logger_main_setup
+from modules.common.modules.read_yaml import read_yaml
+from utilities.workers import worker_controller
+from utilities.workers import worker_manager
+
+
+NUM_GROUPS = 4
+NUM_RUNS = 3
+START_METHODS = ["spawn", "forkserver", "fork"]
+
+
+def idle_worker(controller: worker_controller.WorkerController) -> None:
+    """
+    Waits for exit.
+    """
+    worker_manager.report_ready()
+    controller.wait_for_exit()
+
+
+def measure(start_method: str, main_logger: logger.Logger, execution: str) -> "tuple[float, float]":
+    """
+    Returns the mean and max time to ready in ms over all runs.
+    """
+    # Synchronization objects must be created under the same start method
+    mp.set_start_method(start_method, force=True)
+
+    times = []
+    for _ in range(NUM_RUNS):
+        controller = worker_controller.WorkerController()
+        worker_managers = []
+        for _ in range(NUM_GROUPS):
+            result, properties = worker_manager.WorkerProperties.create(
+                count=1,
+                target=idle_worker,
+                work_arguments=(),
+                input_queues=[],
+                output_queues=[],
+                controller=controller,
+                local_logger=main_logger,
+                execution=execution,
+            )
+            assert result
+            assert properties is not None
+
+            result, manager = worker_manager.WorkerManager.create(properties, main_logger)
+            assert result
+            assert manager is not None
+
+            worker_managers.append(manager)
+
+        result, times_to_ready = worker_manager.WorkerManager.start_all_workers(worker_managers)
+        assert result
+        times.extend(times_to_ready.values())
+
+        # Spawned interpreters take longer to tear down
+        worker_manager.WorkerManager.stop_workers(worker_managers, join_timeout=1.0)
+
+    return sum(times) / len(times) * 1000, max(times) * 1000
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+    """
+    # Configuration settings
+    result, config = read_yaml.open_config(logger.CONFIG_FILE_PATH)
+    if not result:
+        print("ERROR: Failed to load configuration file")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert config is not None
+
+    # Setup main logger
+    result, main_logger, _ = logger_main_setup.setup_main_logger(config)
+    if not result:
+        print("ERROR: Failed to create main logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert main_logger is not None
+
+    for start_method in START_METHODS:
+        mean, maximum = measure(start_method, main_logger, worker_manager.WorkerProperties.PROCESS)
+        print(f"{start_method}: time to ready mean {mean:.1f} ms max {maximum:.1f} ms")
+
+    mean, maximum = measure("fork", main_logger, worker_manager.WorkerProperties.THREAD)
+    print(f"thread: time to ready mean {mean:.1f} ms max {maximum:.1f} ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -73,6 +73,8 @@ def main() -> int:
             if abs(msg.param2 - TURNING_SPEED) > FLOAT_TOLERANCE:
                 local_logger.error(f"Turning speed is not the desired value: {msg.param2}")
                 return -8
+        # Acknowledge so that the command is not retransmitted
+        connection.mav.command_ack_send(msg.command, mavutil.mavlink.MAV_RESULT_ACCEPTED)
         local_logger.info("Received a valid command")
 
     msg = connection.recv_match(type="COMMAND_LONG", blocking=True, timeout=TIMEOUT)
@@ -250,6 +250,11 @@ def main() -> int:
         # Place your own arguments here
         connection=connection,
         target=TARGET,
+        mission_plan=None,
+        fences=None,
+        estimator=None,
+        output_filter=None,
+        ack_connection=connection,
         data_queue=data_queue,
         output_queue=output_queue,
         controller=controller,
@@ -30,6 +30,7 @@ ERROR_TOLERANCE = 1e-2
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
 # Add your own constants here
+HEARTBEAT_TIMEOUT = HEARTBEAT_PERIOD * 1.1
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -143,7 +144,15 @@ def main() -> int:
     threading.Thread(target=read_queue, args=(output_queue, main_logger, controller)).start()
 
     heartbeat_receiver_worker.heartbeat_receiver_worker(
-        connection=connection, output_queue=output_queue, controller=controller
+        connection=connection,
+        timeout=HEARTBEAT_TIMEOUT,
+        window=DISCONNECT_THRESHOLD,
+        lost_threshold=DISCONNECT_THRESHOLD,
+        regained_threshold=1,
+        drone_system=None,
+        peer_timeout=None,
+        output_queue=output_queue,
+        controller=controller,
     )
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -98,7 +98,9 @@ def main() -> int:
     # Just set a timer to stop the worker after a while, since the worker infinite loops
     threading.Timer(HEARTBEAT_PERIOD * NUM_TRIALS, stop, (controller,)).start()
 
-    heartbeat_sender_worker.heartbeat_sender_worker(connection=connection, controller=controller)
+    heartbeat_sender_worker.heartbeat_sender_worker(
+        connection=connection, period=HEARTBEAT_PERIOD, controller=controller
+    )
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
     # =============================================================================================
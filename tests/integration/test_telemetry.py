@@ -131,7 +131,9 @@ def main() -> int:
     # Read the main queue (worker outputs)
     threading.Thread(target=read_queue, args=(queue, main_logger)).start()
 
-    telemetry_worker.telemetry_worker(connection=connection, queue=queue, controller=controller)
+    telemetry_worker.telemetry_worker(
+        connection=connection, streaming=False, queue=queue, controller=controller
+    )
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
     # =============================================================================================
@@ -0,0 +1,221 @@
+"""
+Test the asyncio runtime over a socket pair standing in for the drone link.
+"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.async_runtime import async_pipeline
+from modules.command import command
+from modules.common.modules.logger import logger
+from modules.heartbeat import heartbeat_receiver
+from modules.heartbeat import heartbeat_sender
+from modules.heartbeat import liveness_tracker
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Socket connection with the mavfile surface the runtime uses.
+    """
+
+    def __init__(self, port: socket.socket) -> None:
+        port.setblocking(False)
+        self.port = port
+        self.fd = port.fileno()
+        self.written = bytearray()
+        self.mav = mavutil.mavlink.MAVLink(self, 255, 0)
+
+    def write(self, buf: bytes) -> None:
+        """
+        Records what is sent.
+        """
+        self.written += buf
+
+
+class ResetPort:
+    """
+    Socket whose reads fail.
+    """
+
+    def recv(self, n: int) -> bytes:
+        """
+        Fails.
+        """
+        raise ConnectionResetError(f"Connection reset reading {n} bytes")
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Test logger.
+    """
+    result, test_logger = logger.Logger.create("test_async_pipeline", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def link() -> "tuple[FakeConnection, socket.socket]":  # type: ignore
+    """
+    Connection of the runtime and the drone end of the link.
+    """
+    local_port, drone_port = socket.socketpair()
+    yield FakeConnection(local_port), drone_port  # type: ignore
+    local_port.close()
+    drone_port.close()
+
+
+def drone_frames(z: float) -> bytes:
+    """
+    A heartbeat and a telemetry sample from system 1.
+    """
+    mav = mavutil.mavlink.MAVLink(None, 1, 1)
+    time_boot_ms = int(time.monotonic() * 1000) % 2**32
+    messages = [
+        mav.heartbeat_encode(
+            mavutil.mavlink.MAV_TYPE_QUADROTOR, mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA, 0, 0, 0
+        ),
+        mav.attitude_encode(time_boot_ms, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        mav.local_position_ned_encode(time_boot_ms, 0.0, 0.0, z, 0.0, 0.0, 0.0),
+    ]
+    return b"".join(msg.pack(mav) for msg in messages)
+
+
+def create_pipeline(
+    connection: FakeConnection, local_logger: logger.Logger
+) -> async_pipeline.AsyncPipeline:
+    """
+    Pipeline of the stages with their defaults.
+    """
+    result, sender = heartbeat_sender.HeartbeatSender.create(connection, local_logger)
+    assert result
+    result, receiver = heartbeat_receiver.HeartbeatReceiver.create(
+        connection, local_logger, timeout=0.1, drone_system=1
+    )
+    assert result
+    result, telemetry_object = telemetry.Telemetry.create(connection, local_logger)
+    assert result
+    result, command_object = command.Command.create(
+        connection, command.Position(0, 0, 10), local_logger
+    )
+    assert result
+
+    result, pipeline = async_pipeline.AsyncPipeline.create(
+        connection, sender, 0.05, receiver, telemetry_object, command_object, local_logger
+    )
+    assert result
+    assert pipeline is not None
+    return pipeline
+
+
+def sent_types(connection: FakeConnection) -> "list[str]":
+    """
+    Types of the messages the runtime wrote.
+    """
+    parser = mavutil.mavlink.MAVLink(None)
+    return [msg.get_type() for msg in parser.parse_buffer(bytes(connection.written)) or []]
+
+
+class TestAsyncPipeline:
+    """
+    Stages as tasks of one event loop.
+    """
+
+    def test_stages(
+        self, link: "tuple[FakeConnection, socket.socket]", local_logger: logger.Logger
+    ) -> None:
+        """
+        Heartbeats are sent on their period, and drone messages reach every stage.
+        """
+        # Setup
+        connection, drone_port = link
+
+        async def scenario() -> "tuple[bool, async_pipeline.AsyncPipeline]":
+            pipeline = create_pipeline(connection, local_logger)
+            drone_port.sendall(drone_frames(0.0))
+            result = await pipeline.run(0.22)
+            return result, pipeline
+
+        # Run
+        result, pipeline = asyncio.run(scenario())
+
+        # Test
+        types = sent_types(connection)
+        assert result
+        assert types.count("HEARTBEAT") in (4, 5)
+        assert types.count("COMMAND_LONG") == 1
+        assert pipeline.receiver.tracker.state == liveness_tracker.LivenessTracker.CONNECTED
+        assert pipeline.transport.forwarded_counts == {
+            "HEARTBEAT": 1,
+            "ATTITUDE": 1,
+            "LOCAL_POSITION_NED": 1,
+        }
+
+    def test_connection_failure(
+        self, link: "tuple[FakeConnection, socket.socket]", local_logger: logger.Logger
+    ) -> None:
+        """
+        A failed read stops every stage early.
+        """
+        # Setup
+        connection, drone_port = link
+
+        async def scenario() -> bool:
+            pipeline = create_pipeline(connection, local_logger)
+            connection.port = ResetPort()
+            drone_port.sendall(drone_frames(0.0))
+            return await pipeline.run(10.0)
+
+        # Run
+        start = time.monotonic()
+        result = asyncio.run(scenario())
+
+        # Test
+        assert not result
+        assert time.monotonic() - start < 1.0
+
+    def test_peer_closed(
+        self, link: "tuple[FakeConnection, socket.socket]", local_logger: logger.Logger
+    ) -> None:
+        """
+        The drone closing the link stops every stage early, without reconnecting.
+        """
+        # Setup
+        connection, drone_port = link
+
+        async def scenario() -> bool:
+            pipeline = create_pipeline(connection, local_logger)
+            drone_port.sendall(drone_frames(0.0))
+            drone_port.close()
+            return await pipeline.run(10.0)
+
+        # Run
+        start = time.monotonic()
+        result = asyncio.run(scenario())
+
+        # Test
+        assert not result
+        assert time.monotonic() - start < 1.0
+
+
+def test_put_latest() -> None:
+    """
+    A full queue keeps the newest items.
+    """
+    channel = asyncio.Queue(2)
+
+    for item in range(5):
+        async_pipeline.put_latest(channel, item)
+
+    assert [channel.get_nowait(), channel.get_nowait()] == [3, 4]
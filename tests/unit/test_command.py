@@ -0,0 +1,303 @@
+"""
+Test the batch decision path of Command against the per sample one.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from pymavlink import mavutil
+
+from modules.command import command
+from modules.command import command_filter
+from modules.common.modules.logger import logger
+from modules.estimator import pose_estimator
+from modules.geofence import geofence
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeMav:
+    """
+    Records sent commands.
+    """
+
+    def __init__(self) -> None:
+        self.commands = []
+
+    def command_long_send(self, **kwargs: float) -> None:
+        """
+        Records the command.
+        """
+        self.commands.append(kwargs)
+
+
+class FakeConnection:
+    """
+    Send side of a connection.
+    """
+
+    def __init__(self) -> None:
+        self.mav = FakeMav()
+
+
+TARGET = command.Position(10, 20, 30)
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Test logger.
+    """
+    result, test_logger = logger.Logger.create("test_command", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def batch() -> telemetry.TelemetryBatch:  # type: ignore
+    """
+    Climb then turn, ending with a yaw error.
+    """
+    new_batch = telemetry.TelemetryBatch()
+    for i in range(20):
+        new_batch.append(
+            telemetry.TelemetryData(
+                x=float(i),
+                y=0.0,
+                z=29.0 + i * 0.1,
+                yaw=-math.pi + i * 0.3,
+                x_velocity=1.0,
+                y_velocity=float(i % 3),
+                z_velocity=0.1,
+            )
+        )
+    yield new_batch  # type: ignore
+
+
+def create_command(local_logger: logger.Logger) -> "tuple[command.Command, FakeConnection]":
+    """
+    Command with a fake connection.
+    """
+    connection = FakeConnection()
+    result, command_object = command.Command.create(connection, TARGET, local_logger)
+    assert result
+    assert command_object is not None
+    return command_object, connection
+
+
+class TestRunBatch:
+    """
+    Batch results match running every sample.
+    """
+
+    def test_matches_per_sample(
+        self, batch: telemetry.TelemetryBatch, local_logger: logger.Logger
+    ) -> None:
+        """
+        Same decision for the last sample and same average velocity, with a single command.
+        """
+        # Setup
+        expected_command, expected_connection = create_command(local_logger)
+        actual_command, actual_connection = create_command(local_logger)
+
+        # Run
+        for data in batch:
+            expected = expected_command.run(data)
+        actual = actual_command.run_batch(command.poses_from_batch(batch))
+
+        # Test
+        assert actual is not None
+        assert expected is not None
+        assert actual.split(":")[0] == expected.split(":")[0]
+        assert len(actual_connection.mav.commands) == 1
+        assert actual_connection.mav.commands[0] == pytest.approx(
+            expected_connection.mav.commands[-1]
+        )
+        assert actual_command.statistics.mean() == pytest.approx(expected_command.statistics.mean())
+
+    def test_evaluate_continues_running_average(
+        self, batch: telemetry.TelemetryBatch, local_logger: logger.Logger
+    ) -> None:
+        """
+        Splitting a batch gives the same per sample results.
+        """
+        # Setup
+        poses = command.poses_from_batch(batch)
+        whole_command, _ = create_command(local_logger)
+        split_command, _ = create_command(local_logger)
+
+        # Run
+        whole = whole_command.evaluate_batch(poses)
+        first = split_command.evaluate_batch(poses[:7])
+        second = split_command.evaluate_batch(poses[7:])
+
+        # Test
+        for whole_values, first_values, second_values in zip(whole, first, second):
+            np.testing.assert_allclose(whole_values, np.concatenate([first_values, second_values]))
+
+    def test_empty(self, local_logger: logger.Logger) -> None:
+        """
+        An empty batch sends nothing.
+        """
+        # Setup
+        command_object, connection = create_command(local_logger)
+
+        # Run
+        result = command_object.run_batch(np.empty((0, telemetry.TelemetryBatch.FIELD_COUNT)))
+
+        # Test
+        assert result is None
+        assert len(connection.mav.commands) == 0
+
+
+class TestOutputFilter:
+    """
+    Repeated decisions with a filter.
+    """
+
+    def test_repeats_suppressed(self, local_logger: logger.Logger) -> None:
+        """
+        Samples needing the same altitude change send a single command.
+        """
+        # Setup
+        output_filter = command_filter.CommandFilter(100.0, 60.0)
+        connection = FakeConnection()
+        result, command_object = command.Command.create(
+            connection, TARGET, local_logger, output_filter=output_filter
+        )
+        assert result
+        assert command_object is not None
+        data = telemetry.TelemetryData(
+            x=0.0, y=0.0, z=25.0, yaw=0.0, x_velocity=0.0, y_velocity=0.0, z_velocity=0.0
+        )
+
+        # Run
+        decisions = [command_object.run(data) for _ in range(5)]
+
+        # Test
+        assert decisions[0] is not None
+        assert decisions[1:] == [None] * 4
+        assert len(connection.mav.commands) == 1
+        assert output_filter.sent_count == 1
+        assert output_filter.duplicate_count == 4
+
+
+class TestGeofence:
+    """
+    Breaches override the other commands.
+    """
+
+    def test_return_to_launch_once(self, local_logger: logger.Logger) -> None:
+        """
+        Entering a keep-out zone returns to launch once, leaving it resumes.
+        """
+        # Setup
+        result, fences = geofence.Geofence.create(
+            [geofence.CylinderFence("zone", True, 0.0, 0.0, 5.0, 0.0, 50.0)], local_logger
+        )
+        assert result
+        assert fences is not None
+        connection = FakeConnection()
+        result, command_object = command.Command.create(
+            connection, TARGET, local_logger, fences=fences
+        )
+        assert result
+        assert command_object is not None
+        inside = telemetry.TelemetryData(
+            x=0.0, y=0.0, z=25.0, yaw=0.0, x_velocity=0.0, y_velocity=0.0, z_velocity=0.0
+        )
+        outside = telemetry.TelemetryData(
+            x=10.0, y=0.0, z=25.0, yaw=0.0, x_velocity=0.0, y_velocity=0.0, z_velocity=0.0
+        )
+
+        # Run
+        decisions = [command_object.run(data) for data in (inside, inside, outside)]
+
+        # Test
+        assert decisions[0] == "GEOFENCE_BREACH: ['zone']"
+        assert decisions[1] is None
+        assert decisions[2] is not None and decisions[2].startswith("ALT_CHANGE")
+        assert [sent["command"] for sent in connection.mav.commands] == [
+            mavutil.mavlink.MAV_CMD_NAV_RETURN_TO_LAUNCH,
+            mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT,
+        ]
+
+    def test_estimator_tracks_breach(self, local_logger: logger.Logger) -> None:
+        """
+        The estimator is updated during a breach, so it tracks the pose once the breach ends.
+        """
+        # Setup
+        result, fences = geofence.Geofence.create(
+            [geofence.CylinderFence("zone", True, 0.0, 0.0, 5.0, 0.0, 50.0)], local_logger
+        )
+        assert result
+        assert fences is not None
+        result, estimator = pose_estimator.PoseEstimator.create(local_logger)
+        assert result
+        assert estimator is not None
+        result, command_object = command.Command.create(
+            FakeConnection(), TARGET, local_logger, fences=fences, estimator=estimator
+        )
+        assert result
+        assert command_object is not None
+
+        def hover(x: float, time_since_boot: int) -> telemetry.TelemetryData:
+            return telemetry.TelemetryData(
+                time_since_boot=time_since_boot,
+                x=x,
+                y=0.0,
+                z=25.0,
+                roll=0.0,
+                pitch=0.0,
+                yaw=0.0,
+                x_velocity=0.0,
+                y_velocity=0.0,
+                z_velocity=0.0,
+            )
+
+        # Run
+        command_object.run(hover(20.0, 0))
+        for i in range(1, 11):
+            command_object.run(hover(4.0, i * 100))
+        breach_pose = estimator.predict()
+        command_object.run(hover(6.0, 1100))
+        exit_pose = estimator.predict()
+
+        # Test
+        assert estimator.update_count == 12
+        assert breach_pose is not None
+        assert breach_pose.x == pytest.approx(4.0, abs=2.0)
+        assert not command_object.breached
+        assert exit_pose is not None
+        assert exit_pose.x == pytest.approx(6.0, abs=2.0)
+
+    def test_batch_breach(
+        self, batch: telemetry.TelemetryBatch, local_logger: logger.Logger
+    ) -> None:
+        """
+        A breach in the middle of a batch overrides.
+        """
+        # Setup
+        result, fences = geofence.Geofence.create(
+            [geofence.CylinderFence("zone", True, 10.0, 0.0, 0.5, 0.0, 50.0)], local_logger
+        )
+        assert result
+        assert fences is not None
+        command_object, connection = create_command(local_logger)
+        command_object.fences = fences
+
+        # Run
+        decision = command_object.run_batch(command.poses_from_batch(batch))
+
+        # Test
+        assert decision == "GEOFENCE_BREACH: ['zone']"
+        assert [sent["command"] for sent in connection.mav.commands] == [
+            mavutil.mavlink.MAV_CMD_NAV_RETURN_TO_LAUNCH
+        ]
+        assert not command_object.breached
@@ -0,0 +1,113 @@
+"""
+Test command deduplication and rate limiting.
+"""
+
+import pickle
+
+import pytest
+
+from modules.command import command_filter
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+ALTITUDE = 113
+YAW = 115
+PARAMETERS = (1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 30.0)
+
+
+@pytest.fixture()
+def output_filter() -> command_filter.CommandFilter:  # type: ignore
+    """
+    At most 10 commands per second, duplicates resent after 1 second.
+    """
+    yield command_filter.CommandFilter(10.0, 1.0)  # type: ignore
+
+
+class TestCommandFilter:
+    """
+    Suppression rules.
+    """
+
+    def test_duplicate_suppressed_until_timeout(
+        self, output_filter: command_filter.CommandFilter
+    ) -> None:
+        """
+        The same command with about the same error is only sent again after the timeout.
+        """
+        # Run
+        results = [
+            output_filter.should_send(ALTITUDE, PARAMETERS, 2.0, 0.0),
+            output_filter.should_send(ALTITUDE, PARAMETERS, 2.1, 0.5),
+            output_filter.should_send(ALTITUDE, PARAMETERS, 2.0, 1.0),
+        ]
+
+        # Test
+        assert results == [True, False, True]
+        assert output_filter.sent_count == 2
+        assert output_filter.duplicate_count == 1
+
+    def test_changes_sent(self, output_filter: command_filter.CommandFilter) -> None:
+        """
+        A changed parameter, a changed error or another command is sent.
+        """
+        # Setup
+        changed_parameters = PARAMETERS[:6] + (35.0,)
+
+        # Run
+        results = [
+            output_filter.should_send(ALTITUDE, PARAMETERS, 2.0, 0.0),
+            output_filter.should_send(ALTITUDE, changed_parameters, 2.0, 0.2),
+            output_filter.should_send(ALTITUDE, changed_parameters, 5.0, 0.4),
+            output_filter.should_send(YAW, (10.0, 5, -1, 1, 0, 0, 0), 10.0, 0.6),
+        ]
+
+        # Test
+        assert results == [True, True, True, True]
+        assert output_filter.suppressed_count() == 0
+
+    def test_acknowledge(self, output_filter: command_filter.CommandFilter) -> None:
+        """
+        After an acknowledgement the same command is sent again.
+        """
+        # Run
+        output_filter.should_send(ALTITUDE, PARAMETERS, 2.0, 0.0)
+        output_filter.acknowledge(ALTITUDE)
+        result = output_filter.should_send(ALTITUDE, PARAMETERS, 2.0, 0.5)
+
+        # Test
+        assert result
+
+    def test_rate_limit(self, output_filter: command_filter.CommandFilter) -> None:
+        """
+        Different commands closer than the minimum interval are suppressed.
+        """
+        # Run
+        results = [
+            output_filter.should_send(ALTITUDE, PARAMETERS, 2.0, 0.0),
+            output_filter.should_send(YAW, (10.0, 5, -1, 1, 0, 0, 0), 10.0, 0.05),
+            output_filter.should_send(YAW, (10.0, 5, -1, 1, 0, 0, 0), 10.0, 0.1),
+        ]
+
+        # Test
+        assert results == [True, False, True]
+        assert output_filter.rate_limited_count == 1
+
+    def test_pickled(self, output_filter: command_filter.CommandFilter) -> None:
+        """
+        The filter can be passed to a spawned worker, with its state and a new lock.
+        """
+        # Setup
+        output_filter.should_send(ALTITUDE, PARAMETERS, 5.0, now=0.0)
+
+        # Run
+        copy = pickle.loads(pickle.dumps(output_filter))
+
+        # Test
+        assert copy.sent_count == 1
+        assert not copy.should_send(ALTITUDE, PARAMETERS, 5.0, now=0.5)
+        copy.acknowledge(ALTITUDE)
+        assert copy.should_send(ALTITUDE, PARAMETERS, 5.0, now=0.6)
@@ -0,0 +1,217 @@
+"""
+Test acknowledgement tracking and retransmission of commands.
+"""
+
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.command import command_tracker
+from modules.common.modules.logger import logger
+from modules.mavlink_demux import mavlink_demux
+from utilities.workers import shared_ring_queue
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+ALTITUDE = mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT
+PARAMETERS = (1, 0, 0, 0, 0, 0, 30)
+
+
+class FakeMav:
+    """
+    Records sent commands.
+    """
+
+    def __init__(self) -> None:
+        self.commands = []
+
+    def command_long_send(self, **kwargs: float) -> None:
+        """
+        Records the command.
+        """
+        self.commands.append(kwargs)
+
+
+class FakeConnection:
+    """
+    Send side of a connection.
+    """
+
+    def __init__(self) -> None:
+        self.mav = FakeMav()
+
+
+@pytest.fixture()
+def ack_channel() -> shared_ring_queue.SharedRingQueue:  # type: ignore
+    """
+    Acknowledgements to the tracker, freed after the test.
+    """
+    channel = shared_ring_queue.SharedRingQueue(8)
+    yield channel  # type: ignore
+    channel.close()
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Test logger.
+    """
+    result, test_logger = logger.Logger.create("test_command_tracker", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+def create_tracker(
+    ack_channel: shared_ring_queue.SharedRingQueue, local_logger: logger.Logger
+) -> "tuple[command_tracker.CommandTracker, FakeConnection]":
+    """
+    Started tracker with a 50 ms acknowledgement timeout and 2 retries.
+    """
+    connection = FakeConnection()
+    result, tracker = command_tracker.CommandTracker.create(
+        connection,
+        mavlink_demux.SubscribedConnection(ack_channel),
+        local_logger,
+        ack_timeout=0.05,
+        max_retries=2,
+    )
+    assert result
+    assert tracker is not None
+    tracker.start()
+    return tracker, connection
+
+
+def wait_until_idle(tracker: command_tracker.CommandTracker, timeout: float) -> None:
+    """
+    Waits for the in flight table to empty.
+    """
+    deadline = time.monotonic() + timeout
+    while tracker.in_flight_count() > 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestCommandTracker:
+    """
+    Matching, retransmission and statistics.
+    """
+
+    def test_acknowledged(
+        self, ack_channel: shared_ring_queue.SharedRingQueue, local_logger: logger.Logger
+    ) -> None:
+        """
+        An acknowledged command is not retransmitted and its latency is recorded.
+        """
+        # Setup
+        tracker, connection = create_tracker(ack_channel, local_logger)
+        acknowledged = []
+        tracker.on_acknowledged = acknowledged.append
+
+        # Run
+        tracker.send(ALTITUDE, PARAMETERS)
+        ack_channel.queue.put(
+            mavutil.mavlink.MAVLink_command_ack_message(
+                ALTITUDE, mavutil.mavlink.MAV_RESULT_ACCEPTED
+            )
+        )
+        wait_until_idle(tracker, 1.0)
+        time.sleep(0.1)
+        tracker.stop()
+
+        # Test
+        assert len(connection.mav.commands) == 1
+        assert tracker.accepted_count == 1
+        assert tracker.retry_count == 0
+        assert acknowledged == [ALTITUDE]
+        assert set(tracker.latency_percentiles()) == {50, 90, 99}
+
+    def test_retransmitted_then_expired(
+        self, ack_channel: shared_ring_queue.SharedRingQueue, local_logger: logger.Logger
+    ) -> None:
+        """
+        Without acknowledgement, the command is resent with incremented confirmation
+        until the retries run out.
+        """
+        # Setup
+        tracker, connection = create_tracker(ack_channel, local_logger)
+
+        # Run
+        tracker.send(ALTITUDE, PARAMETERS)
+        wait_until_idle(tracker, 1.0)
+        tracker.stop()
+
+        # Test
+        assert [command["confirmation"] for command in connection.mav.commands] == [0, 1, 2]
+        assert tracker.retry_count == 2
+        assert tracker.expired_count == 1
+        assert tracker.latency_percentiles() == {}
+
+    def test_unmatched(
+        self, ack_channel: shared_ring_queue.SharedRingQueue, local_logger: logger.Logger
+    ) -> None:
+        """
+        Acknowledgements of commands not in flight are counted and ignored.
+        """
+        # Setup
+        tracker, _ = create_tracker(ack_channel, local_logger)
+
+        # Run
+        ack_channel.queue.put(
+            mavutil.mavlink.MAVLink_command_ack_message(
+                ALTITUDE, mavutil.mavlink.MAV_RESULT_ACCEPTED
+            )
+        )
+        time.sleep(0.1)
+        tracker.stop()
+
+        # Test
+        assert tracker.unmatched_count == 1
+
+    def test_stop_when_closed(
+        self, ack_channel: shared_ring_queue.SharedRingQueue, local_logger: logger.Logger
+    ) -> None:
+        """
+        The shutdown sentinel ends the thread, so stop returns at once.
+        """
+        # Setup
+        tracker, _ = create_tracker(ack_channel, local_logger)
+        time.sleep(0.05)
+
+        # Run
+        ack_channel.queue.put(None)
+        time.sleep(0.05)
+        start = time.monotonic()
+        tracker.stop()
+
+        # Test
+        assert time.monotonic() - start < 0.05
+
+    def test_raw_connection(self, local_logger: logger.Logger) -> None:
+        """
+        A connection without a shutdown sentinel keeps the thread running past the idle timeout.
+        """
+        # Setup
+        ack_connection = mavutil.mavlink_connection("udpin:127.0.0.1:0")
+        connection = FakeConnection()
+        result, tracker = command_tracker.CommandTracker.create(
+            connection, ack_connection, local_logger, ack_timeout=0.05, max_retries=2
+        )
+        assert result
+        assert tracker is not None
+        tracker.start()
+
+        # Run
+        time.sleep(0.6)
+        tracker.send(ALTITUDE, PARAMETERS)
+        wait_until_idle(tracker, 1.0)
+        tracker.stop()
+        ack_connection.close()
+
+        # Test
+        assert [command["confirmation"] for command in connection.mav.commands] == [0, 1, 2]
+        assert tracker.expired_count == 1
@@ -0,0 +1,82 @@
+"""
+Test the conflating (latest value) queue.
+"""
+
+import queue
+
+import pytest
+
+from utilities.workers import conflating_queue
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def latest_queue() -> conflating_queue.ConflatingQueue:  # type: ignore
+    """
+    Empty queue, freed after the test.
+    """
+    new_queue = conflating_queue.ConflatingQueue(64)
+    yield new_queue  # type: ignore
+    new_queue.close()
+
+
+class TestConflatingQueue:
+    """
+    Latest value semantics.
+    """
+
+    def test_newest_wins(self, latest_queue: conflating_queue.ConflatingQueue) -> None:
+        """
+        Only the last put is returned, with the number of puts as the sequence number.
+        """
+        # Setup
+        for i in range(5):
+            latest_queue.queue.put(i)
+
+        # Run
+        sequence, actual = latest_queue.queue.get_with_sequence(timeout=0.01)
+
+        # Test
+        assert sequence == 5
+        assert actual == 4
+        assert latest_queue.queue.empty()
+
+    def test_no_repeat(self, latest_queue: conflating_queue.ConflatingQueue) -> None:
+        """
+        An item is returned once per consumer, then the consumer waits for a new one.
+        """
+        # Setup
+        latest_queue.queue.put(1)
+        _ = latest_queue.queue.get()
+
+        # Run and test
+        with pytest.raises(queue.Empty):
+            latest_queue.queue.get(timeout=0.01)
+
+    def test_put_never_blocks(self, latest_queue: conflating_queue.ConflatingQueue) -> None:
+        """
+        Putting far more than one item does not raise.
+        """
+        # Run
+        for i in range(1000):
+            latest_queue.queue.put_nowait(i)
+
+        # Test
+        assert latest_queue.get_many() == [999]
+
+    def test_fill_and_drain(self, latest_queue: conflating_queue.ConflatingQueue) -> None:
+        """
+        Leaves nothing new for the consumer.
+        """
+        # Setup
+        latest_queue.queue.put(1)
+
+        # Run
+        latest_queue.fill_and_drain_queue()
+
+        # Test
+        assert latest_queue.queue.empty()
@@ -0,0 +1,137 @@
+"""
+Test the deadline scheduler and its jitter histogram.
+"""
+
+import pytest
+
+from utilities.timing import deadline_scheduler
+
+
+class FakeClock:
+    """
+    Time that only moves when told to.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDeadlineScheduler:
+    """
+    Deadlines on a fixed cadence.
+    """
+
+    def test_no_drift(self) -> None:
+        """
+        Deadlines advance by the period however late each run is.
+        """
+        # Setup
+        clock = FakeClock()
+        scheduler = deadline_scheduler.DeadlineScheduler(clock)
+        run_times = []
+        task = scheduler.add("heartbeat", 1.0, lambda: run_times.append(clock.now))
+
+        # Run
+        for _ in range(10):
+            clock.now += scheduler.time_until_next() + 0.25
+            scheduler.run_pending()
+
+        # Test
+        assert run_times == [period + 0.25 for period in range(10)]
+        assert task.deadline == 10.0
+        assert task.run_count == 10
+        assert task.missed_count == 0
+        assert task.histogram.counts[-1] == 10
+        assert task.histogram.max == 0.25
+
+    def test_deadline_order(self) -> None:
+        """
+        Tasks due together run earliest deadline first, then in the order added.
+        """
+        # Setup
+        clock = FakeClock()
+        scheduler = deadline_scheduler.DeadlineScheduler(clock)
+        runs = []
+        scheduler.add("slow", 1.0, lambda: runs.append("slow"))
+        scheduler.add("fast", 0.4, lambda: runs.append("fast"), phase=0.1)
+
+        # Run
+        clock.now = 1.0
+        first = scheduler.run_pending()
+        clock.now = 1.3
+        second = scheduler.run_pending()
+
+        # Test
+        assert first == 2
+        assert second == 1
+        assert runs == ["slow", "fast", "fast"]
+        assert scheduler.next_deadline() == pytest.approx(1.7)
+
+    def test_missed_periods(self) -> None:
+        """
+        A late task runs once and skips the deadlines it missed.
+        """
+        # Setup
+        clock = FakeClock()
+        scheduler = deadline_scheduler.DeadlineScheduler(clock)
+        runs = []
+        task = scheduler.add("heartbeat", 1.0, lambda: runs.append(clock.now))
+
+        # Run
+        clock.now = 3.5
+        scheduler.run_pending()
+
+        # Test
+        assert runs == [3.5]
+        assert task.missed_count == 3
+        assert task.deadline == 4.0
+        assert task.histogram.max == 0.5
+        assert scheduler.time_until_next() == 0.5
+
+    def test_no_tasks(self) -> None:
+        """
+        Nothing to wait for without tasks.
+        """
+        scheduler = deadline_scheduler.DeadlineScheduler()
+
+        assert scheduler.run_pending() == 0
+        assert scheduler.next_deadline() is None
+        assert scheduler.time_until_next() is None
+
+
+class TestJitterHistogram:
+    """
+    Lateness buckets and summaries.
+    """
+
+    def test_buckets(self) -> None:
+        """
+        Lateness falls in its bucket, and past the last bucket in the last one.
+        """
+        # Setup
+        histogram = deadline_scheduler.JitterHistogram(0.001, 4)
+
+        # Run
+        for lateness in [0.0, 0.0005, 0.0015, 0.0035, 0.5, -0.001]:
+            histogram.record(lateness)
+
+        # Test
+        assert histogram.counts == [3, 1, 0, 2]
+        assert histogram.count == 6
+        assert histogram.max == 0.5
+        assert histogram.percentile(50) == 0.001
+        assert histogram.percentile(100) == 0.5
+        assert "6 runs" in str(histogram)
+
+    def test_empty(self) -> None:
+        """
+        No runs summarizes to zeros.
+        """
+        histogram = deadline_scheduler.JitterHistogram()
+
+        assert histogram.mean() == 0.0
+        assert histogram.percentile(99) == 0.0
+        assert str(histogram) == "no runs"
@@ -0,0 +1,104 @@
+"""
+Test the MAVLink frame prefilter.
+"""
+
+import pytest
+from pymavlink.dialects.v20 import common as mavlink
+
+from modules.mavlink_demux import frame_filter
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def stream() -> bytes:  # type: ignore
+    """
+    Garbage that looks like the header of a MAVLink 1 heartbeat, then a heartbeat, an attitude
+    and a system time, in MAVLink 2.
+    """
+    encoder = mavlink.MAVLink(None, 1, 1)
+    frames = [
+        encoder.heartbeat_encode(mavlink.MAV_TYPE_QUADROTOR, 0, 0, 0, 0).pack(encoder),
+        encoder.attitude_encode(7, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0).pack(encoder),
+        encoder.system_time_encode(0, 0).pack(encoder),
+    ]
+    yield b"\x00\xfe\x01" + b"".join(frames)  # type: ignore
+
+
+class TestFrameFilter:
+    """
+    Header based skipping and stream reassembly.
+    """
+
+    def test_only_subscribed_decoded(self, stream: bytes) -> None:
+        """
+        Unsubscribed frames are skipped, subscribed ones are decoded.
+        """
+        # Setup
+        message_filter = frame_filter.FrameFilter(["ATTITUDE"])
+
+        # Run
+        messages = message_filter.parse(stream)
+
+        # Test
+        assert [msg.get_type() for msg in messages] == ["ATTITUDE"]
+        assert messages[0].time_boot_ms == 7
+        # The system time is kept until the next byte
+        assert message_filter.skipped_count == 1
+
+    def test_garbage_does_not_swallow_frames(self, stream: bytes) -> None:
+        """
+        A false header of an unsubscribed message is not skipped over real frames.
+        """
+        # Setup
+        message_filter = frame_filter.FrameFilter(["ATTITUDE"])
+
+        # Run
+        messages = message_filter.parse(stream + stream[3:])
+
+        # Test
+        assert [msg.get_type() for msg in messages] == ["ATTITUDE", "ATTITUDE"]
+        assert message_filter.skipped_count == 3
+        assert message_filter.bad_count == 1
+
+    def test_split_reads(self, stream: bytes) -> None:
+        """
+        Frames split across reads are completed by later reads.
+        """
+        # Setup
+        message_filter = frame_filter.FrameFilter(["HEARTBEAT", "ATTITUDE", "SYSTEM_TIME"])
+
+        # Run
+        messages = []
+        for i in range(len(stream)):
+            messages += message_filter.parse(stream[i : i + 1])
+
+        # Test
+        assert [msg.get_type() for msg in messages] == ["HEARTBEAT", "ATTITUDE", "SYSTEM_TIME"]
+
+    def test_corrupted_frame(self, stream: bytes) -> None:
+        """
+        A frame with a bad checksum is dropped and the next one is still found.
+        """
+        # Setup
+        message_filter = frame_filter.FrameFilter(["HEARTBEAT", "ATTITUDE"])
+        corrupted = bytearray(stream)
+        # First payload byte of the heartbeat
+        corrupted[3 + 10] ^= 0xFF
+
+        # Run
+        messages = message_filter.parse(bytes(corrupted))
+
+        # Test
+        assert [msg.get_type() for msg in messages] == ["ATTITUDE"]
+        assert message_filter.bad_count >= 1
+
+    def test_unknown_type(self) -> None:
+        """
+        Names not in the dialect are rejected.
+        """
+        with pytest.raises(ValueError):
+            frame_filter.FrameFilter(["NOT_A_MESSAGE"])
@@ -0,0 +1,193 @@
+"""
+Test fences against brute force, and breaches of fence sets.
+"""
+
+import pathlib
+
+import numpy as np
+import pytest
+
+from modules.common.modules.logger import logger
+from modules.geofence import geofence
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Test logger.
+    """
+    result, test_logger = logger.Logger.create("test_geofence", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def jagged_vertices() -> np.ndarray:  # type: ignore
+    """
+    Star shaped polygon with radii from 50 m to 100 m, so edges span many slabs.
+    """
+    generator = np.random.default_rng(0)
+    angles = np.linspace(0, 2 * np.pi, 2000, endpoint=False)
+    radii = generator.uniform(50, 100, len(angles))
+    yield np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])  # type: ignore
+
+
+@pytest.fixture()
+def positions() -> np.ndarray:  # type: ignore
+    """
+    Random positions around the fences, some above and below them.
+    """
+    generator = np.random.default_rng(1)
+    yield np.column_stack(  # type: ignore
+        [
+            generator.uniform(-120, 120, 5000),
+            generator.uniform(-120, 120, 5000),
+            generator.uniform(-5, 35, 5000),
+        ]
+    )
+
+
+def brute_force_contains(vertices: np.ndarray, x: float, y: float) -> bool:
+    """
+    Ray cast against every edge.
+    """
+    x0, y0 = vertices[:, 0], vertices[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossings = ((y0 > y) != (y1 > y)) & (x < x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+
+    return bool(crossings.sum() % 2 == 1)
+
+
+class TestPolygonFence:
+    """
+    Slab indexed ray casting gives the same answers as testing every edge.
+    """
+
+    def test_contains(self, jagged_vertices: np.ndarray, positions: np.ndarray) -> None:
+        """
+        Single positions.
+        """
+        # Setup
+        fence = geofence.PolygonFence("star", True, jagged_vertices.tolist(), 0.0, 30.0)
+
+        for x, y, z in positions.tolist():
+            # Run
+            inside = fence.contains(x, y, z)
+
+            # Test
+            assert inside == (0.0 <= z <= 30.0 and brute_force_contains(jagged_vertices, x, y))
+
+    def test_contains_batch(self, jagged_vertices: np.ndarray, positions: np.ndarray) -> None:
+        """
+        Batches match single positions.
+        """
+        # Setup
+        fence = geofence.PolygonFence("star", True, jagged_vertices.tolist(), 0.0, 30.0)
+
+        # Run
+        inside = fence.contains_batch(positions)
+
+        # Test
+        assert inside.tolist() == [fence.contains(x, y, z) for x, y, z in positions.tolist()]
+
+    def test_invalid(self) -> None:
+        """
+        Polygons without area are rejected.
+        """
+        with pytest.raises(ValueError):
+            geofence.PolygonFence("line", True, [(0, 0), (1, 1), (2, 2)], 0.0, 1.0)
+
+        with pytest.raises(ValueError):
+            geofence.PolygonFence("closed", True, [(0, 0), (1, 0), (0, 0)], 0.0, 1.0)
+
+
+class TestGeofence:
+    """
+    Breaches of keep-in and keep-out zones.
+    """
+
+    @pytest.fixture()
+    def fences(self, local_logger: logger.Logger) -> geofence.Geofence:  # type: ignore
+        """
+        Keep-in cylinder with 5 keep-out squares inside.
+        """
+        keep_out = [
+            geofence.PolygonFence(
+                f"square_{i}",
+                True,
+                [(i * 20, 0), (i * 20 + 10, 0), (i * 20 + 10, 10), (i * 20, 10)],
+                0.0,
+                20.0,
+            )
+            for i in range(5)
+        ]
+        result, fence_set = geofence.Geofence.create(
+            [geofence.CylinderFence("field", False, 50.0, 0.0, 100.0, -1.0, 30.0)] + keep_out,
+            local_logger,
+        )
+        assert result
+        assert fence_set is not None
+        yield fence_set  # type: ignore
+
+    def test_check(self, fences: geofence.Geofence) -> None:
+        """
+        Breached fences by position.
+        """
+        assert not fences.check(15.0, -5.0, 10.0)
+        assert [fence.name for fence in fences.check(45.0, 5.0, 10.0)] == ["square_2"]
+        # Above the square
+        assert not fences.check(45.0, 5.0, 25.0)
+        assert [fence.name for fence in fences.check(200.0, 0.0, 10.0)] == ["field"]
+
+    def test_check_batch(self, fences: geofence.Geofence, positions: np.ndarray) -> None:
+        """
+        Batches match single positions.
+        """
+        # Run
+        breaches = fences.check_batch(positions)
+
+        # Test
+        assert breaches.tolist() == [len(fences.check(*position)) > 0 for position in positions]
+
+    def test_invalid(self, local_logger: logger.Logger) -> None:
+        """
+        Empty sets and duplicate names are rejected.
+        """
+        fence = geofence.CylinderFence("a", True, 0.0, 0.0, 1.0, 0.0, 1.0)
+        assert not geofence.Geofence.create([], local_logger)[0]
+        assert not geofence.Geofence.create([fence, fence], local_logger)[0]
+
+    def test_load(self, local_logger: logger.Logger, tmp_path: pathlib.Path) -> None:
+        """
+        Cylinders and polygons are read from YAML.
+        """
+        # Setup
+        file_path = tmp_path / "geofence.yaml"
+        file_path.write_text(
+            "fences:\n"
+            "  - {name: a, keep_out: true, x: 0, y: 0, radius: 5, z_min: 0, z_max: 10}\n"
+            "  - name: b\n"
+            "    keep_out: false\n"
+            "    vertices: [[0, 0], [10, 0], [10, 10]]\n"
+            "    z_min: 0\n"
+            "    z_max: 10\n",
+            encoding="utf-8",
+        )
+
+        # Run
+        result, fence_set = geofence.Geofence.load(file_path, local_logger)
+
+        # Test
+        assert result
+        assert fence_set is not None
+        assert isinstance(fence_set.fences[0], geofence.CylinderFence)
+        assert isinstance(fence_set.fences[1], geofence.PolygonFence)
+        assert [fence.name for fence in fence_set.check(8.0, 1.0, 5.0)] == []
+        assert [fence.name for fence in fence_set.check(1.0, 0.5, 5.0)] == ["a"]
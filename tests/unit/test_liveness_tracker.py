@@ -0,0 +1,112 @@
+"""
+Test the heartbeat liveness state machine.
+"""
+
+import random
+
+import pytest
+
+from modules.heartbeat import liveness_tracker
+
+
+CONNECTED = liveness_tracker.LivenessTracker.CONNECTED
+DISCONNECTED = liveness_tracker.LivenessTracker.DISCONNECTED
+
+
+def run(tracker: liveness_tracker.LivenessTracker, periods: str) -> "list[str | None]":
+    """
+    Updates with a period per character, 1 for a heartbeat and 0 for none.
+    """
+    return [tracker.update(period == "1") for period in periods]
+
+
+class TestLivenessTracker:
+    """
+    Transitions with hysteresis.
+    """
+
+    def test_same_as_last_5(self) -> None:
+        """
+        The original behaviour: lost after 5 missed periods, regained on the first heartbeat.
+        """
+        # Setup
+        tracker = liveness_tracker.LivenessTracker(5, 5, 1)
+
+        # Run
+        transitions = run(tracker, "0011000011000001")
+
+        # Test
+        assert transitions == [None, None, CONNECTED] + [None] * 11 + [DISCONNECTED, CONNECTED]
+        assert tracker.transition_count == 3
+        assert tracker.period_count == 16
+
+    def test_hysteresis(self) -> None:
+        """
+        Intermittent heartbeats neither lose nor regain the connection.
+        """
+        # Setup
+        tracker = liveness_tracker.LivenessTracker(6, 4, 3)
+
+        # Run
+        connected = run(tracker, "111" + "110" * 4)
+        lost = run(tracker, "0000")
+        intermittent = run(tracker, "100" * 4)
+        regained = run(tracker, "11")
+
+        # Test
+        assert connected == [None, None, CONNECTED] + [None] * 12
+        assert lost == [None, DISCONNECTED, None, None]
+        assert intermittent == [None] * 12
+        assert regained == [None, CONNECTED]
+
+    def test_matches_list(self) -> None:
+        """
+        Same transitions as keeping the periods of the window in a list.
+        """
+        # Setup
+        generator = random.Random(0)
+        for window, lost_threshold, regained_threshold in [(5, 5, 1), (8, 4, 5), (10, 7, 4)]:
+            tracker = liveness_tracker.LivenessTracker(window, lost_threshold, regained_threshold)
+            periods = [False] * window
+            connected = False
+
+            for _ in range(2000):
+                received = generator.random() < 0.5
+
+                # Run
+                transition = tracker.update(received)
+
+                # Test
+                periods = periods[1:] + [received]
+                expected = None
+                if connected and periods.count(False) >= lost_threshold:
+                    connected = False
+                    expected = DISCONNECTED
+                elif not connected and periods.count(True) >= regained_threshold:
+                    connected = True
+                    expected = CONNECTED
+                assert transition == expected
+
+    def test_window_forgets(self) -> None:
+        """
+        Periods older than the window do not count.
+        """
+        # Setup
+        tracker = liveness_tracker.LivenessTracker(3, 2, 2)
+
+        # Run
+        transitions = run(tracker, "1001")
+
+        # Test
+        assert transitions == [None, None, None, None]
+        assert tracker.history == 0b001
+
+    @pytest.mark.parametrize(
+        "window, lost, regained", [(0, 1, 1), (5, 0, 5), (5, 6, 1), (5, 3, 2), (5, 2, 2)]
+    )
+    def test_invalid(self, window: int, lost: int, regained: int) -> None:
+        """
+        Thresholds outside the window, or that could both be met, are rejected.
+        """
+        with pytest.raises(ValueError):
+            liveness_tracker.LivenessTracker(window, lost, regained)
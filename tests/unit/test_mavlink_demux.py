@@ -0,0 +1,229 @@
+"""
+Test the MAVLink demultiplexer and its subscriber connections.
+"""
+
+import time
+
+import pytest
+from pymavlink.dialects.v20 import common as mavlink
+
+from modules.common.modules.logger import logger
+from modules.mavlink_demux import mavlink_demux
+from utilities.workers import shared_ring_queue
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Receive side of a connection that replays messages, one frame per read.
+    """
+
+    def __init__(self, messages: "list[mavlink.MAVLink_message]") -> None:
+        encoder = mavlink.MAVLink(None, 1, 1)
+        self.frames = [bytes(msg.pack(encoder)) for msg in messages]
+
+    def select(self, timeout: float) -> bool:
+        """
+        Whether there is a frame left.
+        """
+        _ = timeout
+        return len(self.frames) > 0
+
+    def recv(self, size: int) -> bytes:
+        """
+        Next frame.
+        """
+        _ = size
+        return self.frames.pop(0)
+
+
+def heartbeat() -> mavlink.MAVLink_heartbeat_message:
+    """
+    Heartbeat from a quadrotor.
+    """
+    return mavlink.MAVLink_heartbeat_message(
+        mavlink.MAV_TYPE_QUADROTOR, mavlink.MAV_AUTOPILOT_GENERIC, 0, 0, 0, 3
+    )
+
+
+def attitude(time_boot_ms: int) -> mavlink.MAVLink_attitude_message:
+    """
+    Level attitude.
+    """
+    return mavlink.MAVLink_attitude_message(time_boot_ms, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+@pytest.fixture()
+def channels() -> "list[shared_ring_queue.SharedRingQueue]":  # type: ignore
+    """
+    Heartbeat and telemetry channels, freed after the test.
+    """
+    new_channels = [shared_ring_queue.SharedRingQueue(2), shared_ring_queue.SharedRingQueue(2)]
+    yield new_channels  # type: ignore
+    for channel in new_channels:
+        channel.close()
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Test logger.
+    """
+    result, test_logger = logger.Logger.create("test_mavlink_demux", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+class TestMavlinkDemux:
+    """
+    Routing by message type.
+    """
+
+    def test_routes_by_type(
+        self,
+        channels: "list[shared_ring_queue.SharedRingQueue]",
+        local_logger: logger.Logger,
+    ) -> None:
+        """
+        Each subscriber gets only its types, unsubscribed types are discarded.
+        """
+        # Setup
+        heartbeat_channel, telemetry_channel = channels
+        connection = FakeConnection(
+            [heartbeat(), mavlink.MAVLink_system_time_message(0, 0), attitude(1)]
+        )
+        result, demux = mavlink_demux.MavlinkDemux.create(
+            connection,
+            [(["HEARTBEAT"], heartbeat_channel), (["ATTITUDE"], telemetry_channel)],
+            local_logger,
+        )
+        assert result
+        assert demux is not None
+
+        # Run
+        for _ in range(3):
+            assert demux.run()
+
+        # Test
+        assert heartbeat_channel.queue.get_nowait().get_type() == "HEARTBEAT"
+        assert telemetry_channel.queue.get_nowait().get_type() == "ATTITUDE"
+        assert heartbeat_channel.queue.empty()
+        assert telemetry_channel.queue.empty()
+        assert demux.message_filter.decoded_count == 2
+        assert demux.message_filter.skipped_count == 1
+
+    def test_unknown_type(
+        self,
+        channels: "list[shared_ring_queue.SharedRingQueue]",
+        local_logger: logger.Logger,
+    ) -> None:
+        """
+        Subscribing to a message not in the dialect fails.
+        """
+        # Run
+        result, demux = mavlink_demux.MavlinkDemux.create(
+            FakeConnection([]), [(["NOT_A_MESSAGE"], channels[0])], local_logger
+        )
+
+        # Test
+        assert not result
+        assert demux is None
+
+    def test_full_channel_drops(
+        self,
+        channels: "list[shared_ring_queue.SharedRingQueue]",
+        local_logger: logger.Logger,
+    ) -> None:
+        """
+        A full channel loses new messages without blocking the reader.
+        """
+        # Setup
+        _, telemetry_channel = channels
+        connection = FakeConnection([attitude(i) for i in range(3)])
+        result, demux = mavlink_demux.MavlinkDemux.create(
+            connection, [(["ATTITUDE"], telemetry_channel)], local_logger
+        )
+        assert result
+        assert demux is not None
+
+        # Run
+        for _ in range(3):
+            assert demux.run()
+
+        # Test
+        assert demux.forwarded_counts == {"ATTITUDE": 2}
+        assert demux.dropped_counts == {"ATTITUDE": 1}
+
+
+class TestSubscribedConnection:
+    """
+    Receive surface used by the subscribers.
+    """
+
+    def test_recv_match_filters_type(
+        self, channels: "list[shared_ring_queue.SharedRingQueue]"
+    ) -> None:
+        """
+        Messages of other types are skipped.
+        """
+        # Setup
+        channel, _ = channels
+        channel.queue.put(heartbeat())
+        channel.queue.put(attitude(5))
+        connection = mavlink_demux.SubscribedConnection(channel)
+
+        # Run
+        msg = connection.recv_match(type="ATTITUDE", blocking=True, timeout=0.1)
+
+        # Test
+        assert msg is not None
+        assert msg.time_boot_ms == 5
+        assert connection.recv_match(blocking=False) is None
+
+    def test_select_keeps_message(
+        self, channels: "list[shared_ring_queue.SharedRingQueue]"
+    ) -> None:
+        """
+        select() waits for a message without consuming it.
+        """
+        # Setup
+        channel, _ = channels
+        connection = mavlink_demux.SubscribedConnection(channel)
+
+        # Run
+        empty_result = connection.select(0.01)
+        channel.queue.put(heartbeat())
+        ready_result = connection.select(0.01)
+
+        # Test
+        assert not empty_result
+        assert ready_result
+        msg = connection.recv_match(type="HEARTBEAT", blocking=False)
+        assert msg is not None
+
+    def test_sentinel_closes(self, channels: "list[shared_ring_queue.SharedRingQueue]") -> None:
+        """
+        After the shutdown sentinel, receives return at once.
+        """
+        # Setup
+        channel, _ = channels
+        channel.queue.put(None)
+        connection = mavlink_demux.SubscribedConnection(channel)
+
+        # Run
+        sentinel_msg = connection.recv_match(blocking=True)
+        start = time.monotonic()
+        closed_msg = connection.recv_match(blocking=True, timeout=1.0)
+        closed_select = connection.select(1.0)
+
+        # Test
+        assert sentinel_msg is None
+        assert closed_msg is None
+        assert not closed_select
+        assert connection.closed
+        assert time.monotonic() - start < 0.5
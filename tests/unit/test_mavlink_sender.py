@@ -0,0 +1,115 @@
+"""
+Test the MAVLink sender and its queued connections.
+"""
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.mavlink_sender import mavlink_sender
+from utilities.workers import shared_ring_queue
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Send side of a connection that records writes.
+    """
+
+    def __init__(self) -> None:
+        self.mav = mavutil.mavlink.MAVLink(None, 255, 0)
+        self.writes = []
+
+    def write(self, buffer: bytes) -> None:
+        """
+        Records the buffer.
+        """
+        self.writes.append(buffer)
+
+
+@pytest.fixture()
+def outbound_queue() -> shared_ring_queue.SharedRingQueue:  # type: ignore
+    """
+    Sender input queue, freed after the test.
+    """
+    new_queue = shared_ring_queue.SharedRingQueue(8)
+    yield new_queue  # type: ignore
+    new_queue.close()
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Test logger.
+    """
+    result, test_logger = logger.Logger.create("test_mavlink_sender", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+class TestMavlinkSender:
+    """
+    Coalescing and encoding.
+    """
+
+    def test_pending_messages_in_one_write(
+        self, outbound_queue: shared_ring_queue.SharedRingQueue, local_logger: logger.Logger
+    ) -> None:
+        """
+        Messages from several connections are written at once, in order, with consecutive
+        sequence numbers.
+        """
+        # Setup
+        connection = FakeConnection()
+        first = mavlink_sender.QueuedConnection(outbound_queue, 255, 0)
+        second = mavlink_sender.QueuedConnection(outbound_queue, 255, 0)
+        result, sender = mavlink_sender.MavlinkSender.create(
+            connection, outbound_queue, local_logger
+        )
+        assert result
+        assert sender is not None
+
+        first.mav.heartbeat_send(mavutil.mavlink.MAV_TYPE_GCS, 0, 0, 0, 0)
+        second.mav.command_long_send(
+            1, 0, mavutil.mavlink.MAV_CMD_CONDITION_YAW, 0, 0, 0, 0, 0, 0, 0, 0
+        )
+        first.mav.heartbeat_send(mavutil.mavlink.MAV_TYPE_GCS, 0, 0, 0, 0)
+
+        # Run
+        assert sender.run()
+
+        # Test
+        assert len(connection.writes) == 1
+        parser = mavutil.mavlink.MAVLink(None)
+        messages = parser.parse_buffer(connection.writes[0])
+        assert [msg.get_type() for msg in messages] == ["HEARTBEAT", "COMMAND_LONG", "HEARTBEAT"]
+        assert [msg.get_seq() for msg in messages] == [0, 1, 2]
+        assert sender.statistics.frame_count == 3
+        assert sender.statistics.write_count == 1
+        assert sender.statistics.byte_count == len(connection.writes[0])
+
+    def test_nothing_queued(
+        self, outbound_queue: shared_ring_queue.SharedRingQueue, local_logger: logger.Logger
+    ) -> None:
+        """
+        Sentinels and timeouts do not write.
+        """
+        # Setup
+        connection = FakeConnection()
+        result, sender = mavlink_sender.MavlinkSender.create(
+            connection, outbound_queue, local_logger
+        )
+        assert result
+        assert sender is not None
+        outbound_queue.queue.put(None)
+
+        # Run
+        assert sender.run()
+
+        # Test
+        assert len(connection.writes) == 0
@@ -0,0 +1,184 @@
+"""
+Test mission progress.
+"""
+
+import pathlib
+
+import pytest
+
+from modules.command import mission
+from modules.common.modules.logger import logger
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Test logger.
+    """
+    result, test_logger = logger.Logger.create("test_mission", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def square(local_logger: logger.Logger) -> mission.Mission:  # type: ignore
+    """
+    4 waypoints on a 10 m square.
+    """
+    result, square_mission = mission.Mission.create(
+        [
+            mission.Waypoint(10, 10, 10, 1),
+            mission.Waypoint(20, 10, 10, 1),
+            mission.Waypoint(20, 20, 10, 1),
+            mission.Waypoint(10, 20, 10, 1),
+        ],
+        local_logger,
+    )
+    assert result
+    assert square_mission is not None
+    yield square_mission  # type: ignore
+
+
+class TestMission:
+    """
+    Waypoints are flown in order.
+    """
+
+    def test_advance(self, square: mission.Mission) -> None:
+        """
+        Reaching the current waypoint moves on to the next one.
+        """
+        # Run
+        assert not square.update(0, 0, 10)
+        assert square.update(10.5, 10, 10)
+
+        # Test
+        assert square.current == 1
+        assert square.target() is square.waypoints[1]
+
+    def test_no_going_back(self, square: mission.Mission) -> None:
+        """
+        Waypoints before the current one are ignored.
+        """
+        # Setup
+        square.update(10, 10, 10)
+        square.update(20, 10, 10)
+
+        # Run
+        changed = square.update(10, 10, 10)
+
+        # Test
+        assert not changed
+        assert square.current == 2
+
+    def test_no_skipping(self, square: mission.Mission) -> None:
+        """
+        Reaching a later waypoint before the current one does not skip ahead.
+        """
+        # Run
+        changed = square.update(20, 20, 10)
+
+        # Test
+        assert not changed
+        assert square.current == 0
+
+    def test_return_to_start(self, local_logger: logger.Logger) -> None:
+        """
+        A mission that ends where it starts is not complete at the start.
+        """
+        # Setup
+        result, loop = mission.Mission.create(
+            [
+                mission.Waypoint(0, 0, 10, 1),
+                mission.Waypoint(10, 0, 10, 1),
+                mission.Waypoint(10, 10, 10, 1),
+                mission.Waypoint(0, 0, 10, 1),
+            ],
+            local_logger,
+        )
+        assert result
+        assert loop is not None
+
+        # Run
+        loop.update(0, 0, 10)
+
+        # Test
+        assert loop.current == 1
+        assert not loop.is_complete()
+
+    def test_overlapping(self, local_logger: logger.Logger) -> None:
+        """
+        Following waypoints that also contain the position are reached in the same update.
+        """
+        # Setup
+        result, overlapping = mission.Mission.create(
+            [
+                mission.Waypoint(0, 0, 10, 2),
+                mission.Waypoint(1, 0, 10, 2),
+                mission.Waypoint(10, 0, 10, 2),
+            ],
+            local_logger,
+        )
+        assert result
+        assert overlapping is not None
+
+        # Run
+        overlapping.update(0.5, 0, 10)
+
+        # Test
+        assert overlapping.current == 2
+
+    def test_complete(self, square: mission.Mission) -> None:
+        """
+        Once the last waypoint is reached, it stays the target.
+        """
+        # Run
+        for waypoint in square.waypoints:
+            square.update(waypoint.x, waypoint.y, waypoint.z)
+
+        # Test
+        assert square.is_complete()
+        assert square.target() is square.waypoints[-1]
+
+    def test_invalid(self, local_logger: logger.Logger) -> None:
+        """
+        Empty missions and non positive radii are rejected.
+        """
+        # Run
+        empty_result, _ = mission.Mission.create([], local_logger)
+        radius_result, _ = mission.Mission.create([mission.Waypoint(0, 0, 0, 0)], local_logger)
+
+        # Test
+        assert not empty_result
+        assert not radius_result
+
+    def test_load(self, local_logger: logger.Logger, tmp_path: pathlib.Path) -> None:
+        """
+        Waypoints are read from YAML in order.
+        """
+        # Setup
+        file_path = tmp_path / "mission.yaml"
+        file_path.write_text(
+            "waypoints:\n"
+            "  - {x: 1, y: 2, z: 3, acceptance_radius: 0.5}\n"
+            "  - {x: 4, y: 5, z: 6, acceptance_radius: 1}\n",
+            encoding="utf-8",
+        )
+
+        # Run
+        result, loaded = mission.Mission.load(file_path, local_logger)
+
+        # Test
+        assert result
+        assert loaded is not None
+        assert [(waypoint.x, waypoint.y, waypoint.z) for waypoint in loaded.waypoints] == [
+            (1, 2, 3),
+            (4, 5, 6),
+        ]
+        assert loaded.waypoints[0].acceptance_radius == 0.5
@@ -0,0 +1,129 @@
+"""
+Test the multi-vehicle heartbeat table.
+"""
+
+import random
+
+from modules.heartbeat import peer_table
+
+
+class FakeHeartbeat:
+    """
+    The parts of a HEARTBEAT message the table reads.
+    """
+
+    def __init__(self, system: int, component: int, mav_type: int = 2) -> None:
+        self.__system = system
+        self.__component = component
+        self.type = mav_type
+        self.autopilot = 3
+        self.system_status = 4
+
+    def get_srcSystem(self) -> int:  # pylint: disable=invalid-name
+        """
+        Sender system ID.
+        """
+        return self.__system
+
+    def get_srcComponent(self) -> int:  # pylint: disable=invalid-name
+        """
+        Sender component ID.
+        """
+        return self.__component
+
+
+class TestPeerTable:
+    """
+    Connection and expiry of every peer.
+    """
+
+    def test_connect_and_expire(self) -> None:
+        """
+        A peer is connected by its first heartbeat and disconnected a timeout after its last.
+        """
+        # Setup
+        table = peer_table.PeerTable(2.0)
+
+        # Run
+        first = table.update(FakeHeartbeat(1, 1), 0.0)
+        other = table.update(FakeHeartbeat(2, 1), 0.5)
+        again = table.update(FakeHeartbeat(1, 1), 1.0)
+        early = table.expire(2.4)
+        expired = table.expire(2.5)
+        late = table.expire(3.0)
+
+        # Test
+        assert first and other
+        assert not again
+        assert not early
+        assert expired == [(2, 1)]
+        assert late == [(1, 1)]
+        assert table.connected_count() == 0
+        assert table.next_deadline() is None
+
+    def test_reconnect(self) -> None:
+        """
+        A disconnected peer connects again on its next heartbeat and keeps its history.
+        """
+        # Setup
+        table = peer_table.PeerTable(1.0)
+        table.update(FakeHeartbeat(1, 0), 0.0)
+        table.expire(1.0)
+
+        # Run
+        reconnected = table.update(FakeHeartbeat(1, 0, mav_type=1), 5.0)
+
+        # Test
+        peer = table.get(1, 0)
+        assert reconnected
+        assert peer.connected
+        assert peer.heartbeat_count == 2
+        assert peer.first_seen == 0.0
+        assert peer.last_seen == 5.0
+        assert peer.mav_type == 1
+        assert table.next_deadline() == 6.0
+
+    def test_snapshot_is_copy(self) -> None:
+        """
+        Snapshots do not change with the table.
+        """
+        # Setup
+        table = peer_table.PeerTable(1.0)
+        table.update(FakeHeartbeat(1, 0), 0.0)
+
+        # Run
+        snapshot = table.snapshot()
+        table.update(FakeHeartbeat(1, 0), 0.5)
+        table.expire(2.0)
+
+        # Test
+        assert list(snapshot) == [(1, 0)]
+        assert snapshot[(1, 0)].connected
+        assert snapshot[(1, 0)].heartbeat_count == 1
+        assert table.get(9, 9) is None
+
+    def test_matches_scan(self) -> None:
+        """
+        Same disconnections as checking every peer.
+        """
+        # Setup
+        generator = random.Random(0)
+        table = peer_table.PeerTable(1.5)
+        last_seen = {}
+        now = 0.0
+
+        for _ in range(2000):
+            now += generator.random() * 0.1
+            key = (generator.randrange(1, 20), generator.randrange(0, 3))
+
+            # Run
+            table.update(FakeHeartbeat(*key), now)
+            expired = table.expire(now)
+
+            # Test
+            last_seen[key] = now
+            expected = [key for key, seen in last_seen.items() if now - seen >= 1.5]
+            for key in expected:
+                del last_seen[key]
+            assert sorted(expired) == sorted(expected)
+            assert table.connected_count() == len(last_seen)
@@ -0,0 +1,220 @@
+"""
+Test the Kalman filter against the matrix form, and pose prediction.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from modules.common.modules.logger import logger
+from modules.estimator import kalman_filter
+from modules.estimator import pose_estimator
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def estimator() -> pose_estimator.PoseEstimator:  # type: ignore
+    """
+    Estimator with the default noises.
+    """
+    result, test_logger = logger.Logger.create("test_pose_estimator", False)
+    assert result
+    assert test_logger is not None
+    result, new_estimator = pose_estimator.PoseEstimator.create(test_logger)
+    assert result
+    assert new_estimator is not None
+    yield new_estimator  # type: ignore
+
+
+def sample(
+    time_ms: int, x: float, x_velocity: float, yaw: float, yaw_speed: float
+) -> telemetry.TelemetryData:
+    """
+    Level flight along x.
+    """
+    return telemetry.TelemetryData(
+        time_since_boot=time_ms,
+        x=x,
+        y=0.0,
+        z=-10.0,
+        x_velocity=x_velocity,
+        y_velocity=0.0,
+        z_velocity=0.0,
+        roll=0.0,
+        pitch=0.0,
+        yaw=yaw,
+        roll_speed=0.0,
+        pitch_speed=0.0,
+        yaw_speed=yaw_speed,
+        position_age=0,
+        attitude_age=0,
+    )
+
+
+class TestConstantRateFilter:
+    """
+    Per axis closed form against the textbook matrix form.
+    """
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_matches_matrix_form(self, wrap: bool) -> None:
+        """
+        Same state and covariance after a sequence of predictions and updates.
+        """
+        # Setup
+        generator = np.random.default_rng(0)
+        kalman = kalman_filter.ConstantRateFilter(3, 0.5, 0.2, 1.0, wrap)
+        variances = np.diag([0.25, 0.04])
+        states = []
+        covariances = []
+
+        for step in range(50):
+            dt = 0.02 + 0.1 * (step % 3)
+            values = generator.uniform(-3, 3, 3)
+            rates = generator.normal(size=3)
+
+            # Run
+            kalman.predict(dt)
+            kalman.measured_value[:] = values
+            kalman.measured_rate[:] = rates
+            kalman.update()
+
+            # Reference
+            transition = np.array([[1.0, dt], [0.0, 1.0]])
+            noise = np.array([[dt**3 / 3, dt**2 / 2], [dt**2 / 2, dt]])
+            for axis in range(3):
+                measured = np.array([values[axis], rates[axis]])
+                if step == 0:
+                    states.append(measured)
+                    covariances.append(variances.copy())
+                    continue
+
+                state = transition @ states[axis]
+                covariance = transition @ covariances[axis] @ transition.T + noise
+                innovation = measured - state
+                if wrap:
+                    state[0] = (state[0] + math.pi) % (2 * math.pi) - math.pi
+                    innovation[0] = (values[axis] - state[0] + math.pi) % (2 * math.pi) - math.pi
+                gain = covariance @ np.linalg.inv(covariance + variances)
+                states[axis] = state + gain @ innovation
+                if wrap:
+                    states[axis][0] = (states[axis][0] + math.pi) % (2 * math.pi) - math.pi
+                covariances[axis] = (np.eye(2) - gain) @ covariance
+
+            # Test
+            np.testing.assert_allclose(kalman.value, [state[0] for state in states])
+            np.testing.assert_allclose(kalman.rate, [state[1] for state in states])
+            np.testing.assert_allclose(kalman.p00, [covariance[0, 0] for covariance in covariances])
+            np.testing.assert_allclose(kalman.p01, [covariance[0, 1] for covariance in covariances])
+            np.testing.assert_allclose(kalman.p11, [covariance[1, 1] for covariance in covariances])
+
+
+class TestPoseEstimator:
+    """
+    Fusion of the telemetry parts, and prediction.
+    """
+
+    def test_predicts_ahead(self) -> None:
+        """
+        With samples arriving 100 ms late, the prediction for now is ahead of the latest sample.
+        """
+        # Setup
+        result, test_logger = logger.Logger.create("test_pose_estimator", False)
+        assert result
+        assert test_logger is not None
+        result, estimator = pose_estimator.PoseEstimator.create(test_logger, latency=0.1)
+        assert result
+        assert estimator is not None
+        for step in range(50):
+            time_ms = step * 50
+            estimator.update(
+                sample(time_ms, 5.0 * time_ms / 1000, 5.0, 0.5 * time_ms / 1000, 0.5),
+                now=100.0 + time_ms / 1000 + 0.1,
+            )
+
+        # Run
+        # Decided 20 ms after the latest sample is received, 120 ms after it was measured
+        predicted = estimator.predict(now=100.0 + 2.45 + 0.1 + 0.02)
+
+        # Test
+        assert predicted is not None
+        assert predicted.x == pytest.approx(5.0 * 2.57, abs=0.01)
+        assert predicted.yaw == pytest.approx(0.5 * 2.57, abs=0.01)
+        assert predicted.x_velocity == pytest.approx(5.0, abs=0.01)
+
+    def test_horizon_limited(self, estimator: pose_estimator.PoseEstimator) -> None:
+        """
+        Predictions stop at the maximum horizon past the latest measurement.
+        """
+        # Setup
+        estimator.update(sample(0, 0.0, 5.0, 0.0, 0.0), now=10.0)
+        estimator.update(sample(100, 0.5, 5.0, 0.0, 0.0), now=10.1)
+
+        # Run
+        predicted = estimator.predict(now=20.0)
+
+        # Test
+        assert predicted is not None
+        assert predicted.x == pytest.approx(0.5 + 5.0 * estimator.max_horizon, abs=0.01)
+
+    def test_repeated_part_ignored(self, estimator: pose_estimator.PoseEstimator) -> None:
+        """
+        A streamed sample repeating the earlier position only updates the attitude.
+        """
+        # Setup
+        estimator.update(sample(0, 0.0, 1.0, 0.0, 0.0), now=1.0)
+        estimator.update(sample(100, 0.1, 1.0, 0.1, 0.0), now=1.1)
+        position = estimator.position_filter.value.copy()
+        repeated = sample(150, 0.1, 1.0, 0.2, 0.0)
+        repeated.position_age = 50
+
+        # Run
+        estimator.update(repeated, now=1.15)
+
+        # Test
+        np.testing.assert_array_equal(estimator.position_filter.value, position)
+        assert estimator.attitude_time == pytest.approx(0.15)
+
+    def test_clock_reset(self, estimator: pose_estimator.PoseEstimator) -> None:
+        """
+        After the drone clock restarts, new samples replace the state instead of being ignored.
+        """
+        # Setup
+        estimator.update(sample(60000, 100.0, 5.0, 0.0, 0.0), now=70.0)
+        estimator.update(sample(60100, 100.5, 5.0, 0.0, 0.0), now=70.1)
+
+        # Run
+        estimator.update(sample(200, 0.0, 0.0, 1.0, 0.0), now=80.0)
+        estimator.update(sample(300, 0.0, 0.0, 1.0, 0.0), now=80.1)
+        predicted = estimator.predict(now=80.1)
+
+        # Test
+        assert estimator.reset_count == 1
+        assert estimator.position_time == pytest.approx(0.3)
+        assert predicted is not None
+        assert predicted.x == pytest.approx(0.0, abs=0.01)
+        assert predicted.yaw == pytest.approx(1.0, abs=0.01)
+        assert predicted.position_age == 0
+
+    def test_not_ready(self, estimator: pose_estimator.PoseEstimator) -> None:
+        """
+        No prediction without attitude.
+        """
+        # Setup
+        estimator.update(
+            telemetry.TelemetryData(
+                x=0.0, y=0.0, z=0.0, x_velocity=0.0, y_velocity=0.0, z_velocity=0.0
+            )
+        )
+
+        # Run
+        predicted = estimator.predict()
+
+        # Test
+        assert predicted is None
@@ -0,0 +1,102 @@
+"""
+Test batched put and get on the queue proxy wrapper.
+"""
+
+import multiprocessing as mp
+import multiprocessing.managers
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture(scope="module")
+def manager() -> multiprocessing.managers.SyncManager:  # type: ignore
+    """
+    Manager shared by the tests in this module.
+    """
+    new_manager = mp.Manager()
+    yield new_manager  # type: ignore
+    new_manager.shutdown()
+
+
+@pytest.fixture()
+def proxy_queue(
+    manager: multiprocessing.managers.SyncManager,
+) -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Empty queue.
+    """
+    new_queue = queue_proxy_wrapper.QueueProxyWrapper(manager, 10)
+    yield new_queue  # type: ignore
+
+
+class TestBatches:
+    """
+    put_many() and get_many().
+    """
+
+    def test_batch_is_one_entry(self, proxy_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        A batch uses a single queue entry and comes back flattened.
+        """
+        # Setup
+        expected = [1, 2, 3]
+
+        # Run
+        proxy_queue.put_many(expected)
+        size = proxy_queue.queue.qsize()
+        actual = proxy_queue.get_many()
+
+        # Test
+        assert size == 1
+        assert actual == expected
+
+    def test_mixed_entries(self, proxy_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Single items and batches come back in order.
+        """
+        # Setup
+        proxy_queue.queue.put(0)
+        proxy_queue.put_many([1, 2])
+        proxy_queue.queue.put(3)
+
+        # Run
+        actual = proxy_queue.get_many()
+
+        # Test
+        assert actual == [0, 1, 2, 3]
+
+    def test_max_items(self, proxy_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Items beyond max_items are kept for the next call.
+        """
+        # Setup
+        proxy_queue.put_many([1, 2, 3, 4, 5])
+
+        # Run
+        first = proxy_queue.get_many(max_items=2)
+        second = proxy_queue.get_many(max_items=2)
+        third = proxy_queue.get_many(max_items=2, timeout=0.01)
+        fourth = proxy_queue.get_many(timeout=0.01)
+
+        # Test
+        assert first == [1, 2]
+        assert second == [3, 4]
+        assert third == [5]
+        assert not fourth
+
+    def test_timeout(self, proxy_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Nothing arrives in time.
+        """
+        # Run
+        actual = proxy_queue.get_many(timeout=0.01)
+
+        # Test
+        assert not actual
@@ -0,0 +1,129 @@
+"""
+Test the shared memory ring queue.
+"""
+
+import multiprocessing as mp
+import queue
+
+import pytest
+
+from utilities.workers import shared_ring_queue
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def ring_queue() -> shared_ring_queue.SharedRingQueue:  # type: ignore
+    """
+    Small queue, freed after the test.
+    """
+    new_queue = shared_ring_queue.SharedRingQueue(3, 64)
+    yield new_queue  # type: ignore
+    new_queue.close()
+
+
+def produce(output_queue: shared_ring_queue.SharedRingQueue, count: int) -> None:
+    """
+    Puts integers from another process.
+    """
+    for i in range(count):
+        output_queue.queue.put(i)
+
+
+class TestSharedRingQueue:
+    """
+    Queue semantics.
+    """
+
+    def test_order_with_wraparound(self, ring_queue: shared_ring_queue.SharedRingQueue) -> None:
+        """
+        Items come out in order after the indices wrap past the capacity.
+        """
+        # Setup
+        expected = list(range(10))
+
+        # Run
+        actual = []
+        for item in expected:
+            ring_queue.queue.put(item)
+            actual.append(ring_queue.queue.get())
+
+        # Test
+        assert actual == expected
+        assert ring_queue.queue.empty()
+
+    def test_full(self, ring_queue: shared_ring_queue.SharedRingQueue) -> None:
+        """
+        Putting into a full queue raises after the timeout.
+        """
+        # Setup
+        for i in range(3):
+            ring_queue.queue.put(i)
+
+        # Run and test
+        assert ring_queue.queue.full()
+        with pytest.raises(queue.Full):
+            ring_queue.queue.put(3, timeout=0.01)
+
+    def test_empty(self, ring_queue: shared_ring_queue.SharedRingQueue) -> None:
+        """
+        Getting from an empty queue raises.
+        """
+        # Run and test
+        with pytest.raises(queue.Empty):
+            ring_queue.queue.get_nowait()
+
+    def test_item_too_large(self, ring_queue: shared_ring_queue.SharedRingQueue) -> None:
+        """
+        Items larger than a slot are rejected without using a slot.
+        """
+        # Run and test
+        with pytest.raises(ValueError):
+            ring_queue.queue.put(b"0" * 100)
+
+        assert ring_queue.queue.empty()
+
+    def test_fill_and_drain(self, ring_queue: shared_ring_queue.SharedRingQueue) -> None:
+        """
+        Leaves the queue empty.
+        """
+        # Setup
+        ring_queue.queue.put(1)
+
+        # Run
+        ring_queue.fill_and_drain_queue()
+
+        # Test
+        assert ring_queue.queue.empty()
+
+    def test_get_many(self, ring_queue: shared_ring_queue.SharedRingQueue) -> None:
+        """
+        Batched calls work with one item per slot.
+        """
+        # Setup
+        ring_queue.put_many([1, 2, 3])
+
+        # Run
+        actual = ring_queue.get_many(timeout=0.01)
+
+        # Test
+        assert actual == [1, 2, 3]
+
+    def test_across_processes(self, ring_queue: shared_ring_queue.SharedRingQueue) -> None:
+        """
+        Items put by another process arrive in order.
+        """
+        # Setup
+        expected = list(range(20))
+        producer = mp.Process(target=produce, args=(ring_queue, len(expected)))
+
+        # Run
+        producer.start()
+        actual = [ring_queue.queue.get(timeout=5) for _ in expected]
+        producer.join()
+
+        # Test
+        assert actual == expected
@@ -0,0 +1,106 @@
+"""
+Test combining ATTITUDE and LOCAL_POSITION_NED messages in Telemetry.
+"""
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+def attitude(time_boot_ms: int, yaw: float) -> mavutil.mavlink.MAVLink_attitude_message:
+    """
+    ATTITUDE message, level with the given yaw.
+    """
+    return mavutil.mavlink.MAVLink_attitude_message(time_boot_ms, 0.0, 0.0, yaw, 0.0, 0.0, 0.1)
+
+
+def position(time_boot_ms: int, x: float) -> mavutil.mavlink.MAVLink_local_position_ned_message:
+    """
+    LOCAL_POSITION_NED message, along x.
+    """
+    return mavutil.mavlink.MAVLink_local_position_ned_message(
+        time_boot_ms, x, 0.0, -10.0, 1.0, 0.0, 0.0
+    )
+
+
+@pytest.fixture()
+def streaming_telemetry() -> telemetry.Telemetry:  # type: ignore
+    """
+    Telemetry in streaming mode. Only update() is used, which does not read the connection.
+    """
+    result, test_logger = logger.Logger.create("test_telemetry", False)
+    assert result
+    assert test_logger is not None
+
+    result, telemetry_obj = telemetry.Telemetry.create(None, test_logger, streaming=True)
+    assert result
+    yield telemetry_obj  # type: ignore
+
+
+class TestStreaming:
+    """
+    Every new message produces an output with the latest of the other message.
+    """
+
+    def test_interleaved(self, streaming_telemetry: telemetry.Telemetry) -> None:
+        """
+        No output until both messages are seen, then one per message, fused from the latest.
+        """
+        # Setup
+        messages = [
+            attitude(100, 0.1),
+            attitude(120, 0.2),
+            position(130, 1.0),
+            attitude(140, 0.3),
+            position(150, 2.0),
+            position(170, 3.0),
+        ]
+
+        # Run
+        outputs = [streaming_telemetry.update(msg) for msg in messages]
+
+        # Test
+        assert outputs[0] is None
+        assert outputs[1] is None
+        assert all(output is not None for output in outputs[2:])
+
+        # (time_since_boot, x, yaw, position_age, attitude_age)
+        expected = [
+            (130, 1.0, 0.2, 0, 10),
+            (140, 1.0, 0.3, 10, 0),
+            (150, 2.0, 0.3, 0, 10),
+            (170, 3.0, 0.3, 0, 30),
+        ]
+        actual = [
+            (data.time_since_boot, data.x, data.yaw, data.position_age, data.attitude_age)
+            for data in outputs[2:]
+        ]
+        assert actual == expected
+        assert outputs[-1].z == -10.0
+        assert outputs[-1].x_velocity == 1.0
+        assert outputs[-1].yaw_speed == 0.1
+
+    def test_not_streaming(self, streaming_telemetry: telemetry.Telemetry) -> None:
+        """
+        Without streaming, a fresh pair is needed for each output.
+        """
+        # Setup
+        streaming_telemetry.streaming = False
+
+        # Run
+        outputs = [
+            streaming_telemetry.update(msg)
+            for msg in (attitude(100, 0.1), position(110, 1.0), position(120, 2.0))
+        ]
+
+        # Test
+        assert outputs[0] is None
+        assert outputs[1] is not None
+        assert outputs[2] is None
@@ -0,0 +1,107 @@
+"""
+Test TelemetryData binary layout and TelemetryBatch.
+"""
+
+import math
+import pickle
+
+import pytest
+
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def sample() -> telemetry.TelemetryData:  # type: ignore
+    """
+    Partially populated telemetry data.
+    """
+    data = telemetry.TelemetryData(time_since_boot=1500, x=1.5, y=-2.0, yaw=0.25, attitude_age=20)
+    yield data  # type: ignore
+
+
+class TestTelemetryData:
+    """
+    Binary form and pickling of a single sample.
+    """
+
+    def test_pack_unpack(self, sample: telemetry.TelemetryData) -> None:
+        """
+        Unpacking restores values, integers and missing fields.
+        """
+        # Run
+        actual = telemetry.TelemetryData.unpack(sample.pack())
+
+        # Test
+        assert actual.time_since_boot == 1500
+        assert isinstance(actual.time_since_boot, int)
+        assert math.isclose(actual.x, 1.5)
+        assert math.isclose(actual.y, -2.0)
+        assert math.isclose(actual.yaw, 0.25)
+        assert actual.z is None
+        assert actual.position_age is None
+        assert actual.attitude_age == 20
+
+    def test_pack_size(self, sample: telemetry.TelemetryData) -> None:
+        """
+        Every sample packs to the same size.
+        """
+        # Run
+        actual = len(sample.pack())
+
+        # Test
+        assert actual == telemetry.TelemetryData.STRUCT.size
+
+    def test_pickle(self, sample: telemetry.TelemetryData) -> None:
+        """
+        Pickling round trip.
+        """
+        # Run
+        actual = pickle.loads(pickle.dumps(sample))
+
+        # Test
+        assert str(actual) == str(sample)
+
+
+class TestTelemetryBatch:
+    """
+    Many samples in one buffer.
+    """
+
+    def test_append_and_index(self, sample: telemetry.TelemetryData) -> None:
+        """
+        Samples come back in order.
+        """
+        # Setup
+        batch = telemetry.TelemetryBatch()
+
+        # Run
+        batch.append(telemetry.TelemetryData(time_since_boot=0))
+        batch.append(sample)
+
+        # Test
+        assert len(batch) == 2
+        assert batch[0].time_since_boot == 0
+        assert str(batch[-1]) == str(sample)
+        with pytest.raises(IndexError):
+            _ = batch[2]
+
+    def test_pickle(self, sample: telemetry.TelemetryData) -> None:
+        """
+        The whole batch pickles as one buffer.
+        """
+        # Setup
+        batch = telemetry.TelemetryBatch()
+        for _ in range(3):
+            batch.append(sample)
+
+        # Run
+        actual = pickle.loads(pickle.dumps(batch))
+
+        # Test
+        assert len(actual) == 3
+        assert [str(data) for data in actual] == [str(sample)] * 3
@@ -0,0 +1,145 @@
+"""
+Test the running velocity statistics against direct computation.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from modules.command import velocity_statistics
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def samples() -> np.ndarray:  # type: ignore
+    """
+    Noisy velocities around a slowly changing mean.
+    """
+    generator = random.Random(0)
+    rows = [
+        (i * 0.01 + generator.gauss(0, 1), 5.0 + generator.gauss(0, 2), generator.gauss(0, 0.1))
+        for i in range(500)
+    ]
+    yield np.array(rows)  # type: ignore
+
+
+def feed(statistics: velocity_statistics.VelocityStatistics, samples: np.ndarray) -> None:
+    """
+    Updates with every sample one at a time.
+    """
+    for velocity in samples.tolist():
+        statistics.update(velocity)
+
+
+class TestVelocityStatistics:
+    """
+    Each kind of statistics.
+    """
+
+    def test_empty(self) -> None:
+        """
+        Means are NaN before the first sample.
+        """
+        for statistics in [
+            velocity_statistics.CumulativeMean(),
+            velocity_statistics.WindowMean(4),
+            velocity_statistics.ExponentialMean(0.5),
+            velocity_statistics.WelfordStatistics(),
+        ]:
+            assert all(math.isnan(value) for value in statistics.mean())
+
+    def test_cumulative_mean(self, samples: np.ndarray) -> None:
+        """
+        Mean of all samples.
+        """
+        # Setup
+        statistics = velocity_statistics.CumulativeMean()
+
+        # Run
+        feed(statistics, samples)
+
+        # Test
+        assert statistics.mean() == pytest.approx(samples.mean(axis=0).tolist())
+        assert statistics.variance() is None
+
+    def test_window_mean(self, samples: np.ndarray) -> None:
+        """
+        Mean of the last samples, also while the window is filling.
+        """
+        # Setup
+        statistics = velocity_statistics.WindowMean(64)
+
+        # Run
+        feed(statistics, samples[:10])
+        filling = statistics.mean()
+        feed(statistics, samples[10:])
+
+        # Test
+        assert filling == pytest.approx(samples[:10].mean(axis=0).tolist())
+        assert statistics.mean() == pytest.approx(samples[-64:].mean(axis=0).tolist())
+
+    def test_exponential_mean(self, samples: np.ndarray) -> None:
+        """
+        Matches the recurrence.
+        """
+        # Setup
+        alpha = 0.1
+        statistics = velocity_statistics.ExponentialMean(alpha)
+        expected = samples[0]
+        for velocity in samples[1:]:
+            expected = expected + alpha * (velocity - expected)
+
+        # Run
+        feed(statistics, samples)
+
+        # Test
+        assert statistics.mean() == pytest.approx(expected.tolist())
+
+    def test_welford(self, samples: np.ndarray) -> None:
+        """
+        Mean and sample variance of all samples.
+        """
+        # Setup
+        statistics = velocity_statistics.WelfordStatistics()
+
+        # Run
+        feed(statistics, samples)
+
+        # Test
+        assert statistics.mean() == pytest.approx(samples.mean(axis=0).tolist())
+        assert statistics.variance() == pytest.approx(samples.var(axis=0, ddof=1).tolist())
+
+    def test_update_batch(self, samples: np.ndarray) -> None:
+        """
+        Batch updates give the same means as updating one sample at a time.
+        """
+        for create in [
+            velocity_statistics.CumulativeMean,
+            lambda: velocity_statistics.WindowMean(16),
+            lambda: velocity_statistics.ExponentialMean(0.2),
+            velocity_statistics.WelfordStatistics,
+        ]:
+            # Setup
+            expected_statistics = create()
+            actual_statistics = create()
+            expected = []
+            for velocity in samples.tolist():
+                expected_statistics.update(velocity)
+                expected.append(expected_statistics.mean())
+
+            # Run
+            actual = np.concatenate(
+                [
+                    actual_statistics.update_batch(samples[:100]),
+                    actual_statistics.update_batch(samples[100:]),
+                ]
+            )
+
+            # Test
+            np.testing.assert_allclose(actual, np.array(expected))
@@ -0,0 +1,91 @@
+"""
+Test the worker controller flags.
+"""
+
+import multiprocessing as mp
+import time
+
+import pytest
+
+from utilities.workers import worker_controller
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def controller() -> worker_controller.WorkerController:  # type: ignore
+    """
+    Fresh controller.
+    """
+    new_controller = worker_controller.WorkerController()
+    yield new_controller  # type: ignore
+
+
+def wait_paused_worker(
+    controller: worker_controller.WorkerController, done_queue: "mp.Queue[float]"
+) -> None:
+    """
+    Reports when it gets past the pause check.
+    """
+    controller.check_pause()
+    done_queue.put(time.monotonic())
+
+
+class TestWorkerController:
+    """
+    Exit and pause requests.
+    """
+
+    def test_exit(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Exit is requested and cleared without delay.
+        """
+        # Run and test
+        assert not controller.is_exit_requested()
+        controller.request_exit()
+        assert controller.is_exit_requested()
+        assert controller.wait_for_exit(0.0)
+        controller.clear_exit()
+        assert not controller.is_exit_requested()
+        assert not controller.wait_for_exit(0.0)
+
+    def test_resume_wakes_worker(self, controller: worker_controller.WorkerController) -> None:
+        """
+        A paused worker process continues once resumed.
+        """
+        # Setup
+        done_queue = mp.Queue()
+        controller.request_pause()
+        worker = mp.Process(target=wait_paused_worker, args=(controller, done_queue))
+        worker.start()
+        time.sleep(0.1)
+
+        # Run
+        resume_time = time.monotonic()
+        controller.request_resume()
+        done_time = done_queue.get(timeout=5)
+        worker.join()
+
+        # Test
+        assert done_time >= resume_time
+
+    def test_exit_wakes_paused_worker(self, controller: worker_controller.WorkerController) -> None:
+        """
+        A paused worker process is not stuck when exit is requested.
+        """
+        # Setup
+        done_queue = mp.Queue()
+        controller.request_pause()
+        worker = mp.Process(target=wait_paused_worker, args=(controller, done_queue))
+        worker.start()
+
+        # Run
+        controller.request_exit()
+        done_queue.get(timeout=5)
+        worker.join()
+
+        # Test
+        assert controller.is_exit_requested()
@@ -0,0 +1,310 @@
+"""
+Test worker shutdown in the worker manager.
+"""
+
+import threading
+import time
+
+import pytest
+
+from modules.common.modules.logger import logger
+from modules.mavlink_demux import mavlink_demux
+from utilities.workers import shared_ring_queue
+from utilities.workers import worker_controller
+from utilities.workers import worker_manager
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+def consumer_worker(
+    input_queue: shared_ring_queue.SharedRingQueue,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Blocks on its input queue until the sentinel.
+    """
+    worker_manager.report_ready()
+    while not controller.is_exit_requested():
+        if input_queue.queue.get() is None:
+            continue
+
+
+def channel_worker(
+    connection: mavlink_demux.SubscribedConnection,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Blocks on a channel read through its work arguments until the sentinel.
+    """
+    worker_manager.report_ready()
+    while not controller.is_exit_requested():
+        connection.recv_match(blocking=True)
+
+
+def idle_worker(controller: worker_controller.WorkerController) -> None:
+    """
+    Waits for exit.
+    """
+    worker_manager.report_ready()
+    controller.wait_for_exit()
+
+
+def stuck_worker(controller: worker_controller.WorkerController) -> None:
+    """
+    Ignores exit requests.
+    """
+    worker_manager.report_ready()
+    _ = controller
+    while True:
+        time.sleep(1)
+
+
+def failed_setup_worker(controller: worker_controller.WorkerController) -> None:
+    """
+    Fails its setup and returns without reporting ready.
+    """
+    _ = controller
+
+
+# Lets stuck thread workers end after their test
+release_event = threading.Event()
+
+
+def stuck_thread_worker(controller: worker_controller.WorkerController) -> None:
+    """
+    Ignores exit requests until released.
+    """
+    worker_manager.report_ready()
+    _ = controller
+    release_event.wait()
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the managers.
+    """
+    result, test_logger = logger.Logger.create("test_worker_manager", False)
+    assert result
+    yield test_logger  # type: ignore
+
+
+def create_manager(
+    target: "(...) -> object",  # type: ignore
+    input_queues: "list[shared_ring_queue.SharedRingQueue]",
+    controller: worker_controller.WorkerController,
+    local_logger: logger.Logger,
+    execution: str = worker_manager.WorkerProperties.PROCESS,
+    work_arguments: "tuple" = (),
+    input_channels: "list[shared_ring_queue.SharedRingQueue] | None" = None,
+) -> worker_manager.WorkerManager:
+    """
+    Creates a manager with 2 workers.
+    """
+    result, properties = worker_manager.WorkerProperties.create(
+        count=2,
+        target=target,
+        work_arguments=work_arguments,
+        input_queues=input_queues,
+        output_queues=[],
+        controller=controller,
+        local_logger=local_logger,
+        execution=execution,
+        input_channels=input_channels,
+    )
+    assert result
+    assert properties is not None
+
+    result, manager = worker_manager.WorkerManager.create(properties, local_logger)
+    assert result
+    assert manager is not None
+
+    return manager
+
+
+class TestStopWorkers:
+    """
+    Coordinated shutdown.
+    """
+
+    @pytest.mark.parametrize(
+        "execution",
+        [worker_manager.WorkerProperties.PROCESS, worker_manager.WorkerProperties.THREAD],
+    )
+    def test_sentinel_wakes_consumers(self, execution: str, local_logger: logger.Logger) -> None:
+        """
+        Consumers blocked on get exit on their own.
+        """
+        # Setup
+        controller = worker_controller.WorkerController()
+        input_queue = shared_ring_queue.SharedRingQueue(4)
+        manager = create_manager(
+            consumer_worker, [input_queue], controller, local_logger, execution
+        )
+        manager.start_workers()
+
+        # Run
+        shutdown_time = worker_manager.WorkerManager.stop_workers([manager], join_timeout=5)
+
+        # Test
+        assert manager.join_workers(time.monotonic())
+        assert shutdown_time < 5
+        input_queue.close()
+
+    def test_sentinel_wakes_channel_consumers(self, local_logger: logger.Logger) -> None:
+        """
+        Consumers blocked on a channel of their work arguments exit on their own.
+        """
+        # Setup
+        controller = worker_controller.WorkerController()
+        channel = shared_ring_queue.SharedRingQueue(4)
+        manager = create_manager(
+            channel_worker,
+            [],
+            controller,
+            local_logger,
+            work_arguments=(mavlink_demux.SubscribedConnection(channel),),
+            input_channels=[channel],
+        )
+        manager.start_workers()
+        result, _ = manager.wait_until_ready(time.monotonic() + 5)
+
+        # Run
+        shutdown_time = worker_manager.WorkerManager.stop_workers([manager], join_timeout=5)
+
+        # Test
+        assert result
+        assert not manager.is_running()
+        assert shutdown_time < 1
+        channel.close()
+
+    def test_stuck_workers_terminated(self, local_logger: logger.Logger) -> None:
+        """
+        Workers that ignore the exit request are terminated within the stage deadlines.
+        """
+        # Setup
+        controller = worker_controller.WorkerController()
+        manager = create_manager(stuck_worker, [], controller, local_logger)
+        manager.start_workers()
+
+        # Run
+        shutdown_time = worker_manager.WorkerManager.stop_workers(
+            [manager], join_timeout=0.1, terminate_timeout=0.05
+        )
+
+        # Test
+        assert manager.join_workers(time.monotonic())
+        assert shutdown_time < 0.2
+
+    def test_stuck_threads_left_running(self, local_logger: logger.Logger) -> None:
+        """
+        Thread workers that ignore the exit request do not hold up shutdown.
+        """
+        # Setup
+        controller = worker_controller.WorkerController()
+        manager = create_manager(
+            stuck_thread_worker,
+            [],
+            controller,
+            local_logger,
+            worker_manager.WorkerProperties.THREAD,
+        )
+        manager.start_workers()
+
+        # Run
+        shutdown_time = worker_manager.WorkerManager.stop_workers(
+            [manager], join_timeout=0.1, terminate_timeout=0.05
+        )
+
+        # Test
+        assert not manager.join_workers(time.monotonic())
+        assert shutdown_time < 0.2
+        release_event.set()
+        assert manager.join_workers(time.monotonic() + 1)
+
+
+class TestReadiness:
+    """
+    Readiness handshake at start.
+    """
+
+    @pytest.mark.parametrize(
+        "execution",
+        [worker_manager.WorkerProperties.PROCESS, worker_manager.WorkerProperties.THREAD],
+    )
+    def test_failed_setup_not_ready(self, execution: str, local_logger: logger.Logger) -> None:
+        """
+        A worker that exits before reporting ready is not counted as ready.
+        """
+        # Setup
+        controller = worker_controller.WorkerController()
+        manager = create_manager(failed_setup_worker, [], controller, local_logger, execution)
+
+        # Run
+        start_time = time.monotonic()
+        result, times_to_ready = worker_manager.WorkerManager.start_all_workers(
+            [manager], timeout=5
+        )
+        elapsed_time = time.monotonic() - start_time
+
+        # Test
+        assert not result
+        assert len(times_to_ready) == 0
+        # EOF on the handshake, instead of waiting out the timeout
+        assert elapsed_time < 2
+        assert manager.join_workers(time.monotonic() + 1)
+
+
+class TestThreadWorkers:
+    """
+    Workers in threads of main.
+    """
+
+    def test_ready_and_restart(self, local_logger: logger.Logger) -> None:
+        """
+        Thread workers complete the readiness handshake, and dead ones are restarted.
+        """
+        # Setup
+        controller = worker_controller.WorkerController()
+        manager = create_manager(
+            idle_worker, [], controller, local_logger, worker_manager.WorkerProperties.THREAD
+        )
+        controller.request_exit()
+
+        # Run
+        result, times_to_ready = worker_manager.WorkerManager.start_all_workers([manager])
+        exited = manager.join_workers(time.monotonic() + 1)
+        sentinels = manager.get_worker_sentinels()
+        controller.clear_exit()
+        restarted = manager.check_and_restart_dead_workers()
+
+        # Test
+        assert result
+        assert len(times_to_ready) == 2
+        assert exited
+        assert len(sentinels) == 2
+        assert restarted
+        assert len(manager.get_worker_sentinels()) == 2
+        worker_manager.WorkerManager.stop_workers([manager])
+        assert manager.join_workers(time.monotonic() + 1)
+
+    def test_unknown_execution(self, local_logger: logger.Logger) -> None:
+        """
+        Only processes and threads are supported.
+        """
+        result, properties = worker_manager.WorkerProperties.create(
+            count=1,
+            target=idle_worker,
+            work_arguments=(),
+            input_queues=[],
+            output_queues=[],
+            controller=worker_controller.WorkerController(),
+            local_logger=local_logger,
+            execution="asyncio",
+        )
+
+        assert not result
+        assert properties is None
@@ -0,0 +1,122 @@
+"""
+Test restarting dead workers.
+"""
+
+import time
+
+import pytest
+
+from modules.common.modules.logger import logger
+from utilities.workers import worker_controller
+from utilities.workers import worker_manager
+from utilities.workers import worker_supervisor
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+def crashing_worker(controller: worker_controller.WorkerController) -> None:
+    """
+    Exits right away, as if it crashed.
+    """
+    worker_manager.report_ready()
+    _ = controller
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the managers.
+    """
+    result, test_logger = logger.Logger.create("test_worker_supervisor", False)
+    assert result
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture(
+    params=[worker_manager.WorkerProperties.PROCESS, worker_manager.WorkerProperties.THREAD]
+)
+def crashing_manager(  # type: ignore
+    request: pytest.FixtureRequest, local_logger: logger.Logger
+) -> worker_manager.WorkerManager:
+    """
+    Manager with a single worker that keeps dying, in a process or a thread.
+    """
+    result, properties = worker_manager.WorkerProperties.create(
+        count=1,
+        target=crashing_worker,
+        work_arguments=(),
+        input_queues=[],
+        output_queues=[],
+        controller=worker_controller.WorkerController(),
+        local_logger=local_logger,
+        execution=request.param,
+    )
+    assert result
+    assert properties is not None
+
+    result, manager = worker_manager.WorkerManager.create(properties, local_logger)
+    assert result
+    assert manager is not None
+
+    yield manager  # type: ignore
+
+    worker_manager.WorkerManager.stop_workers([manager])
+
+
+class TestWorkerSupervisor:
+    """
+    Restarts, backoff and budget.
+    """
+
+    def test_restart_until_budget(
+        self, crashing_manager: worker_manager.WorkerManager, local_logger: logger.Logger
+    ) -> None:
+        """
+        A worker that keeps dying is restarted until the budget runs out.
+        """
+        # Setup
+        result, supervisor = worker_supervisor.WorkerSupervisor.create(
+            [crashing_manager], local_logger, restart_budget=3
+        )
+        assert result
+        assert supervisor is not None
+        crashing_manager.start_workers()
+
+        # Run
+        # Backoff is 0 s, 0.1 s, 0.2 s
+        supervisor.start()
+        time.sleep(1.0)
+        supervisor.stop()
+
+        # Test
+        health = supervisor.get_health()["crashing_worker"]
+        assert health.restart_count == 3
+        assert health.failed
+
+    def test_no_restart_on_exit(
+        self, crashing_manager: worker_manager.WorkerManager, local_logger: logger.Logger
+    ) -> None:
+        """
+        Workers exiting on request are not restarted.
+        """
+        # Setup
+        result, supervisor = worker_supervisor.WorkerSupervisor.create(
+            [crashing_manager], local_logger
+        )
+        assert result
+        assert supervisor is not None
+        crashing_manager.request_exit()
+        crashing_manager.start_workers()
+
+        # Run
+        supervisor.start()
+        time.sleep(0.1)
+        supervisor.stop()
+
+        # Test
+        health = supervisor.get_health()["crashing_worker"]
+        assert health.restart_count == 0
+        assert not health.failed
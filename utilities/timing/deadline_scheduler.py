@@ -0,0 +1,198 @@
+"""
+Periodic tasks driven by deadlines on the monotonic clock.
+"""
+
+import collections.abc
+import heapq
+import time
+
+
+class JitterHistogram:
+    """
+    Lateness of runs after their deadlines, in fixed width buckets.
+    The last bucket also counts everything later than the histogram covers.
+    """
+
+    def __init__(self, bucket_width: float = 0.0005, bucket_count: int = 40) -> None:
+        """
+        bucket_width: Width of a bucket in seconds.
+        bucket_count: Number of buckets, the histogram covers bucket_width * bucket_count.
+        """
+        assert bucket_width > 0.0, "Bucket width must be greater than 0"
+        assert bucket_count > 0, "Bucket count must be greater than 0"
+
+        self.bucket_width = bucket_width
+        self.counts = [0] * bucket_count
+
+        self.count = 0
+        self.total = 0.0  # s
+        self.max = 0.0  # s
+
+    def record(self, lateness: float) -> None:
+        """
+        Records the lateness of a run in seconds.
+        """
+        lateness = max(lateness, 0.0)
+        bucket = min(int(lateness / self.bucket_width), len(self.counts) - 1)
+        self.counts[bucket] += 1
+
+        self.count += 1
+        self.total += lateness
+        self.max = max(self.max, lateness)
+
+    def mean(self) -> float:
+        """
+        Mean lateness in seconds, 0 without runs.
+        """
+        if self.count == 0:
+            return 0.0
+
+        return self.total / self.count
+
+    def percentile(self, percent: float) -> float:
+        """
+        Upper edge in seconds of the bucket holding the percentile, 0 without runs.
+        The maximum if that is the last bucket, which has no upper edge.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = percent / 100 * self.count
+        cumulative = 0
+        for bucket, count in enumerate(self.counts[:-1]):
+            cumulative += count
+            if cumulative >= rank:
+                return min((bucket + 1) * self.bucket_width, self.max)
+
+        return self.max
+
+    def __str__(self) -> str:
+        """
+        Summary in milliseconds, and the non empty buckets.
+        """
+        if self.count == 0:
+            return "no runs"
+
+        width = self.bucket_width * 1000
+        buckets = ", ".join(
+            f"{bucket * width:g}-{(bucket + 1) * width:g}: {count}"
+            for bucket, count in enumerate(self.counts)
+            if count > 0
+        )
+        return (
+            f"{self.count} runs, mean {self.mean() * 1000:.3f} ms, "
+            f"p99 {self.percentile(99) * 1000:.3f} ms, max {self.max * 1000:.3f} ms "
+            f"[ms {buckets}]"
+        )
+
+
+class PeriodicTask:
+    """
+    Callback run once per period, with its next deadline and its jitter.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        period: float,
+        callback: collections.abc.Callable[[], None],
+        deadline: float,
+        histogram: JitterHistogram,
+    ) -> None:
+        self.name = name
+        self.period = period  # s
+        self.callback = callback
+        self.deadline = deadline  # s, time.monotonic()
+        self.histogram = histogram
+
+        self.run_count = 0
+        # Deadlines passed without a run, when a run is late by over a period
+        self.missed_count = 0
+
+
+class DeadlineScheduler:
+    """
+    Runs periodic tasks from one loop, in deadline order.
+
+    Deadlines advance by exactly one period from the previous deadline, not from when the task
+    ran, so time spent running tasks and waiting late does not accumulate into drift.
+    A task late by more than a period runs once and skips the deadlines it missed.
+    """
+
+    def __init__(self, clock: collections.abc.Callable[[], float] = time.monotonic) -> None:
+        """
+        clock: Monotonic time in seconds.
+        """
+        self.clock = clock
+        self.tasks: "list[PeriodicTask]" = []
+        # (deadline, order added, task)
+        self.__queue: "list[tuple[float, int, PeriodicTask]]" = []
+
+    def add(
+        self,
+        name: str,
+        period: float,
+        callback: collections.abc.Callable[[], None],
+        phase: float = 0.0,
+        histogram: JitterHistogram | None = None,
+    ) -> PeriodicTask:
+        """
+        Schedules a callback every period seconds, first phase seconds from now.
+        """
+        assert period > 0.0, "Period must be greater than 0"
+        assert phase >= 0.0, "Phase must not be negative"
+
+        if histogram is None:
+            histogram = JitterHistogram()
+
+        task = PeriodicTask(name, period, callback, self.clock() + phase, histogram)
+        heapq.heappush(self.__queue, (task.deadline, len(self.tasks), task))
+        self.tasks.append(task)
+        return task
+
+    def next_deadline(self) -> float | None:
+        """
+        Earliest deadline, None without tasks.
+        """
+        if len(self.__queue) == 0:
+            return None
+
+        return self.__queue[0][0]
+
+    def time_until_next(self) -> float | None:
+        """
+        Seconds until the earliest deadline, 0 if passed, None without tasks.
+        """
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+
+        return max(deadline - self.clock(), 0.0)
+
+    def run_pending(self) -> int:
+        """
+        Runs every task whose deadline has passed, earliest first.
+
+        Returns the number of tasks run.
+        """
+        queue = self.__queue
+        run_count = 0
+        while len(queue) > 0:
+            deadline, order, task = queue[0]
+            now = self.clock()
+            if deadline > now:
+                break
+
+            missed = int((now - deadline) // task.period)
+            deadline += missed * task.period
+            task.missed_count += missed
+            task.histogram.record(now - deadline)
+
+            task.callback()
+            task.run_count += 1
+            run_count += 1
+
+            task.deadline = deadline + task.period
+            heapq.heapreplace(queue, (task.deadline, order, task))
+
+        return run_count
@@ -0,0 +1,212 @@
+"""
+Latest value channel, where a new item overwrites the previous one.
+"""
+
+import multiprocessing as mp
+import multiprocessing.shared_memory
+import pickle
+import queue
+import struct
+import time
+
+from utilities.workers import queue_proxy_wrapper
+
+
+class LatestValueBuffer:
+    """
+    Single slot in shared memory with a sequence number, with a queue like put/get surface.
+
+    Producers never wait for consumers, and consumers always get the freshest item.
+    Each consumer process keeps its own position, so reading never removes the item for others.
+    Writes are guarded by a sequence lock: the counter is odd while a write is in progress.
+    """
+
+    __HEADER = struct.Struct("<QI")  # Write counter, payload length
+
+    def __init__(self, slot_size: int) -> None:
+        """
+        slot_size: Maximum pickled size of an item in bytes, must be greater than 0.
+        """
+        assert slot_size > 0, "Slot size must be greater than 0"
+
+        self.slot_size = slot_size
+
+        self.__memory = multiprocessing.shared_memory.SharedMemory(
+            create=True,
+            size=self.__HEADER.size + slot_size,
+        )
+        self.__HEADER.pack_into(self.__memory.buf, 0, 0, 0)
+
+        # Only serializes producers against each other, held for a single copy
+        self.__write_lock = mp.Lock()
+        # Released once per put to wake a blocked consumer
+        self.__updates = mp.Semaphore(0)
+
+        # Sequence number of the last item returned in this process
+        self.__last_sequence = 0
+
+    def __read(self) -> "tuple[int, bytes]":
+        """
+        Returns the current sequence number and payload.
+        """
+        buffer = self.__memory.buf
+        while True:
+            counter, length = self.__HEADER.unpack_from(buffer, 0)
+            if counter % 2 == 1:
+                # Writer is in the middle of an update
+                time.sleep(0)
+                continue
+
+            start = self.__HEADER.size
+            payload = bytes(buffer[start : start + length])
+
+            counter_after, _ = self.__HEADER.unpack_from(buffer, 0)
+            if counter_after == counter:
+                return counter // 2, payload
+
+    def put(self, item: object, block: bool = True, timeout: float | None = None) -> None:
+        """
+        Overwrites the current item, never waits for consumers.
+
+        block and timeout are ignored, they are accepted for queue compatibility.
+        Raises ValueError if the item is too large.
+        """
+        # Never blocks
+        _ = block, timeout
+
+        payload = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.slot_size:
+            raise ValueError(
+                f"Item is {len(payload)} bytes pickled, slot size is {self.slot_size} bytes"
+            )
+
+        buffer = self.__memory.buf
+        with self.__write_lock:
+            counter, _ = self.__HEADER.unpack_from(buffer, 0)
+            self.__HEADER.pack_into(buffer, 0, counter + 1, 0)
+            start = self.__HEADER.size
+            buffer[start : start + len(payload)] = payload
+            self.__HEADER.pack_into(buffer, 0, counter + 2, len(payload))
+
+        self.__updates.release()
+
+    def get_with_sequence(
+        self, block: bool = True, timeout: float | None = None
+    ) -> "tuple[int, object]":
+        """
+        Gets the freshest item not yet returned in this process, waiting for one if block is set.
+
+        Returns the sequence number (count of puts so far) and the item.
+        The difference to the previous sequence number minus 1 is the number of skipped items.
+        Raises queue.Empty if no new item arrives in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            sequence, payload = self.__read()
+            if sequence > self.__last_sequence:
+                self.__last_sequence = sequence
+                return sequence, pickle.loads(payload)
+
+            if not block:
+                raise queue.Empty
+
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            if not self.__updates.acquire(True, remaining):
+                raise queue.Empty
+
+    def get(self, block: bool = True, timeout: float | None = None) -> object:
+        """
+        Gets the freshest item not yet returned in this process, waiting for one if block is set.
+
+        Raises queue.Empty if no new item arrives in time.
+        """
+        _, item = self.get_with_sequence(block, timeout)
+        return item
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Same as put().
+        """
+        self.put(item)
+
+    def get_nowait(self) -> object:
+        """
+        Gets without waiting.
+        """
+        return self.get(False)
+
+    def sequence(self) -> int:
+        """
+        Number of items put so far.
+        """
+        counter, _ = self.__HEADER.unpack_from(self.__memory.buf, 0)
+        return counter // 2
+
+    def qsize(self) -> int:
+        """
+        1 if there is an item not yet returned in this process, otherwise 0.
+        """
+        return 0 if self.empty() else 1
+
+    def empty(self) -> bool:
+        """
+        Whether there is no item not yet returned in this process.
+        """
+        return self.sequence() <= self.__last_sequence
+
+    def full(self) -> bool:
+        """
+        Never full, puts overwrite.
+        """
+        return False
+
+    def close(self) -> None:
+        """
+        Detaches this process from the shared memory.
+        """
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        """
+        Frees the shared memory, call once from the creating process after all workers are done.
+        """
+        self.__memory.unlink()
+
+
+class ConflatingQueue(queue_proxy_wrapper.QueueProxyWrapper):
+    """
+    Drop in replacement for QueueProxyWrapper where consumers only see the newest item.
+    """
+
+    __DEFAULT_SLOT_SIZE = 1024  # bytes
+
+    # The manager queue is replaced, not wrapped
+    # pylint: disable-next=super-init-not-called
+    def __init__(self, slot_size: int = 0) -> None:
+        """
+        slot_size: Maximum pickled size of an item in bytes.
+        """
+        if slot_size <= 0:
+            slot_size = self.__DEFAULT_SLOT_SIZE
+
+        self.queue = LatestValueBuffer(slot_size)
+        # A single sentinel is enough to wake a consumer
+        self.maxsize = 1
+
+    def put_many(self, items: "list[object]", timeout: float | None = None) -> None:
+        """
+        Only the last item is kept.
+
+        timeout: Ignored, puts never wait.
+        """
+        if len(items) == 0:
+            return
+
+        self.queue.put(items[-1], timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Frees the shared memory, call once all workers have been joined.
+        """
+        self.queue.close()
+        self.queue.unlink()
@@ -7,6 +7,12 @@ import queue
 import time
 
 
+class ItemBatch(list):
+    """
+    Items put together by put_many(), travelling as a single queue entry.
+    """
+
+
 class QueueProxyWrapper:
     """
     Wrapper for an underlying queue proxy which also stores `maxsize`.
@@ -17,10 +23,59 @@ class QueueProxyWrapper:
     __QUEUE_TIMEOUT = 0.1  # seconds
     __QUEUE_DELAY = 0.1  # seconds
 
+    # Items taken from a batch beyond max_items, returned by the next get_many() in this process
+    __pending: "tuple | list" = ()
+
     def __init__(self, mp_manager: multiprocessing.managers.SyncManager, maxsize: int = 0) -> None:
         self.queue = mp_manager.Queue(maxsize)
         self.maxsize = maxsize
 
+    def put_many(self, items: "list[object]", timeout: float | None = None) -> None:
+        """
+        Puts all items as a single queue entry, so a manager queue makes a single call.
+        Receive them with get_many().
+
+        timeout: Time waiting in seconds for space, None waits forever.
+        """
+        if len(items) == 0:
+            return
+
+        self.queue.put(ItemBatch(items), timeout=timeout)
+
+    def get_many(self, max_items: int = 0, timeout: float | None = None) -> "list[object]":
+        """
+        Waits for the first item and then takes everything already pending without waiting.
+
+        max_items: Maximum number of items to return, <= 0 for no limit.
+        timeout: Time waiting in seconds for the first item, None waits forever.
+
+        Returns the items in order, empty if nothing arrived in time.
+        """
+        items = list(self.__pending)
+        self.__pending = ()
+
+        try:
+            if len(items) == 0:
+                items.extend(self.__unbatch(self.queue.get(timeout=timeout)))
+
+            while max_items <= 0 or len(items) < max_items:
+                items.extend(self.__unbatch(self.queue.get_nowait()))
+        except queue.Empty:
+            pass
+
+        if 0 < max_items < len(items):
+            self.__pending = items[max_items:]
+            items = items[:max_items]
+
+        return items
+
+    @staticmethod
+    def __unbatch(entry: object) -> "list[object]":
+        if isinstance(entry, ItemBatch):
+            return entry
+
+        return [entry]
+
     def fill_queue_with_sentinel(self, timeout: float = 0.0) -> None:
         """
         Fills the queue with sentinel (None).
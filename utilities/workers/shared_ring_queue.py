@@ -0,0 +1,183 @@
+"""
+Queue backed by a shared memory ring buffer.
+"""
+
+import multiprocessing as mp
+import multiprocessing.shared_memory
+import pickle
+import queue
+import struct
+
+from utilities.workers import queue_proxy_wrapper
+
+
+class SharedRingBuffer:
+    """
+    Fixed size slots in shared memory, with the same put/get surface as a queue proxy.
+
+    Items are pickled into a slot, so each item must fit in `slot_size` bytes.
+    Semaphores count the filled and free slots, and a lock guards the head and tail indices.
+    """
+
+    # Head and tail are monotonically increasing counters, slot index is counter % capacity
+    __HEADER = struct.Struct("<QQ")
+    __LENGTH = struct.Struct("<I")
+
+    def __init__(self, capacity: int, slot_size: int) -> None:
+        """
+        capacity: Number of slots, must be greater than 0.
+        slot_size: Maximum pickled size of an item in bytes, must be greater than 0.
+        """
+        assert capacity > 0, "Capacity must be greater than 0"
+        assert slot_size > 0, "Slot size must be greater than 0"
+
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.__stride = self.__LENGTH.size + slot_size
+
+        self.__memory = multiprocessing.shared_memory.SharedMemory(
+            create=True,
+            size=self.__HEADER.size + capacity * self.__stride,
+        )
+        self.__HEADER.pack_into(self.__memory.buf, 0, 0, 0)
+
+        self.__items = mp.Semaphore(0)
+        self.__spaces = mp.Semaphore(capacity)
+        self.__lock = mp.Lock()
+
+    def __slot_offset(self, counter: int) -> int:
+        return self.__HEADER.size + (counter % self.capacity) * self.__stride
+
+    def put(self, item: object, block: bool = True, timeout: float | None = None) -> None:
+        """
+        Puts an item, waiting for a free slot if block is set.
+
+        Raises queue.Full if no slot is free in time, ValueError if the item is too large.
+        """
+        payload = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.slot_size:
+            raise ValueError(
+                f"Item is {len(payload)} bytes pickled, slot size is {self.slot_size} bytes"
+            )
+
+        if not self.__spaces.acquire(block, timeout):
+            raise queue.Full
+
+        buffer = self.__memory.buf
+        with self.__lock:
+            head, tail = self.__HEADER.unpack_from(buffer, 0)
+            offset = self.__slot_offset(tail)
+            self.__LENGTH.pack_into(buffer, offset, len(payload))
+            start = offset + self.__LENGTH.size
+            buffer[start : start + len(payload)] = payload
+            self.__HEADER.pack_into(buffer, 0, head, tail + 1)
+
+        self.__items.release()
+
+    def get(self, block: bool = True, timeout: float | None = None) -> object:
+        """
+        Gets an item, waiting for one if block is set.
+
+        Raises queue.Empty if no item arrives in time.
+        """
+        if not self.__items.acquire(block, timeout):
+            raise queue.Empty
+
+        buffer = self.__memory.buf
+        with self.__lock:
+            head, tail = self.__HEADER.unpack_from(buffer, 0)
+            offset = self.__slot_offset(head)
+            (length,) = self.__LENGTH.unpack_from(buffer, offset)
+            start = offset + self.__LENGTH.size
+            payload = bytes(buffer[start : start + length])
+            self.__HEADER.pack_into(buffer, 0, head + 1, tail)
+
+        self.__spaces.release()
+
+        return pickle.loads(payload)
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Puts an item without waiting.
+        """
+        self.put(item, False)
+
+    def get_nowait(self) -> object:
+        """
+        Gets an item without waiting.
+        """
+        return self.get(False)
+
+    def qsize(self) -> int:
+        """
+        Approximate number of items.
+        """
+        head, tail = self.__HEADER.unpack_from(self.__memory.buf, 0)
+        return tail - head
+
+    def empty(self) -> bool:
+        """
+        Approximate emptiness, a read of the shared indices.
+        """
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """
+        Approximate fullness, a read of the shared indices.
+        """
+        return self.qsize() >= self.capacity
+
+    def close(self) -> None:
+        """
+        Detaches this process from the shared memory.
+        """
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        """
+        Frees the shared memory, call once from the creating process after all workers are done.
+        """
+        self.__memory.unlink()
+
+
+class SharedRingQueue(queue_proxy_wrapper.QueueProxyWrapper):
+    """
+    Drop in replacement for QueueProxyWrapper that does not go through a manager process.
+
+    `maxsize <= 0` uses a default capacity, since a ring buffer cannot be infinite.
+    """
+
+    __DEFAULT_CAPACITY = 64
+    __DEFAULT_SLOT_SIZE = 1024  # bytes
+
+    # The manager queue is replaced, not wrapped
+    # pylint: disable-next=super-init-not-called
+    def __init__(self, maxsize: int = 0, slot_size: int = 0) -> None:
+        """
+        maxsize: Number of slots.
+        slot_size: Maximum pickled size of an item in bytes.
+        """
+        if maxsize <= 0:
+            maxsize = self.__DEFAULT_CAPACITY
+
+        if slot_size <= 0:
+            slot_size = self.__DEFAULT_SLOT_SIZE
+
+        self.queue = SharedRingBuffer(maxsize, slot_size)
+        self.maxsize = maxsize
+
+    def put_many(self, items: "list[object]", timeout: float | None = None) -> None:
+        """
+        Puts the items one per slot, since a batch may not fit in a single slot.
+
+        timeout: Time waiting in seconds for space for each item, None waits forever.
+        """
+        for item in items:
+            self.queue.put(item, timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Frees the shared memory, call once all workers have been joined.
+        """
+        self.queue.close()
+        self.queue.unlink()
@@ -3,65 +3,81 @@ For controlling workers.
 """
 
 import multiprocessing as mp
-import time
 
 
 class WorkerController:
     """
     For interprocess communication from main to worker.
     Contains exit and pause requests.
+
+    Requests are bits of a flag word in shared memory, so checking them is a memory read.
+    Events let workers block until resumed or until exit is requested.
     """
 
-    __QUEUE_DELAY = 0.1  # seconds
+    __EXIT_FLAG = 0x1
+    __PAUSE_FLAG = 0x2
 
     def __init__(self) -> None:
         """
-        Constructor creates internal queue and semaphore.
+        Constructor creates shared flags and events.
         """
-        self.__pause = mp.BoundedSemaphore(1)
-        self.__is_paused = False
-        self.__exit_queue = mp.Queue(1)
+        # Read without locking, the lock only serializes read-modify-write by requesters
+        self.__flags = mp.RawValue("i", 0)
+        self.__flags_lock = mp.Lock()
+        # Set while workers are allowed to run
+        self.__run_event = mp.Event()
+        self.__run_event.set()
+        # Set while exit is requested
+        self.__exit_event = mp.Event()
+
+    def __set_flags(self, set_mask: int, clear_mask: int) -> None:
+        with self.__flags_lock:
+            self.__flags.value = (self.__flags.value | set_mask) & ~clear_mask
 
     def request_pause(self) -> None:
         """
         Requests worker processes to pause.
         """
-        if not self.__is_paused:
-            self.__pause.acquire()
-            self.__is_paused = True
+        with self.__flags_lock:
+            self.__flags.value |= self.__PAUSE_FLAG
+            # Exit still wakes paused workers
+            if not self.__flags.value & self.__EXIT_FLAG:
+                self.__run_event.clear()
 
     def request_resume(self) -> None:
         """
         Requests worker processes to resume.
         """
-        if self.__is_paused:
-            self.__pause.release()
-            self.__is_paused = False
+        self.__set_flags(0, self.__PAUSE_FLAG)
+        self.__run_event.set()
 
     def check_pause(self) -> None:
         """
         Blocks worker if main has requested it to pause, otherwise continues.
+        Returns if exit is requested while paused.
         """
-        self.__pause.acquire()
-        self.__pause.release()
+        while self.__flags.value & self.__PAUSE_FLAG and not self.__flags.value & self.__EXIT_FLAG:
+            self.__run_event.wait()
 
     def request_exit(self) -> None:
         """
         Requests worker processes to exit.
         Does nothing if already requested.
         """
-        time.sleep(self.__QUEUE_DELAY)
-        if self.__exit_queue.empty():
-            self.__exit_queue.put(None)
+        self.__set_flags(self.__EXIT_FLAG, 0)
+        self.__exit_event.set()
+        self.__run_event.set()
 
     def clear_exit(self) -> None:
         """
         Clears the exit request condition.
         Does nothing if already cleared.
         """
-        time.sleep(self.__QUEUE_DELAY)
-        if not self.__exit_queue.empty():
-            _ = self.__exit_queue.get()
+        with self.__flags_lock:
+            self.__flags.value &= ~self.__EXIT_FLAG
+            self.__exit_event.clear()
+            if self.__flags.value & self.__PAUSE_FLAG:
+                self.__run_event.clear()
 
     def is_exit_requested(self) -> bool:
         """
@@ -69,4 +85,14 @@ class WorkerController:
         There is a race condition, but it's fine because the worker process
         will do at most 1 additional loop.
         """
-        return not self.__exit_queue.empty()
+        return bool(self.__flags.value & self.__EXIT_FLAG)
+
+    def wait_for_exit(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until exit is requested, for use in place of sleeping between iterations.
+
+        timeout: Time waiting in seconds, None waits forever.
+
+        Returns whether exit is requested.
+        """
+        return self.__exit_event.wait(timeout)
@@ -2,20 +2,155 @@
 For managing workers.
 """
 
+import itertools
 import multiprocessing as mp
+import multiprocessing.connection
+import multiprocessing.util
+import os
+import queue
+import threading
+import time
 
 from modules.common.modules.logger import logger
 from utilities.workers import worker_controller
 from utilities.workers import queue_proxy_wrapper
 
 
-class WorkerProperties:
+# Imported once by the forkserver instead of by every worker
+FORKSERVER_PRELOAD = [
+    "pymavlink.mavutil",
+    "modules.common.modules.logger.logger",
+]
+
+
+# Sending end of the readiness handshake of the worker run by each thread, set by worker_entry
+_readiness = threading.local()
+
+
+def report_ready() -> None:
+    """
+    Completes the readiness handshake of the calling worker, once its setup has succeeded.
+    Does nothing if already reported or outside a worker, so targets can also be called directly.
+    """
+    ready_connection = getattr(_readiness, "connection", None)
+    if ready_connection is None:
+        return
+
+    _readiness.connection = None
+    ready_connection.send(time.monotonic())
+    ready_connection.close()
+
+
+def worker_entry(
+    target: "(...) -> object",  # type: ignore
+    args: "tuple",
+    ready_connection: multiprocessing.connection.Connection,
+) -> None:
+    """
+    Worker process entry point, runs the target, which calls report_ready() once set up.
+    A target that returns or raises before then is not ready.
+
+    target: Function.
+    args: Target function arguments.
+    ready_connection: Sending end of the readiness handshake.
+    """
+    _readiness.connection = ready_connection
+    try:
+        target(*args)
+    finally:
+        _readiness.connection = None
+        ready_connection.close()
+
+
+def close_after_fork(connection: multiprocessing.connection.Connection) -> None:
+    """
+    Closes the connection in processes forked from this one.
+    """
+    multiprocessing.util.register_after_fork(
+        connection, multiprocessing.connection.Connection.close
+    )
+
+
+class ThreadWorker:  # pylint: disable=too-many-instance-attributes
+    """
+    Worker run by a thread of the current process, with the part of the mp.Process interface
+    the managers use. Its arguments are used as is, without pickling.
+
+    The sentinel reads EOF when the thread ends, like a process sentinel. It is closed
+    by join() once the thread has ended, or by close().
+
+    Threads cannot be terminated, so the target must return soon after exit is requested:
+    it checks controller.is_exit_requested() and only blocks on queues and channels
+    that get shutdown sentinels, or on controller.wait_for_exit().
+    One that ignores exit requests is left running.
+    """
+
+    __numbers = itertools.count(1)
+
+    def __init__(self, target: "(...) -> object", args: "tuple") -> None:  # type: ignore
+        self.name = f"WorkerThread-{next(ThreadWorker.__numbers)}"
+        # Process running the thread, None until started
+        self.pid = None
+
+        self.__target = target
+        self.__args = args
+        # Only the thread holds the sending end, and closes it when it ends
+        self.__exit_receiver, self.__exit_sender = multiprocessing.connection.Pipe(duplex=False)
+        # Processes forked later must not keep the thread's pipe open
+        close_after_fork(self.__exit_receiver)
+        close_after_fork(self.__exit_sender)
+        self.sentinel = self.__exit_receiver.fileno()
+        self.__thread = threading.Thread(target=self.__run, name=self.name, daemon=True)
+
+    def __run(self) -> None:
+        try:
+            self.__target(*self.__args)
+        finally:
+            self.__exit_sender.close()
+
+    def start(self) -> None:
+        """
+        Starts the thread.
+        """
+        self.pid = os.getpid()
+        self.__thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """
+        Waits for the thread to end, for up to timeout seconds, None waits forever.
+        """
+        self.__thread.join(timeout)
+        if not self.__thread.is_alive():
+            self.__exit_receiver.close()
+
+    def close(self) -> None:
+        """
+        Releases the sentinel. Raises ValueError if the thread is still running.
+        """
+        if self.__thread.is_alive():
+            raise ValueError(f"Cannot close {self.name}, it is still running")
+
+        self.__exit_receiver.close()
+        self.__exit_sender.close()
+
+    def is_alive(self) -> bool:
+        """
+        Returns whether the thread is running.
+        """
+        return self.__thread.is_alive()
+
+
+class WorkerProperties:  # pylint: disable=too-many-instance-attributes
     """
     Worker Properties.
     """
 
     __create_key = object()
 
+    # How workers are run
+    PROCESS = "process"
+    THREAD = "thread"
+
     @classmethod
     def create(
         cls,
@@ -26,6 +161,8 @@ class WorkerProperties:
         output_queues: "list[queue_proxy_wrapper.QueueProxyWrapper]",
         controller: worker_controller.WorkerController,
         local_logger: logger.Logger,
+        execution: str = PROCESS,
+        input_channels: "list[queue_proxy_wrapper.QueueProxyWrapper] | None" = None,
     ) -> "tuple[bool, WorkerProperties | None]":
         """
         Creates worker properties.
@@ -37,6 +174,11 @@ class WorkerProperties:
         output_queues: Output queues.
         controller: Worker controller.
         local_logger: Existing logger from process.
+        execution: PROCESS, or THREAD to run workers in main without pickling their arguments.
+            Thread workers share main's objects instead of copies: queues and controller behave
+            the same, but per-process state such as a queue's read position is shared with main.
+        input_channels: Queues the workers read through their work arguments, such as the channel
+            of a SubscribedConnection. Like input queues, they get sentinels on shutdown.
 
         Returns the WorkerProperties object.
         """
@@ -47,6 +189,13 @@ class WorkerProperties:
             )
             return False, None
 
+        if execution not in (cls.PROCESS, cls.THREAD):
+            local_logger.error(f"Unknown worker execution: {execution}", True)
+            return False, None
+
+        if input_channels is None:
+            input_channels = []
+
         return True, WorkerProperties(
             cls.__create_key,
             count,
@@ -55,6 +204,8 @@ class WorkerProperties:
             input_queues,
             output_queues,
             controller,
+            execution,
+            input_channels,
         )
 
     def __init__(
@@ -66,6 +217,8 @@ class WorkerProperties:
         input_queues: "list[queue_proxy_wrapper.QueueProxyWrapper]",
         output_queues: "list[queue_proxy_wrapper.QueueProxyWrapper]",
         controller: worker_controller.WorkerController,
+        execution: str,
+        input_channels: "list[queue_proxy_wrapper.QueueProxyWrapper]",
     ) -> None:
         """
         Private constructor, use create() method.
@@ -78,6 +231,8 @@ class WorkerProperties:
         self.__input_queues = input_queues
         self.__output_queues = output_queues
         self.__controller = controller
+        self.__execution = execution
+        self.__input_channels = input_channels
 
     def get_worker_arguments(self) -> "tuple":
         """
@@ -110,6 +265,24 @@ class WorkerProperties:
         """
         return self.__input_queues
 
+    def get_input_channels(self) -> "list[queue_proxy_wrapper.QueueProxyWrapper]":
+        """
+        Returns the queues read through the work arguments.
+        """
+        return self.__input_channels
+
+    def get_controller(self) -> worker_controller.WorkerController:
+        """
+        Returns the worker controller.
+        """
+        return self.__controller
+
+    def get_execution(self) -> str:
+        """
+        Returns how workers are run, PROCESS or THREAD.
+        """
+        return self.__execution
+
     def get_target_name(self) -> str:
         """
         Returns the name of the target.
@@ -125,36 +298,40 @@ class WorkerManager:
 
     __create_key = object()
 
+    __JOIN_TIMEOUT = 0.1  # seconds
+    __TERMINATE_TIMEOUT = 0.05  # seconds
+    __READY_TIMEOUT = 10.0  # seconds
+
     @classmethod
     def create(
         cls,
         worker_properties: WorkerProperties,
         local_logger: logger.Logger,
+        start_method: str | None = None,
     ) -> "tuple[bool, WorkerManager | None]":
         """
-        Create identical workers and append them to a workers list.
+        Creates a manager of identical workers, which are created when started.
 
         worker_properties: Worker properties.
         local_logger: Existing logger from process.
+        start_method: multiprocessing start method, None for the default.
+            "forkserver" preloads FORKSERVER_PRELOAD. Worker arguments must be picklable
+            unless the start method is "fork".
 
-        Returns whether the workers were able to be created and the Worker Manager.
+        Returns whether the manager was able to be created and the Worker Manager.
         """
-        workers = []
-        for _ in range(0, worker_properties.get_worker_count()):
-            result, worker = WorkerManager.__create_single_worker(
-                worker_properties.get_worker_target(),
-                worker_properties.get_worker_arguments(),
-                local_logger,
-            )
-            if not result:
-                local_logger.error("Failed to create worker", True)
-                return False, None
+        try:
+            context = mp.get_context(start_method)
+        except ValueError as e:
+            local_logger.error(f"Invalid start method {start_method}: {e}", True)
+            return False, None
 
-            workers.append(worker)
+        if context.get_start_method() == "forkserver":
+            context.set_forkserver_preload(FORKSERVER_PRELOAD)
 
         return True, WorkerManager(
             cls.__create_key,
-            workers,
+            context,
             worker_properties,
             local_logger,
         )
@@ -162,7 +339,7 @@ class WorkerManager:
     def __init__(
         self,
         class_private_create_key: object,
-        workers: "list[mp.Process]",
+        context: "mp.context.BaseContext",
         worker_properties: WorkerProperties,
         local_logger: logger.Logger,
     ) -> None:
@@ -171,44 +348,276 @@ class WorkerManager:
         """
         assert class_private_create_key is WorkerManager.__create_key, "Use create() method"
 
-        self.__workers = workers
+        self.__context = context
+        # Started workers
+        self.__workers = []
+        # Receiving end of the readiness handshake, by worker name, until ready
+        self.__ready_connections = {}
+        # time.monotonic() at start, by worker name
+        self.__start_times = {}
         self.__worker_properties = worker_properties
         self.__local_logger = local_logger
 
-    @staticmethod
-    def __create_single_worker(target: "(...) -> object", args: "tuple", local_logger: logger.Logger) -> "tuple[bool, mp.Process | None]":  # type: ignore
+    def __start_worker(self) -> bool:
         """
-        Creates a single worker.
+        Creates a single worker with its readiness handshake, appends it to the workers list
+        and starts it without waiting for it to be ready.
 
-        target: Function.
-        args: Target function arguments.
-        local_logger: Existing logger from process.
+        The handshake is created just before the start, so forked workers do not inherit
+        the sending ends of workers started after them, and EOF shows when a worker dies.
 
-        Returns whether a worker was created and the worker.
+        Returns whether a worker was started.
         """
+        receive_connection, send_connection = self.__context.Pipe(duplex=False)
+        args = (
+            self.__worker_properties.get_worker_target(),
+            self.__worker_properties.get_worker_arguments(),
+            send_connection,
+        )
+
+        is_thread = self.__worker_properties.get_execution() == WorkerProperties.THREAD
         try:
-            worker = mp.Process(target=target, args=args)
+            if is_thread:
+                # The thread keeps the sending end in main, processes forked later must not
+                close_after_fork(send_connection)
+                worker = ThreadWorker(worker_entry, args)
+            else:
+                worker = self.__context.Process(target=worker_entry, args=args)
+
+            self.__start_times[worker.name] = time.monotonic()
+            worker.start()
         # Catching all exceptions for library call
         # pylint: disable-next=broad-exception-caught
         except Exception as e:
-            local_logger.error(f"Exception raised while creating a worker: {e}", True)
-            return False, None
+            self.__local_logger.error(f"Exception raised while starting a worker: {e}", True)
+            receive_connection.close()
+            send_connection.close()
+            return False
+
+        self.__workers.append(worker)
+        self.__ready_connections[worker.name] = receive_connection
 
-        return True, worker
+        # Only the worker keeps the sending end, a thread closes it itself
+        if not is_thread:
+            send_connection.close()
+
+        return True
 
-    def start_workers(self) -> None:
+    def start_workers(self) -> bool:
         """
         Start workers.
+
+        Returns whether all workers were started.
         """
-        for worker in self.__workers:
-            worker.start()
+        while len(self.__workers) < self.__worker_properties.get_worker_count():
+            if not self.__start_worker():
+                self.__local_logger.error("Failed to start worker", True)
+                return False
 
-    def join_workers(self) -> None:
+        return True
+
+    def wait_until_ready(self, deadline: float) -> "tuple[bool, dict[str, float]]":
+        """
+        Waits for the readiness handshake of every started worker.
+
+        deadline: time.monotonic() value to stop waiting at.
+
+        Returns whether all workers are ready, and the time to ready in seconds by worker.
+        """
+        pending = {
+            self.__ready_connections[name]: name
+            for name in self.__start_times
+            if name in self.__ready_connections
+        }
+        times_to_ready = {}
+
+        while len(pending) > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
+                break
+
+            for connection in multiprocessing.connection.wait(list(pending), remaining):
+                name = pending.pop(connection)
+                try:
+                    ready_time = connection.recv()
+                    times_to_ready[f"{self.__worker_properties.get_target_name()} {name}"] = (
+                        ready_time - self.__start_times[name]
+                    )
+                except EOFError:
+                    self.__local_logger.error(f"Worker exited before ready: {name}", True)
+
+                connection.close()
+                del self.__ready_connections[name]
+
+        for name in pending.values():
+            self.__local_logger.error(f"Worker not ready in time: {name}", True)
+
+        return len(times_to_ready) == len(self.__start_times), times_to_ready
+
+    @classmethod
+    def start_all_workers(
+        cls,
+        worker_managers: "list[WorkerManager]",
+        timeout: float = __READY_TIMEOUT,
+    ) -> "tuple[bool, dict[str, float]]":
+        """
+        Starts the workers of all managers at once, then waits for all of them to be ready.
+
+        worker_managers: Managers to start together.
+        timeout: Time in seconds for all workers to be ready.
+
+        Returns whether all workers are ready, and the time to ready in seconds by worker.
+        """
+        all_started = True
+        for manager in worker_managers:
+            all_started = manager.start_workers() and all_started
+
+        deadline = time.monotonic() + timeout
+        all_ready = all_started
+        times_to_ready = {}
+        for manager in worker_managers:
+            result, manager_times_to_ready = manager.wait_until_ready(deadline)
+            all_ready = all_ready and result
+            times_to_ready.update(manager_times_to_ready)
+
+        return all_ready, times_to_ready
+
+    def join_workers(self, deadline: float | None = None) -> bool:
         """
         Join workers.
+
+        deadline: time.monotonic() value to stop waiting at, None waits forever.
+
+        Returns whether all workers have exited.
         """
         for worker in self.__workers:
-            worker.join()
+            if deadline is None:
+                worker.join()
+                continue
+
+            worker.join(max(deadline - time.monotonic(), 0.0))
+
+        return not self.is_running()
+
+    def is_running(self) -> bool:
+        """
+        Returns whether any worker is still alive.
+        """
+        return any(worker.is_alive() for worker in self.__workers)
+
+    def get_name(self) -> str:
+        """
+        Returns the name of the worker target.
+        """
+        return self.__worker_properties.get_target_name()
+
+    def get_worker_sentinels(self) -> "list[int]":
+        """
+        Returns the sentinels of started workers, which become ready when the worker exits.
+        """
+        return [worker.sentinel for worker in self.__workers if worker.pid is not None]
+
+    def is_exit_requested(self) -> bool:
+        """
+        Returns whether workers have been requested to exit.
+        """
+        return self.__worker_properties.get_controller().is_exit_requested()
+
+    def request_exit(self) -> None:
+        """
+        Requests workers to exit through their controller.
+        """
+        self.__worker_properties.get_controller().request_exit()
+
+    def send_sentinels(self) -> None:
+        """
+        Puts one sentinel (None) per worker into each input queue and input channel,
+        to wake consumers blocked on get.
+        A full queue is skipped, since its consumers are not blocked on it.
+        """
+        for input_queue in (
+            self.__worker_properties.get_input_queues()
+            + self.__worker_properties.get_input_channels()
+        ):
+            try:
+                for _ in self.__workers:
+                    input_queue.queue.put_nowait(None)
+            except queue.Full:
+                continue
+
+    def terminate_workers(self, deadline: float) -> None:
+        """
+        Terminates workers that are still alive, then kills any that outlive the deadline.
+        Thread workers cannot be terminated: they are joined until the deadline,
+        and left running after it.
+
+        deadline: time.monotonic() value to stop waiting at.
+        """
+        remaining_workers = []
+        for worker in self.__workers:
+            if isinstance(worker, ThreadWorker):
+                worker.join(max(deadline - time.monotonic(), 0.0))
+
+            if not worker.is_alive():
+                continue
+
+            target_and_worker_name = f"{self.__worker_properties.get_target_name()} {worker.name}"
+            if isinstance(worker, ThreadWorker):
+                self.__local_logger.warning(
+                    f"Worker did not exit in time, leaving thread running {target_and_worker_name}",
+                    True,
+                )
+                continue
+
+            remaining_workers.append(worker)
+            self.__local_logger.warning(
+                f"Worker did not exit in time, terminating {target_and_worker_name}",
+                True,
+            )
+            worker.terminate()
+
+        for worker in remaining_workers:
+            worker.join(max(deadline - time.monotonic(), 0.0))
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+
+    @classmethod
+    def stop_workers(
+        cls,
+        worker_managers: "list[WorkerManager]",
+        join_timeout: float = __JOIN_TIMEOUT,
+        terminate_timeout: float = __TERMINATE_TIMEOUT,
+    ) -> float:
+        """
+        Stops all workers of all managers, with a shared deadline per stage:
+        request exit and send a sentinel per consumer, join, then terminate.
+
+        worker_managers: Managers to stop together.
+        join_timeout: Time in seconds for all workers to exit on their own.
+        terminate_timeout: Time in seconds for remaining workers to exit after terminate.
+
+        Returns the total shutdown time in seconds.
+        """
+        start = time.monotonic()
+
+        for manager in worker_managers:
+            manager.request_exit()
+
+        for manager in worker_managers:
+            manager.send_sentinels()
+
+        join_deadline = start + join_timeout
+        all_exited = True
+        for manager in worker_managers:
+            all_exited = manager.join_workers(join_deadline) and all_exited
+
+        if not all_exited:
+            terminate_deadline = time.monotonic() + terminate_timeout
+            for manager in worker_managers:
+                manager.terminate_workers(terminate_deadline)
+
+        return time.monotonic() - start
 
     def check_and_restart_dead_workers(self) -> bool:
         """
@@ -216,10 +625,8 @@ class WorkerManager:
 
         Returns whether the dead workers were able to be restarted.
         """
-        new_workers = []
-        for worker in self.__workers:
+        for worker in list(self.__workers):
             if worker.is_alive():
-                new_workers.append(worker)
                 continue
 
             # Log dead worker
@@ -229,19 +636,18 @@ class WorkerManager:
                 True,
             )
 
-            # Create a new worker
-            result, new_worker = WorkerManager.__create_single_worker(
-                self.__worker_properties.get_worker_target(),
-                self.__worker_properties.get_worker_arguments(),
-                self.__local_logger,
-            )
+            # Forget the dead worker and release its sentinel
+            self.__workers.remove(worker)
+            worker.close()
+            self.__start_times.pop(worker.name, None)
+            ready_connection = self.__ready_connections.pop(worker.name, None)
+            if ready_connection is not None:
+                ready_connection.close()
+
+            # Create and start a new worker
+            result = self.__start_worker()
             if not result:
                 self.__local_logger.error(f"Failed to restart {target_and_worker_name}", True)
                 return False
 
-            # Append the new worker
-            new_workers.append(new_worker)
-
-        self.__workers = new_workers
-
         return True
@@ -0,0 +1,235 @@
+"""
+For restarting workers that die.
+"""
+
+import multiprocessing.connection
+import threading
+import time
+
+from modules.common.modules.logger import logger
+from utilities.workers import worker_manager
+
+
+class WorkerGroupHealth:
+    """
+    Restart statistics of a worker group.
+    """
+
+    def __init__(self) -> None:
+        self.restart_count = 0
+        self.downtime = 0.0  # seconds, from death to restart, summed over restarts
+        # time.monotonic() of the first death not yet restarted, None while all workers are up
+        self.down_since: float | None = None
+        # time.monotonic() of recent restarts, for the restart budget
+        self.recent_restarts: "list[float]" = []
+        # Set once the restart budget is exhausted, the group is no longer supervised
+        self.failed = False
+
+    def __str__(self) -> str:
+        return (
+            f"restarts: {self.restart_count}, downtime: {self.downtime * 1000:.1f} ms, "
+            f"failed: {self.failed}"
+        )
+
+
+class WorkerSupervisor:  # pylint: disable=too-many-instance-attributes
+    """
+    Background thread in main that waits on worker process sentinels and restarts
+    dead workers as soon as they die, with exponential backoff and a restart budget.
+    """
+
+    __create_key = object()
+
+    __BACKOFF_BASE = 0.1  # seconds
+    __BACKOFF_MAX = 5.0  # seconds
+    __RESTART_BUDGET = 5  # restarts per window
+    __RESTART_WINDOW = 60.0  # seconds
+
+    @classmethod
+    def create(
+        cls,
+        worker_managers: "list[worker_manager.WorkerManager]",
+        local_logger: logger.Logger,
+        restart_budget: int = __RESTART_BUDGET,
+        restart_window: float = __RESTART_WINDOW,
+    ) -> "tuple[bool, WorkerSupervisor | None]":
+        """
+        worker_managers: Managers whose workers are supervised.
+        local_logger: Existing logger from process.
+        restart_budget: Maximum restarts of a group within the window before giving up.
+        restart_window: Length of the restart budget window in seconds.
+
+        Returns whether the supervisor was created and the supervisor.
+        """
+        if restart_budget <= 0 or restart_window <= 0.0:
+            local_logger.error("Restart budget and window must be greater than zero", True)
+            return False, None
+
+        return True, WorkerSupervisor(
+            cls.__create_key,
+            worker_managers,
+            local_logger,
+            restart_budget,
+            restart_window,
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        worker_managers: "list[worker_manager.WorkerManager]",
+        local_logger: logger.Logger,
+        restart_budget: int,
+        restart_window: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is WorkerSupervisor.__create_key, "Use create() method"
+
+        self.__worker_managers = worker_managers
+        self.__local_logger = local_logger
+        self.__restart_budget = restart_budget
+        self.__restart_window = restart_window
+
+        self.__health = [WorkerGroupHealth() for _ in worker_managers]
+        # time.monotonic() when each group with dead workers is due for restart, by index
+        self.__restart_due = {}
+
+        self.__health_lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__wake_receiver, self.__wake_sender = multiprocessing.connection.Pipe(duplex=False)
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self) -> None:
+        """
+        Starts supervising in the background, call after the workers have been started.
+        """
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops supervising, call before stopping the workers.
+        """
+        self.__stop_event.set()
+        self.__wake_sender.send(None)
+        self.__thread.join()
+
+        self.__wake_receiver.close()
+        self.__wake_sender.close()
+
+    def get_health(self) -> "dict[str, WorkerGroupHealth]":
+        """
+        Returns a snapshot of the restart statistics by worker group.
+        """
+        with self.__health_lock:
+            snapshot = {}
+            for manager, health in zip(self.__worker_managers, self.__health):
+                copy = WorkerGroupHealth()
+                copy.restart_count = health.restart_count
+                copy.downtime = health.downtime
+                copy.down_since = health.down_since
+                copy.recent_restarts = list(health.recent_restarts)
+                copy.failed = health.failed
+                snapshot[manager.get_name()] = copy
+
+            return snapshot
+
+    def __backoff(self, recent_restart_count: int) -> float:
+        """
+        First restart is immediate, then the delay doubles up to the maximum.
+        """
+        if recent_restart_count == 0:
+            return 0.0
+
+        return min(self.__BACKOFF_BASE * 2 ** (recent_restart_count - 1), self.__BACKOFF_MAX)
+
+    def __schedule_restart(self, index: int, now: float) -> None:
+        manager = self.__worker_managers[index]
+        health = self.__health[index]
+
+        with self.__health_lock:
+            health.down_since = now
+            health.recent_restarts = [
+                restart_time
+                for restart_time in health.recent_restarts
+                if now - restart_time < self.__restart_window
+            ]
+
+            if len(health.recent_restarts) >= self.__restart_budget:
+                health.failed = True
+                self.__local_logger.error(
+                    f"Restart budget exhausted, no longer restarting {manager.get_name()}",
+                    True,
+                )
+                return
+
+            self.__restart_due[index] = now + self.__backoff(len(health.recent_restarts))
+
+    def __restart(self, index: int) -> None:
+        manager = self.__worker_managers[index]
+        health = self.__health[index]
+
+        del self.__restart_due[index]
+        result = manager.check_and_restart_dead_workers()
+        now = time.monotonic()
+
+        with self.__health_lock:
+            health.restart_count += 1
+            health.recent_restarts.append(now)
+            if health.down_since is not None:
+                health.downtime += now - health.down_since
+                health.down_since = None
+
+            if not result:
+                health.failed = True
+
+    def __run(self) -> None:
+        """
+        Supervisor loop, sleeps until a worker dies, a restart is due, or stop is requested.
+        """
+        while not self.__stop_event.is_set():
+            now = time.monotonic()
+            for index, due in list(self.__restart_due.items()):
+                if due <= now:
+                    self.__restart(index)
+
+            # Groups waiting for restart or exiting are not watched,
+            # their dead workers would wake the wait
+            sentinels = {}
+            for index, manager in enumerate(self.__worker_managers):
+                if (
+                    index in self.__restart_due
+                    or self.__health[index].failed
+                    or manager.is_exit_requested()
+                ):
+                    continue
+
+                for sentinel in manager.get_worker_sentinels():
+                    sentinels[sentinel] = index
+
+            timeout = None
+            if len(self.__restart_due) > 0:
+                timeout = max(min(self.__restart_due.values()) - time.monotonic(), 0.0)
+
+            ready = multiprocessing.connection.wait(
+                list(sentinels) + [self.__wake_receiver], timeout
+            )
+
+            now = time.monotonic()
+            for item in ready:
+                if item is self.__wake_receiver:
+                    continue
+
+                index = sentinels[item]
+                # Workers exiting on request are not restarted
+                if index in self.__restart_due or self.__worker_managers[index].is_exit_requested():
+                    continue
+
+                self.__local_logger.warning(
+                    f"Worker died in {self.__worker_managers[index].get_name()}", True
+                )
+                self.__schedule_restart(index, now)
+
+            # Once exit is requested, all groups stop, so there is nothing left to supervise
+            if all(manager.is_exit_requested() for manager in self.__worker_managers):
+                return